@@ -1,32 +1,98 @@
 import os
 import re
-import glob
+import json
+import math
+import hashlib
 import uuid
 import time
+import tempfile
+import threading
 from datetime import datetime, timedelta
 from functools import wraps
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
+
+# Start of the startup report; see create_app().
+_IMPORT_STARTED = time.perf_counter()
 
-import bcrypt
 import jwt
-import PyPDF2
 from dotenv import load_dotenv
-from flask import Flask, request, jsonify, g
+from flask import Flask, Request, Response, request, jsonify, g, stream_with_context
 from flask_cors import CORS
-from supabase import create_client, Client
 from werkzeug.utils import secure_filename
 
-import requests  # used for external API proxy fetches
+from cache_utils import LRUCache
+from compressed_response import SnapshotResponder, snapshot_response
+from http_client import UpstreamClient
+from ingest import READERS, RESUME_EXTENSIONS, IngestionPipeline, read_resume_text
+from metrics import Metrics
+from pdf_text import ExtractionError, resolve_backend
+from job_search import JOB_FIELDS, JobSearchCache, project
+from job_store import JobStore
+from password_hashing import HashingBusy, PasswordHasher
+from profiling import SamplingProfiler, profile_name
+from resume_index import ResumeIndex
+from scoring import SCORERS, VectorScorer, jd_fingerprint, rank_scores
+from shortlist_jobs import ShortlistJobQueue
+from skills import SkillDictionary
+from stale_cache import StaleWhileRevalidate
+from text_cache import ResumeTextCache
+from token_store import TokenStore
+from upload_store import UploadStore
 
 load_dotenv()
 
 UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', 'resumes')
-ALLOWED_EXTENSIONS = {'pdf', 'txt'}
+ALLOWED_EXTENSIONS = {ext.lstrip('.') for ext in RESUME_EXTENSIONS}
 JWT_SECRET = os.environ.get('JWT_SECRET', 'super-secret-key')
 JWT_EXP_MINUTES = int(os.environ.get('JWT_EXP_MINUTES', '120'))
 SUPABASE_URL = os.environ.get('SUPABASE_URL', '')
 SUPABASE_KEY = os.environ.get('SUPABASE_KEY', '')
 FRONTEND_ORIGIN = os.environ.get('FRONTEND_ORIGIN', '*')
+USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', '60'))
+USER_CACHE_MAX_ENTRIES = int(os.environ.get('USER_CACHE_MAX_ENTRIES', '1024'))
+# When enabled, access tokens carry the user's profile (email, name, mobile)
+# and token_required trusts those signed claims, only falling back to
+# Supabase for tokens issued without them. Off by default, so tokens hold
+# no personal data.
+AUTH_TRUST_TOKEN_CLAIMS = os.environ.get('AUTH_TRUST_TOKEN_CLAIMS', 'false').lower() in ('1', 'true', 'yes')
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
+BCRYPT_WORKERS = int(os.environ.get('BCRYPT_WORKERS', str(max(1, (os.cpu_count() or 2) // 2))))
+BCRYPT_MAX_QUEUE = int(os.environ.get('BCRYPT_MAX_QUEUE', '32'))
+BCRYPT_TIMEOUT = float(os.environ.get('BCRYPT_TIMEOUT', '10'))
+TEXT_CACHE_DIR = os.environ.get('TEXT_CACHE_DIR', os.path.join(UPLOAD_FOLDER, '.cache'))
+# Upload and shortlist job status shared by all worker processes.
+JOB_STORE_PATH = os.environ.get('JOB_STORE_PATH', os.path.join(TEXT_CACHE_DIR, 'jobs.sqlite3'))
+TEXT_CACHE_MAX_ENTRIES = int(os.environ.get('TEXT_CACHE_MAX_ENTRIES', '1024'))
+SHORTLIST_BATCH_MAX_JDS = int(os.environ.get('SHORTLIST_BATCH_MAX_JDS', '100'))
+INGEST_WORKERS = int(os.environ.get('INGEST_WORKERS', '0')) or None  # default: one per CPU
+# Longest a shortlist request waits for in-flight extractions before ranking
+# without them; files still parsing are picked up by a later request.
+INGEST_WAIT_SECONDS = float(os.environ.get('INGEST_WAIT_SECONDS', '10'))
+# PDF text extraction: backend (auto, pdfium, pypdf, pypdf2, pdfminer) and
+# per-file caps so huge or malformed PDFs cannot monopolise a worker.
+PDF_BACKEND = os.environ.get('PDF_BACKEND', 'auto')
+PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', '50')) or None
+PDF_MAX_SECONDS = float(os.environ.get('PDF_MAX_SECONDS', '20')) or None
+# Path of a memory-mapped token store for very large corpora. When set, the
+# overlap scorer of /shortlist (streamed or not) and /shortlist/batch scans
+# this file instead of the in-memory index. The tfidf and bm25 scorers and
+# /shortlist/jobs still build the in-memory index.
+RESUME_TOKEN_STORE = os.environ.get('RESUME_TOKEN_STORE', '')
+SHORTLIST_CACHE_MAX_ENTRIES = int(os.environ.get('SHORTLIST_CACHE_MAX_ENTRIES', '256'))
+SHORTLIST_CACHE_TTL = int(os.environ.get('SHORTLIST_CACHE_TTL', '300'))
+SHORTLIST_JOB_WORKERS = int(os.environ.get('SHORTLIST_JOB_WORKERS', '2'))
+SHORTLIST_JOB_CHUNK = int(os.environ.get('SHORTLIST_JOB_CHUNK', '500'))
+SHORTLIST_JOB_CACHE_ENTRIES = int(os.environ.get('SHORTLIST_JOB_CACHE_ENTRIES', '64'))
+# Skill phrases matched by /shortlist; edits to the file are picked up live.
+SKILLS_FILE = os.environ.get('SKILLS_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skills.json'))
+SKILLS_CHECK_INTERVAL = float(os.environ.get('SKILLS_CHECK_INTERVAL', '2'))
+# Resumes whose skill matches are kept in memory; size it to the corpus.
+SKILL_CACHE_MAX_ENTRIES = int(os.environ.get('SKILL_CACHE_MAX_ENTRIES', '50000'))
+# Opt-in per-request sampling profiler: with PROFILE_REQUESTS enabled, send
+# "X-Profile: 1" and the folded stacks are written to PROFILE_DIR.
+PROFILE_REQUESTS = os.environ.get('PROFILE_REQUESTS', 'false').lower() in ('1', 'true', 'yes')
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', '5'))
 
 app = Flask(__name__)
 CORS(
@@ -37,31 +103,314 @@ CORS(
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Seconds spent getting this process ready, by phase, plus the first-use
+# cost of lazily created clients. Logged by create_app(), shown on /health
+# and exported at /metrics.
+_startup = {"imports": round(time.perf_counter() - _IMPORT_STARTED, 4)}
+
+# The Supabase client (and the supabase package itself) is created on first
+# use, so a worker boots and answers /health even when Supabase is unreachable
+# or not configured.
+_supabase = None
+_supabase_lock = threading.Lock()
+
+
+def get_supabase():
+    global _supabase
+    if _supabase is None:
+        with _supabase_lock:
+            if _supabase is None:
+                started = time.perf_counter()
+                from supabase import create_client
+                _supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+                _startup["supabase_client"] = round(time.perf_counter() - started, 4)
+    return _supabase
+
+
+def __getattr__(name):
+    # ``app.supabase`` still works for scripts written before it became lazy.
+    if name == 'supabase':
+        return get_supabase()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Rebuilding the token store writes a temp file next to it and renames it
+# into place; directly inside UPLOAD_FOLDER that would change the folder's
+# mtime, and so the corpus version, on every rebuild. Subfolders are fine.
+if RESUME_TOKEN_STORE and os.path.dirname(os.path.realpath(RESUME_TOKEN_STORE)) == os.path.realpath(UPLOAD_FOLDER):
+    raise RuntimeError("RESUME_TOKEN_STORE must not be directly inside UPLOAD_FOLDER; use a subfolder such as "
+                       f"{os.path.join(UPLOAD_FOLDER, '.cache')}")
+
+# Per-route latency histograms, hot-path stage timers and cache counters,
+# served at /metrics.
+_metrics = Metrics()
+
+
+@app.before_request
+def _start_request_metrics():
+    g.request_started = time.perf_counter()
+    if PROFILE_REQUESTS and request.headers.get('X-Profile', '').lower() in ('1', 'true', 'yes'):
+        g.profiler = SamplingProfiler(interval=PROFILE_INTERVAL_MS / 1000).start()
+
+
+@app.after_request
+def _record_request_metrics(response):
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    started = g.get('request_started')
+    if started is not None:
+        _metrics.requests.observe(
+            time.perf_counter() - started, route=route, method=request.method, status=str(response.status_code))
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        name = profile_name(f"{request.method}-{route}")
+        response.headers['X-Profile-File'] = name
+        if response.is_streamed:
+            # The body is generated after this hook; keep sampling until it is sent.
+            response.call_on_close(lambda: profiler.stop().save(PROFILE_DIR, name))
+        else:
+            profiler.stop().save(PROFILE_DIR, name)
+            response.headers['X-Profile-Samples'] = str(sum(profiler.samples.values()))
+    return response
+
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
-def extract_text_from_pdf(filepath):
+_PDF_OPTIONS = {"backend": resolve_backend(PDF_BACKEND), "max_pages": PDF_MAX_PAGES, "max_seconds": PDF_MAX_SECONDS}
+
+
+def extract_text_from_resume(filepath):
     try:
-        with open(filepath, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + " "
-            return text.strip()
+        return read_resume_text(filepath, **_PDF_OPTIONS)
     except Exception:
         return ""
 
 
+def _extract_for_cache(filepath):
+    # Unlike extract_text_from_resume, failures raise, so the text cache
+    # never stores "" for a resume that could not be read this time.
+    return read_resume_text(filepath, **_PDF_OPTIONS)
+
+
+# Pre-serialized, pre-compressed JSON bodies with ETags for the large endpoints.
+_json_snapshots = SnapshotResponder(max_entries=int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', '256')))
+
+
+# Extracted text is cached by content hash so /shortlist never re-parses
+# an unchanged PDF.
+_text_cache = ResumeTextCache(TEXT_CACHE_DIR, _extract_for_cache, max_entries=TEXT_CACHE_MAX_ENTRIES)
+# Inverted index over the uploaded resumes, keyed by file name.
+_resume_index = ResumeIndex()
+_resume_index_lock = threading.Lock()
+
+
+_skills = SkillDictionary(SKILLS_FILE, check_interval=SKILLS_CHECK_INTERVAL, logger=app.logger)
+# Skills found in each resume: {digest: (dictionary version, hits)}. Filled
+# whenever a resume's text is read for indexing, so ranking only looks
+# them up instead of re-reading and re-matching every returned resume.
+_skill_hits = LRUCache(max_entries=SKILL_CACHE_MAX_ENTRIES)
+
+
+def _find_skills(digest, text, skills=None):
+    skills = skills or _skills.current()
+    hits = skills.find(text)
+    _skill_hits.set(digest, (skills.version, hits))
+    return hits
+
+
+def _indexed_text(filepath):
+    """
+    (digest, text) of a resume being indexed, recording its skills on the
+    way. Raises if the resume has to be extracted and that fails.
+    """
+    digest, text = _text_cache.put(filepath)
+    _find_skills(digest, text)
+    return digest, text
+
+
+def _extracted(filepath):
+    """Make sure the text of ``filepath`` is cached; False if extraction failed."""
+    try:
+        _indexed_text(filepath)
+    except Exception as e:
+        app.logger.warning("Could not extract %s: %s: %s", os.path.basename(filepath), type(e).__name__, e)
+        return False
+    return True
+
+
+def _on_resume_parsed(filename, filepath, text):
+    digest, text = _text_cache.put(filepath, text)
+    _find_skills(digest, text)
+    if not RESUME_TOKEN_STORE:
+        _resume_index.add(filename, text, digest)
+
+
+# TF-IDF / BM25 matrices, rebuilt lazily when the index version changes.
+_vector_scorer = VectorScorer(_resume_index)
+
+
+# Jobs run in the worker that accepted them; their status is published to
+# the job store so polls routed to another worker still find them.
+_job_store = JobStore(JOB_STORE_PATH, logger=app.logger)
+
+# Uploaded PDFs are parsed in a process pool as soon as they arrive.
+_ingestion = IngestionPipeline(
+    _on_resume_parsed,
+    max_workers=INGEST_WORKERS,
+    extract_options=_PDF_OPTIONS,
+    on_timing=_metrics.observe_stage,
+    job_store=_job_store,
+)
+
+# /shortlist results are cached per corpus version and JD fingerprint, so
+# repeats skip even the folder scan until resumes are added or removed.
+_shortlist_results = SnapshotResponder(max_entries=SHORTLIST_CACHE_MAX_ENTRIES, ttl=SHORTLIST_CACHE_TTL)
+
+
+def _corpus_version():
+    """
+    The upload folder's mtime plus the count of uploads stored by any
+    worker: the count changes with every upload, even two landing within
+    the filesystem's timestamp granularity, and the mtime with resumes
+    added, renamed or deleted outside the app. Files rewritten in place
+    outside the app change neither; SHORTLIST_CACHE_TTL bounds how long
+    that goes unnoticed.
+    """
+    return _uploads.version()
+
+
+def _resume_files():
+    """Every resume in UPLOAD_FOLDER, whatever its format, in one directory scan."""
+    with os.scandir(UPLOAD_FOLDER) as entries:
+        return [
+            entry.path for entry in entries
+            if entry.is_file() and entry.name.lower().endswith(RESUME_EXTENSIONS)
+        ]
+
+
+# Uploads are spooled to disk and hashed while the multipart body is parsed,
+# then stored once per distinct content.
+_uploads = UploadStore(UPLOAD_FOLDER, _text_cache.digest, _resume_files,
+                       changes_path=os.path.join(TEXT_CACHE_DIR, 'uploads.changes'))
+
+
+class _UploadRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return _uploads.spool()
+
+
+app.request_class = _UploadRequest
+
+
+def _sync_resume_index():
+    """
+    Bring the index in line with UPLOAD_FOLDER. Unchanged files cost one
+    stat() each; changed or new files are read through the text cache.
+    Files with identical contents are indexed once, under the first name.
+    Returns False if some were still being parsed, or could not be read,
+    and had to be left out.
+    """
+    with _resume_index_lock:
+        complete = True
+        present = set()
+        seen = set()
+        deadline = time.monotonic() + INGEST_WAIT_SECONDS
+        for filepath in sorted(_resume_files()):
+            filename = os.path.basename(filepath)
+            digest = _text_cache.digest(filepath)
+            if digest in seen:
+                continue
+            seen.add(digest)
+            present.add(filename)
+            if filename in _resume_index and _resume_index.digest(filename) == digest:
+                continue
+            if not _ingestion.wait(filepath, max(0.0, deadline - time.monotonic())):
+                complete = False  # still parsing; any previous version stays indexed
+                continue
+            if filename in _resume_index and _resume_index.digest(filename) == digest:
+                continue
+            if not _extracted(filepath):
+                complete = False  # nothing was cached, so the next sync tries again
+                continue
+            digest, text = _indexed_text(filepath)
+            _resume_index.add(filename, text, digest)
+        for filename in _resume_index.doc_ids():
+            if filename not in present:
+                _resume_index.remove(filename)
+        _text_cache.flush()
+        return complete
+
+
+_token_store = None
+_token_store_lock = threading.Lock()
+
+
+def _sync_token_store():
+    """
+    Return the token store for UPLOAD_FOLDER, rebuilding RESUME_TOKEN_STORE
+    when resumes were added, changed or removed. Only new or changed
+    resumes are tokenized; the rest are carried over from the previous file.
+    Another worker's newer build is picked up by reopening the file.
+    Returns (store, complete); complete is False if resumes still being
+    parsed, or that could not be read, were left out.
+    """
+    global _token_store
+    with _token_store_lock:
+        store = _token_store
+        if (store is None or not store.is_current()) and os.path.exists(RESUME_TOKEN_STORE):
+            try:
+                store = TokenStore(RESUME_TOKEN_STORE)
+            except (OSError, ValueError, KeyError):
+                store = None
+
+        complete = True
+        docs = []
+        seen = set()
+        stored = set(store.digests.values()) if store is not None else set()
+        deadline = time.monotonic() + INGEST_WAIT_SECONDS
+        for filepath in sorted(_resume_files()):
+            filename = os.path.basename(filepath)
+            digest = _text_cache.digest(filepath)
+            if digest in seen:
+                continue
+            seen.add(digest)
+            if store is None or store.digests.get(filename) != digest:
+                ready = _ingestion.wait(filepath, max(0.0, deadline - time.monotonic()))
+                if ready:
+                    digest = _text_cache.digest(filepath)
+                    # Extracted up front, so a failure leaves the file out
+                    # (and retried next time) instead of stored empty.
+                    ready = digest in stored or _extracted(filepath)
+                if not ready:
+                    # Still parsing or unreadable: keep the stored version, if there is one.
+                    complete = False
+                    if store is None or filename not in store.digests:
+                        continue
+                    digest = store.digests[filename]
+            docs.append((filename, digest, lambda fp=filepath: _indexed_text(fp)[1]))
+
+        if store is None or store.digests != {filename: digest for filename, digest, _ in docs}:
+            store = TokenStore.build(RESUME_TOKEN_STORE, docs, base=store)
+            _text_cache.flush()
+        _token_store = store
+        return store, complete
+
+
+# Background shortlisting for corpora too large to score within one request.
+_shortlist_jobs = ShortlistJobQueue(
+    _vector_scorer,
+    prepare=_sync_resume_index,
+    version=_corpus_version,
+    max_workers=SHORTLIST_JOB_WORKERS,
+    chunk_size=SHORTLIST_JOB_CHUNK,
+    cache_entries=SHORTLIST_JOB_CACHE_ENTRIES,
+    job_store=_job_store,
+)
+
+
 def calculate_match_score(jd_text, resume_text):
     jd_words = set(jd_text.lower().split())
     resume_words = set(resume_text.lower().split())
@@ -102,16 +451,56 @@ def serialize_user(document):
     }
 
 
-def create_access_token(user_id, role):
+# bcrypt runs on its own bounded pool so auth bursts can't starve other routes.
+_password_hasher = PasswordHasher(
+    rounds=BCRYPT_ROUNDS,
+    max_workers=BCRYPT_WORKERS,
+    max_queue=BCRYPT_MAX_QUEUE,
+    timeout=BCRYPT_TIMEOUT
+)
+
+
+def _hashing_busy_response():
+    return jsonify({"error": "Server busy, please retry shortly"}), 503, {"Retry-After": "1"}
+
+
+# Users looked up by token_required, keyed by id. Entries expire after
+# USER_CACHE_TTL seconds; call invalidate_cached_user() after profile changes.
+_user_cache = LRUCache(max_entries=USER_CACHE_MAX_ENTRIES, ttl=USER_CACHE_TTL)
+
+# Profile fields signed into access tokens when AUTH_TRUST_TOKEN_CLAIMS is on.
+_TOKEN_PROFILE_FIELDS = ("email", "role", "first_name", "last_name", "mobile", "created_at")
+
+
+def invalidate_cached_user(user_id):
+    _user_cache.pop(str(user_id))
+
+
+def create_access_token(user_id, role, user=None):
     payload = {
         "sub": str(user_id),
         "role": role,
         "exp": datetime.utcnow() + timedelta(minutes=JWT_EXP_MINUTES),
         "iat": datetime.utcnow()
     }
+    if user and AUTH_TRUST_TOKEN_CLAIMS:
+        payload["profile"] = {field: user.get(field) for field in _TOKEN_PROFILE_FIELDS}
     return jwt.encode(payload, JWT_SECRET, algorithm="HS256")
 
 
+def _load_user(user_id):
+    user = _user_cache.get(user_id)
+    if user is not None:
+        return user
+    # Query user from Supabase
+    with _metrics.stage('supabase.users_by_id'):
+        response = get_supabase().table("users").select("*").eq("id", user_id).single().execute()
+    user = response.data if hasattr(response, 'data') and response.data else None
+    if user:
+        _user_cache.set(user_id, user)
+    return user
+
+
 def token_required(fn):
     @wraps(fn)
     def decorated(*args, **kwargs):
@@ -124,12 +513,16 @@ def token_required(fn):
             return jsonify({"error": "Authorization token missing"}), 401
 
         try:
-            payload = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
+            with _metrics.stage('auth.decode_token'):
+                payload = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
             user_id = payload["sub"]
-            
-            # Query user from Supabase
-            response = supabase.table("users").select("*").eq("id", user_id).single().execute()
-            user = response.data if hasattr(response, 'data') and response.data else None
+
+            profile = payload.get("profile")
+            if AUTH_TRUST_TOKEN_CLAIMS and isinstance(profile, dict):
+                user = dict(profile, id=user_id)
+            else:
+                with _metrics.stage('auth.load_user'):
+                    user = _load_user(user_id)
             if not user:
                 return jsonify({"error": "User not found"}), 404
             g.current_user = user
@@ -159,10 +552,13 @@ def register():
         return jsonify({"error": "Password must be at least 8 characters"}), 400
 
     try:
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-        # Convert bytes to string for PostgreSQL storage
-        hashed_password_str = hashed_password.decode('utf-8')
-        
+        # Stored as a string for PostgreSQL
+        with _metrics.stage('auth.bcrypt_hash'):
+            hashed_password_str = _password_hasher.hash(password)
+    except HashingBusy:
+        return _hashing_busy_response()
+
+    try:
         user_doc = {
             "id": str(uuid.uuid4()),
             "email": email,
@@ -175,7 +571,8 @@ def register():
         }
         
         # Insert into Supabase
-        response = supabase.table("users").insert(user_doc).execute()
+        with _metrics.stage('supabase.users_insert'):
+            response = get_supabase().table("users").insert(user_doc).execute()
         user_data = response.data[0] if response.data else user_doc
     except Exception as e:
         error_msg = str(e)
@@ -184,7 +581,7 @@ def register():
             return jsonify({"error": "Email already registered"}), 409
         return jsonify({"error": f"Registration failed: {error_msg}"}), 500
 
-    token = create_access_token(user_data.get("id"), role)
+    token = create_access_token(user_data.get("id"), role, user_data)
     return jsonify({
         "token": token,
         "user": serialize_user(user_data)
@@ -202,7 +599,8 @@ def login():
 
     try:
         # Query user from Supabase
-        response = supabase.table("users").select("*").eq("email", email).single().execute()
+        with _metrics.stage('supabase.users_by_email'):
+            response = get_supabase().table("users").select("*").eq("email", email).single().execute()
         user = response.data if hasattr(response, 'data') and response.data else None
     except Exception:
         return jsonify({"error": "Invalid credentials"}), 401
@@ -210,16 +608,18 @@ def login():
     if not user:
         return jsonify({"error": "Invalid credentials"}), 401
 
-    # Verify password
-    password_hash = user.get("password", "")
-    # Handle both string and bytes password hash
-    if isinstance(password_hash, str):
-        password_hash = password_hash.encode('utf-8')
-    
-    if not bcrypt.checkpw(password.encode('utf-8'), password_hash):
-        return jsonify({"error": "Invalid credentials"}), 401
-
-    token = create_access_token(user.get("id"), user.get("role", "jobseeker"))
+    # Verify password (string or bytes hash)
+    try:
+        with _metrics.stage('auth.bcrypt_check'):
+            valid = _password_hasher.check(password, user.get("password", ""))
+        if not valid:
+            return jsonify({"error": "Invalid credentials"}), 401
+    except HashingBusy:
+        return _hashing_busy_response()
+
+    # Warm the token_required cache with the row we just read.
+    _user_cache.set(str(user.get("id")), user)
+    token = create_access_token(user.get("id"), user.get("role", "jobseeker"), user)
     return jsonify({
         "token": token,
         "user": serialize_user(user)
@@ -239,15 +639,122 @@ def upload_resumes():
 
     files = request.files.getlist('files')
     uploaded_files = []
+    deduplicated = []
+    renamed = []
+    to_ingest = []
 
     for file in files:
         if file and allowed_file(file.filename):
             filename = secure_filename(file.filename)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-            uploaded_files.append(filename)
+            stored, digest, duplicate = _uploads.save(file.stream, filename)
+            if duplicate:
+                # Same bytes as a stored resume: nothing to write, parse or score.
+                deduplicated.append({"file": filename, "duplicate_of": stored})
+                continue
+            if stored != filename:
+                renamed.append({"file": filename, "stored_as": stored})
+            filepath = os.path.join(app.config['UPLOAD_FOLDER'], stored)
+            _text_cache.record(filepath, digest)
+            uploaded_files.append(stored)
+            _, cached_text = _text_cache.lookup(filepath)
+            to_ingest.append((stored, filepath, cached_text))
+
+    _text_cache.flush()
+    job_id = _ingestion.submit(to_ingest)
+    return jsonify({
+        "uploaded_files": uploaded_files,
+        "deduplicated": deduplicated,
+        "renamed": renamed,
+        "job_id": job_id
+    }), 200
+
+
+@app.route('/upload/jobs/<job_id>', methods=['GET'])
+def upload_job_status(job_id):
+    status = _ingestion.status(job_id)
+    if status is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(status), 200
 
-    return jsonify({"uploaded_files": uploaded_files}), 200
+
+def _shortlist_entry(filename, score):
+    return {
+        'name': os.path.splitext(filename)[0],
+        'file': filename,
+        'score': round(score, 1)
+    }
+
+
+def _resume_skills(filename, skills):
+    filepath = os.path.join(UPLOAD_FOLDER, filename)
+    try:
+        digest = _text_cache.digest(filepath)
+    except OSError:
+        return {}
+    cached = _skill_hits.get(digest)
+    if cached is not None and cached[0] == skills.version:
+        return cached[1]
+    # Only after a dictionary reload (or eviction) is the text read again.
+    try:
+        text = _text_cache.get(filepath)
+    except Exception:
+        return {}
+    return _find_skills(digest, text, skills)
+
+
+def _skill_entry(filename, score, skills, jd_skills):
+    """_shortlist_entry plus the weighted share of the JD's skills the resume has."""
+    skill_score, matched = skills.score(jd_skills, _resume_skills(filename, skills))
+    entry = _shortlist_entry(filename, score)
+    entry['skill_score'] = round(skill_score, 1)
+    entry['matched_skills'] = matched
+    return entry
+
+
+def _int_param(data, name, default=None):
+    """Read a non-negative integer from the JSON body or the query string."""
+    value = data.get(name, request.args.get(name))
+    if value is None or value == '':
+        return default
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a non-negative integer")
+    if value < 0:
+        raise ValueError(f"{name} must be a non-negative integer")
+    return value
+
+
+def _float_param(data, name, default=None):
+    """Read a finite number from the JSON body or the query string."""
+    value = data.get(name, request.args.get(name))
+    if value is None or value == '':
+        return default
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number")
+    if not math.isfinite(value):
+        raise ValueError(f"{name} must be a finite number")
+    return value
+
+
+def _scorer_param(data):
+    """Read one of SCORERS (default overlap) from the JSON body or the query string."""
+    scorer = data.get('scorer') or request.args.get('scorer') or 'overlap'
+    if not isinstance(scorer, str) or scorer.lower() not in SCORERS:
+        raise ValueError(f"scorer must be one of: {', '.join(SCORERS)}")
+    return scorer.lower()
+
+
+def _fields_param(data, name='fields'):
+    """Read a list of names, as a JSON list or a comma-separated string."""
+    value = data.get(name) or request.args.get(name, '')
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, list) or not all(isinstance(f, str) for f in value):
+        raise ValueError(f"{name} must be a list or a comma-separated string")
+    return [f.strip() for f in value if f.strip()]
 
 
 @app.route('/shortlist', methods=['POST'])
@@ -255,63 +762,205 @@ def shortlist():
     data = request.get_json() or {}
     jd_text = data.get('jd', '')
 
-    if not jd_text:
+    if not isinstance(jd_text, str) or not jd_text:
         return jsonify({"error": "Job description required"}), 400
 
-    resumes = []
-    for filepath in glob.glob(os.path.join(UPLOAD_FOLDER, '*.pdf')):
-        text = extract_text_from_pdf(filepath)
-        if text:
-            name = os.path.splitext(os.path.basename(filepath))[0]
-            score = calculate_match_score(jd_text, text)
-            resumes.append({
-                'name': name,
-                'file': os.path.basename(filepath),
-                'score': round(score, 1)
-            })
+    try:
+        limit = _int_param(data, 'limit', _int_param(data, 'top_k'))
+        offset = _int_param(data, 'offset', 0)
+        min_score = _float_param(data, 'min_score')
+        scorer = _scorer_param(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    stream = str(data.get('stream', request.args.get('stream', ''))).lower() in ('1', 'true', 'yes')
+    skills = _skills.current()
+    jd_skills = skills.find(jd_text)
+    # Word order matters to skill phrases but not to the fingerprint, so the
+    # JD's skills are part of the key too.
+    key = (_corpus_version(), skills.version, scorer, jd_fingerprint(jd_text, scorer), tuple(sorted(jd_skills)),
+           limit, offset, min_score)
+    snapshot = _shortlist_results.lookup(key)
+
+    use_token_store = RESUME_TOKEN_STORE and scorer == 'overlap'
+
+    if stream:
+        if snapshot is not None:
+            # Already ranked: send the cached entries in one go.
+            lines = "".join(json.dumps(entry) + "\n" for entry in json.loads(snapshot.body))
+            return Response(lines, mimetype='application/x-ndjson')
+        if use_token_store:
+            with _metrics.stage('shortlist.sync_token_store'):
+                store, complete = _sync_token_store()
+        else:
+            with _metrics.stage('shortlist.sync_index'):
+                complete = _sync_resume_index()
+        # NDJSON: one scored resume per line, best first, emitted as ranked.
+        def generate():
+            if use_token_store:
+                ranked = store.search(jd_text, limit=None if limit is None else offset + limit, min_score=min_score)
+            elif scorer == 'overlap':
+                ranked = _resume_index.iter_ranked(jd_text, min_score=min_score)
+            else:
+                ranked = _vector_scorer.rank(jd_text, scorer, min_score=min_score)
+            entries = []
+            for position, (filename, score) in enumerate(ranked):
+                if position < offset:
+                    continue
+                if limit is not None and position >= offset + limit:
+                    break
+                entries.append(_skill_entry(filename, score, skills, jd_skills))
+                yield json.dumps(entries[-1]) + "\n"
+            # Fully sent: cache it for the next request, streamed or not.
+            if complete:
+                _shortlist_results.snapshot(key, lambda: entries)
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    def build():
+        if use_token_store:
+            with _metrics.stage('shortlist.score.token_store'):
+                ranked = store.search(jd_text, limit=limit, offset=offset, min_score=min_score)
+        elif scorer == 'overlap':
+            with _metrics.stage('shortlist.score.overlap'):
+                ranked = _resume_index.search(jd_text, limit=limit, offset=offset, min_score=min_score)
+        else:
+            with _metrics.stage(f'shortlist.score.{scorer}'):
+                ranked = _vector_scorer.rank(jd_text, scorer, limit=limit, offset=offset, min_score=min_score)
+        with _metrics.stage('shortlist.skills'):
+            return [_skill_entry(filename, score, skills, jd_skills) for filename, score in ranked]
+
+    if snapshot is None:
+        if use_token_store:
+            with _metrics.stage('shortlist.sync_token_store'):
+                store, complete = _sync_token_store()
+        else:
+            with _metrics.stage('shortlist.sync_index'):
+                complete = _sync_resume_index()
+        with _metrics.stage('shortlist.build_response'):
+            # Rankings missing still-parsing resumes are served but not cached.
+            snapshot = _shortlist_results.snapshot(key if complete else None, build)
+    return snapshot_response(snapshot)
 
-    sorted_resumes = sorted(resumes, key=lambda x: x['score'], reverse=True)
-    return jsonify(sorted_resumes), 200
+
+@app.route('/shortlist/batch', methods=['POST'])
+def shortlist_batch():
+    """
+    Score several job descriptions against the resume pool in one pass.
+    Body: { jds: [text | {id, jd}], scorer?, limit?, min_score? }
+    Returns { results: [{ id, resumes: [...] }, ...] } in request order.
+    """
+    data = request.get_json() or {}
+    jds = data.get('jds')
+    if not isinstance(jds, list) or not jds:
+        return jsonify({"error": "jds must be a non-empty list"}), 400
+    if len(jds) > SHORTLIST_BATCH_MAX_JDS:
+        return jsonify({"error": f"At most {SHORTLIST_BATCH_MAX_JDS} job descriptions per batch"}), 400
+
+    ids, texts = [], []
+    for i, item in enumerate(jds):
+        jd_id, jd_text = (item.get('id', i), item.get('jd')) if isinstance(item, dict) else (i, item)
+        if not isinstance(jd_text, str) or not jd_text:
+            return jsonify({"error": f"Job description required (item {i})"}), 400
+        ids.append(jd_id)
+        texts.append(jd_text)
+
+    try:
+        limit = _int_param(data, 'limit')
+        min_score = _float_param(data, 'min_score')
+        scorer = _scorer_param(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if RESUME_TOKEN_STORE and scorer == 'overlap':
+        store, _ = _sync_token_store()
+        rankings = [store.search(text, limit=limit, min_score=min_score) for text in texts]
+    else:
+        _sync_resume_index()
+        matrices, scores = _vector_scorer.score_matrix(texts, scorer)
+        rankings = [rank_scores(matrices, row, limit=limit, min_score=min_score) for row in scores]
+
+    results = []
+    for jd_id, ranked in zip(ids, rankings):
+        results.append({
+            "id": jd_id,
+            "resumes": [_shortlist_entry(filename, score) for filename, score in ranked]
+        })
+    return jsonify({"scorer": scorer, "results": results}), 200
+
+
+@app.route('/shortlist/jobs', methods=['POST'])
+def shortlist_job_submit():
+    """
+    Queue a shortlist in the background. Body: { jd, scorer?, limit?, min_score? }
+    Poll GET /shortlist/jobs/<job_id> for progress and the top matches so far.
+    """
+    data = request.get_json() or {}
+    jd_text = data.get('jd', '')
+
+    if not isinstance(jd_text, str) or not jd_text:
+        return jsonify({"error": "Job description required"}), 400
+
+    try:
+        limit = _int_param(data, 'limit', _int_param(data, 'top_k'))
+        min_score = _float_param(data, 'min_score')
+        scorer = _scorer_param(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    job_id = _shortlist_jobs.submit(jd_text, scorer, limit=limit, min_score=min_score)
+    return jsonify({"job_id": job_id, "status_url": f"/shortlist/jobs/{job_id}"}), 202
+
+
+@app.route('/shortlist/jobs/<job_id>', methods=['GET'])
+def shortlist_job_status(job_id):
+    status = _shortlist_jobs.status(job_id)
+    if status is None:
+        return jsonify({"error": "Job not found"}), 404
+    status["results"] = [_shortlist_entry(filename, score) for filename, score in status["results"]]
+    return jsonify(status), 200
 
 
 @app.route('/health', methods=['GET'])
 def health():
-    return jsonify({"status": "ok"}), 200
+    return jsonify({"status": "ok", "auth_hashing": _password_hasher.stats(), "startup_seconds": _startup}), 200
 
 
 # -------------------------
 # External jobs aggregator
 # -------------------------
-# In-memory cache to limit upstream calls
-_EXTERNAL_JOBS_CACHE = None
-_EXTERNAL_JOBS_CACHE_AT = 0
-_EXTERNAL_JOBS_TTL = 60 * 5  # 5 minutes
+# Per-source snapshots refreshed in the background (stale-while-revalidate)
+_EXTERNAL_JOBS_TTL = int(os.environ.get('EXTERNAL_JOBS_TTL', str(60 * 5)))  # 5 minutes
+_EXTERNAL_JOBS_RETRY_AFTER = int(os.environ.get('EXTERNAL_JOBS_RETRY_AFTER', '30'))
+_EXTERNAL_JOBS_COLD_TIMEOUT = float(os.environ.get('EXTERNAL_JOBS_COLD_TIMEOUT', '15'))
+# Base URLs are overridable so the fetchers can be pointed at a local stub server.
+REMOTIVE_API_URL = os.environ.get('REMOTIVE_API_URL', 'https://remotive.com/api/remote-jobs')
+ARBEITNOW_API_URL = os.environ.get('ARBEITNOW_API_URL', 'https://www.arbeitnow.com/api/job-board-api')
+ADZUNA_API_BASE = os.environ.get('ADZUNA_API_BASE', 'https://api.adzuna.com/v1/api/jobs')
+
+# One pooled keep-alive session for every provider, with retries and a
+# circuit breaker per source.
+_upstream = UpstreamClient(
+    retries=int(os.environ.get('UPSTREAM_RETRIES', '2')),
+    backoff=float(os.environ.get('UPSTREAM_BACKOFF', '0.5')),
+    failure_threshold=int(os.environ.get('UPSTREAM_FAILURE_THRESHOLD', '3')),
+    reset_timeout=int(os.environ.get('UPSTREAM_RESET_TIMEOUT', '60')),
+    on_timing=_metrics.observe_stage
+)
+
 
 def _fetch_remotive(timeout=10):
-    url = "https://remotive.com/api/remote-jobs"
-    try:
-        r = requests.get(url, timeout=timeout)
-        r.raise_for_status()
-        return r.json() if r.content else {"jobs": []}
-    except Exception as e:
-        app.logger.warning("Remotive fetch failed: %s", e)
-        return {"jobs": []}
+    r = _upstream.get("remotive", REMOTIVE_API_URL, timeout=timeout)
+    return r.json() if r.content else {"jobs": []}
 
 
 def _fetch_arbeitnow(timeout=10):
-    url = "https://www.arbeitnow.com/api/job-board-api"
-    try:
-        r = requests.get(url, timeout=timeout)
-        r.raise_for_status()
-        j = r.json() if r.content else {}
-        if isinstance(j, list):
-            return {"data": j}
-        if "data" in j:
-            return {"data": j.get("data", [])}
-        return {"data": j.get("jobs", [])}
-    except Exception as e:
-        app.logger.warning("ArbeitNow fetch failed: %s", e)
-        return {"data": []}
+    r = _upstream.get("arbeitnow", ARBEITNOW_API_URL, timeout=timeout)
+    j = r.json() if r.content else {}
+    if isinstance(j, list):
+        return {"data": j}
+    if "data" in j:
+        return {"data": j.get("data", [])}
+    return {"data": j.get("jobs", [])}
 
 
 def _fetch_adzuna(timeout=10):
@@ -321,20 +970,40 @@ def _fetch_adzuna(timeout=10):
         return {"results": []}
 
     ADZUNA_COUNTRY = "in"
-    base = f"https://api.adzuna.com/v1/api/jobs/{ADZUNA_COUNTRY}/search/1"
+    base = f"{ADZUNA_API_BASE}/{ADZUNA_COUNTRY}/search/1"
     params = {
         "app_id": adz_id,
         "app_key": adz_key,
         "results_per_page": 50,
         "where": "India"
     }
-    try:
-        r = requests.get(base, params=params, timeout=timeout)
-        r.raise_for_status()
-        return r.json() if r.content else {"results": []}
-    except Exception as e:
-        app.logger.warning("Adzuna fetch failed: %s", e)
-        return {"results": []}
+    r = _upstream.get("adzuna", base, params=params, timeout=timeout)
+    return r.json() if r.content else {"results": []}
+
+
+_external_jobs_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix='external-jobs')
+
+
+def _external_source(key, fetch, list_key):
+    # Each source keeps its own TTL (EXTERNAL_JOBS_TTL_<KEY>) and last good snapshot.
+    ttl = int(os.environ.get(f'EXTERNAL_JOBS_TTL_{key.upper()}', str(_EXTERNAL_JOBS_TTL)))
+    return StaleWhileRevalidate(
+        key,
+        fetch,
+        ttl=ttl,
+        executor=_external_jobs_executor,
+        default={list_key: []},
+        retry_after=_EXTERNAL_JOBS_RETRY_AFTER,
+        timeout=_EXTERNAL_JOBS_COLD_TIMEOUT,
+        logger=app.logger
+    )
+
+
+_EXTERNAL_JOB_SOURCES = {
+    "remotive": (_external_source("remotive", _fetch_remotive, "jobs"), "jobs"),
+    "arbeitnow": (_external_source("arbeitnow", _fetch_arbeitnow, "data"), "data"),
+    "adzuna": (_external_source("adzuna", _fetch_adzuna, "results"), "results"),
+}
 
 
 @app.route("/api/external-jobs", methods=["GET"])
@@ -343,48 +1012,233 @@ def external_jobs():
     Aggregates Remotive + ArbeitNow + (optional) Adzuna India.
     Returns JSON with keys:
       { remotive: { jobs: [...] }, arbeitnow: { data: [...] }, adzuna: { results: [...] } }
-    Uses a memory cache for _EXTERNAL_JOBS_TTL seconds.
+    Stale snapshots are served while a background refresh runs; only a cold
+    cache waits on the upstreams, and concurrent misses share one fetch.
     """
-    global _EXTERNAL_JOBS_CACHE, _EXTERNAL_JOBS_CACHE_AT
+    payload, version = _external_jobs_payload()
+    return _json_snapshots.respond(('external-jobs', version), lambda: payload)
+
+
+def _external_jobs_payload():
+    """
+    (payload, version): the aggregated snapshots and a version tuple read
+    together with them, for keying anything derived from the payload.
+    """
+    # Start every due refresh first so a cold start fetches all sources in parallel.
+    for source, _ in _EXTERNAL_JOB_SOURCES.values():
+        source.prefetch()
+
+    results, version = {}, []
+    for key, (source, list_key) in _EXTERNAL_JOB_SOURCES.items():
+        data, source_version = source.get_versioned()
+        results[key] = data if isinstance(data, dict) else {list_key: data}
+        version.append(source_version)
+    return results, tuple(version)
+
 
-    now_ts = int(time.time())
-    if _EXTERNAL_JOBS_CACHE and (now_ts - _EXTERNAL_JOBS_CACHE_AT) < _EXTERNAL_JOBS_TTL:
-        return jsonify(_EXTERNAL_JOBS_CACHE), 200
+# Normalized, deduplicated listings plus their search index, rebuilt only
+# when one of the source snapshots changes.
+_job_search = JobSearchCache()
+_JOB_SEARCH_MAX_PAGE_SIZE = 100
 
-    results = {
-        "remotive": {"jobs": []},
-        "arbeitnow": {"data": []},
-        "adzuna": {"results": []}
+
+def _current_job_index():
+    """(search index, version) for the current external jobs snapshots."""
+    payload, version = _external_jobs_payload()
+    return _job_search.get(version, lambda: payload), version
+
+
+@app.route("/api/external-jobs/search", methods=["GET"])
+def external_jobs_search():
+    """
+    Server-side search over the normalized external jobs.
+    Query params: q, location, tag, type, source, ids (comma-separated),
+    page (1-based) or offset, page_size (max 100), fields (comma-separated
+    projection).
+    Returns { total, page, page_size, jobs: [...] }.
+    """
+    args = request.args
+    try:
+        page = max(1, int(args.get('page', 1)))
+        page_size = min(_JOB_SEARCH_MAX_PAGE_SIZE, max(1, int(args.get('page_size', 20))))
+        offset = max(0, int(args.get('offset', (page - 1) * page_size)))
+    except ValueError:
+        return jsonify({"error": "page, offset and page_size must be integers"}), 400
+
+    fields = [f.strip() for f in args.get('fields', '').split(',') if f.strip()]
+    unknown = [f for f in fields if f not in JOB_FIELDS]
+    if unknown:
+        return jsonify({"error": f"Unknown fields: {', '.join(unknown)}"}), 400
+
+    index, version = _current_job_index()
+    key = ('external-jobs-search', version, tuple(sorted(args.items(multi=True))))
+    return _json_snapshots.respond(key, lambda: _search_jobs(index, args, fields, offset, page, page_size))
+
+
+def _search_jobs(index, args, fields, offset, page, page_size):
+    ids = [i.strip() for i in args.get('ids', '').split(',') if i.strip()]
+    if ids:
+        positions = sorted(index.by_id[i] for i in ids if i in index.by_id)
+    else:
+        positions = index.search(
+            q=args.get('q'),
+            location=args.get('location'),
+            tag=args.get('tag'),
+            job_type=args.get('type'),
+            source=args.get('source')
+        )
+
+    jobs = [project(index.jobs[i], fields) for i in positions[offset:offset + page_size]]
+    return {
+        "total": len(positions),
+        "page": page,
+        "offset": offset,
+        "page_size": page_size,
+        "jobs": jobs
     }
 
-    with ThreadPoolExecutor(max_workers=3) as ex:
-        futures = {
-            ex.submit(_fetch_remotive): "remotive",
-            ex.submit(_fetch_arbeitnow): "arbeitnow",
-            ex.submit(_fetch_adzuna): "adzuna",
+
+_RECOMMEND_MAX_LIMIT = 100
+
+
+def _uploaded_resume_text(file):
+    ext = os.path.splitext(file.filename or '')[1].lower()
+    if ext not in RESUME_EXTENSIONS:
+        raise ExtractionError(f"resume must be one of: {', '.join(RESUME_EXTENSIONS)}")
+    spooled = getattr(file.stream, 'path', None)
+    if spooled:
+        # Already on disk from _uploads.spool(); read it in place.
+        file.stream.flush()
+        text, _ = READERS[ext](spooled, **_PDF_OPTIONS)
+        return text
+    # Readers dispatch on the extension, so give the upload one.
+    fd, path = tempfile.mkstemp(suffix=ext)
+    os.close(fd)
+    try:
+        file.save(path)
+        return read_resume_text(path, **_PDF_OPTIONS)
+    finally:
+        os.unlink(path)
+
+
+@app.route("/api/external-jobs/recommend", methods=["POST"])
+def external_jobs_recommend():
+    """
+    Rank the aggregated external jobs against a job seeker's resume, sent as
+    a multipart ``resume`` file (PDF, TXT or DOCX) or as JSON {"text": ...}.
+    Optional limit (default 20, max 100) and fields (as in /search, or a
+    JSON list).
+    Returns { total_jobs, jobs: [{...job, score}] }, best match first.
+    """
+    data = request.get_json(silent=True) or request.form
+    try:
+        limit = min(_RECOMMEND_MAX_LIMIT, _int_param(data, 'limit', 20))
+        fields = _fields_param(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    unknown = [f for f in fields if f not in JOB_FIELDS]
+    if unknown:
+        return jsonify({"error": f"Unknown fields: {', '.join(unknown)}"}), 400
+
+    if 'resume' in request.files:
+        try:
+            with _metrics.stage('recommend.extract'):
+                text = _uploaded_resume_text(request.files['resume'])
+        except ExtractionError as e:
+            return jsonify({"error": str(e)}), 400
+    else:
+        text = data.get('text')
+    if not isinstance(text, str) or not text.strip():
+        return jsonify({"error": "Resume file or text required"}), 400
+
+    index, version = _current_job_index()
+    with _metrics.stage('recommend.vectorize_jobs'):
+        vectors = index.vectors()
+
+    def build():
+        with _metrics.stage('recommend.rank'):
+            ranked = vectors.recommend(text, limit)
+        return {
+            "total_jobs": len(vectors),
+            "jobs": [dict(project(index.jobs[i], fields), score=round(score * 100, 1)) for i, score in ranked],
         }
-        for fut in as_completed(futures):
-            key = futures[fut]
-            try:
-                data = fut.result()
-                if key == "remotive":
-                    results["remotive"] = data if isinstance(data, dict) else {"jobs": data}
-                elif key == "arbeitnow":
-                    results["arbeitnow"] = data if isinstance(data, dict) else {"data": data}
-                else:
-                    results["adzuna"] = data if isinstance(data, dict) else {"results": data}
-            except Exception as e:
-                app.logger.warning("external fetch exception for %s: %s", key, e)
-
-    _EXTERNAL_JOBS_CACHE = results
-    _EXTERNAL_JOBS_CACHE_AT = int(time.time())
-
-    return jsonify(results), 200
+
+    digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+    key = ('external-jobs-recommend', version, digest, limit, tuple(fields))
+    return _json_snapshots.respond(key, build)
+
+
+@app.route("/api/external-jobs/status", methods=["GET"])
+def external_jobs_status():
+    return jsonify({
+        "sources": [source.status() for source, _ in _EXTERNAL_JOB_SOURCES.values()],
+        "upstream": _upstream.stats()
+    }), 200
 # -------------------------
 # End external jobs aggregator
 # -------------------------
 
 
+@_metrics.collector
+def _cache_metrics():
+    caches = {
+        "user": _user_cache.stats(),
+        "resume_text": _text_cache.stats(),
+        "shortlist_results": _shortlist_results.stats(),
+        "json_snapshots": _json_snapshots.stats(),
+        "skill_hits": _skill_hits.stats(),
+    }
+    for key, (source, _) in _EXTERNAL_JOB_SOURCES.items():
+        status = source.status()
+        caches[f"external_jobs.{key}"] = {
+            "hits": status["hits"] + status["stale_hits"],
+            "misses": status["misses"],
+            "stale_hits": status["stale_hits"],
+        }
+    ratios = []
+    for name, stats in caches.items():
+        lookups = stats["hits"] + stats["misses"]
+        ratios.append(({"cache": name}, round(stats["hits"] / lookups, 4) if lookups else None))
+    return [
+        ("cache_hits_total", "counter", "Cache lookups answered from the cache (stale ones included).",
+         [({"cache": name}, stats["hits"]) for name, stats in caches.items()]),
+        ("cache_misses_total", "counter", "Cache lookups that had to compute or fetch.",
+         [({"cache": name}, stats["misses"]) for name, stats in caches.items()]),
+        ("cache_stale_hits_total", "counter", "External-jobs lookups served stale while refreshing.",
+         [({"cache": name}, stats["stale_hits"]) for name, stats in caches.items() if "stale_hits" in stats]),
+        ("cache_hit_ratio", "gauge", "Hits divided by lookups since start.", ratios),
+        ("cache_entries", "gauge", "Entries currently held in memory.",
+         [({"cache": name}, stats["entries"]) for name, stats in caches.items() if "entries" in stats]),
+    ]
+
+
+@_metrics.collector
+def _component_metrics():
+    hashing = _password_hasher.stats()
+    upstream = _upstream.stats()
+    return [
+        ("password_hashing_total", "counter", "bcrypt operations by outcome.",
+         [({"outcome": outcome}, hashing[outcome]) for outcome in ("hash", "check", "rejected", "timeouts")]),
+        ("password_hashing_in_flight", "gauge", "bcrypt operations running or queued.",
+         [({}, hashing["in_flight"])]),
+        ("upstream_requests_total", "counter", "Upstream job provider requests by outcome.",
+         [({"source": source, "outcome": outcome}, stats[outcome])
+          for source, stats in upstream.items() for outcome in ("requests", "errors", "retries", "short_circuited")]),
+        ("upstream_circuit_open", "gauge", "1 while a provider's circuit breaker is open.",
+         [({"source": source}, int(stats["circuit"] == "open")) for source, stats in upstream.items()]),
+        ("shortlist_corpus_uploads", "gauge", "Uploads stored by any worker; changes invalidate cached shortlists.",
+         [({}, _uploads.changes())]),
+        ("resume_index_documents", "gauge", "Resumes in the in-memory index.", [({}, len(_resume_index))]),
+        ("startup_seconds", "gauge", "Time to get this process ready, by phase, and first-use client setup.",
+         [({"phase": phase}, seconds) for phase, seconds in _startup.items()]),
+    ]
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(_metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
 @app.route('/', methods=['GET'])
 def root():
     return jsonify({
@@ -396,12 +1250,35 @@ def root():
             "/api/auth/login",
             "/api/auth/me",
             "/upload",
+            "/upload/jobs/<job_id>",
             "/shortlist",
-            "/api/external-jobs"
+            "/shortlist/batch",
+            "/shortlist/jobs",
+            "/shortlist/jobs/<job_id>",
+            "/api/external-jobs",
+            "/api/external-jobs/search",
+            "/api/external-jobs/recommend",
+            "/api/external-jobs/status",
+            "/metrics"
         ]
     }), 200
 
 
+def create_app():
+    """
+    App factory for the servers (wsgi.py, asgi.py, python app.py). Routes and
+    caches live at module level, so every call returns this process's one
+    app; the first call records and logs the startup report. Nothing here
+    contacts Supabase or the job boards; those clients are set up on first use.
+    """
+    if "ready" not in _startup:
+        _startup["setup"] = round(time.perf_counter() - _IMPORT_STARTED - _startup["imports"], 4)
+        _startup["ready"] = round(time.perf_counter() - _IMPORT_STARTED, 4)
+        app.logger.info("Startup: imports %.0f ms, setup %.0f ms, ready in %.0f ms",
+                        _startup["imports"] * 1000, _startup["setup"] * 1000, _startup["ready"] * 1000)
+    return app
+
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', '5001'))
-    app.run(host='0.0.0.0', port=port, debug=False)
+    create_app().run(host='0.0.0.0', port=port, debug=False)
@@ -0,0 +1,277 @@
+"""
+ASGI entry point with async variants of the I/O-bound routes.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5001 --workers 2
+
+/api/auth/register, /api/auth/login, /api/auth/me and /api/external-jobs
+run on the event loop: Supabase is queried through the async client, bcrypt
+is awaited on the shared hashing pool and upstream job snapshots are awaited
+instead of blocking a thread, so one worker can keep hundreds of these
+requests in flight; RequestMetricsMiddleware records them in /metrics as
+the Flask hooks do. Every other route is the regular Flask app, run in a
+thread pool.
+"""
+import asyncio
+import contextlib
+import time
+import uuid
+from datetime import datetime
+
+import jwt
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+import app as backend
+from compressed_response import negotiate
+from password_hashing import HashingBusy
+
+_async_supabase = None
+_async_supabase_lock = asyncio.Lock()
+
+
+async def get_async_supabase():
+    """Create the async Supabase client on first use, inside the running loop."""
+    global _async_supabase
+    if _async_supabase is None:
+        async with _async_supabase_lock:
+            if _async_supabase is None:
+                from supabase import acreate_client
+                _async_supabase = await acreate_client(backend.SUPABASE_URL, backend.SUPABASE_KEY)
+    return _async_supabase
+
+
+def _error(message, status, headers=None):
+    return JSONResponse({"error": message}, status_code=status, headers=headers)
+
+
+def _hashing_busy():
+    return _error("Server busy, please retry shortly", 503, {"Retry-After": "1"})
+
+
+async def _json_body(request):
+    try:
+        data = await request.json()
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+async def _load_user(user_id):
+    user = backend._user_cache.get(user_id)
+    if user is not None:
+        return user
+    client = await get_async_supabase()
+    response = await client.table("users").select("*").eq("id", user_id).single().execute()
+    user = response.data if hasattr(response, 'data') and response.data else None
+    if user:
+        backend._user_cache.set(user_id, user)
+    return user
+
+
+async def authenticate(request):
+    """Async counterpart of token_required. Returns (user, error_response)."""
+    auth_header = request.headers.get("Authorization", "")
+    token = auth_header.split(" ", 1)[1] if auth_header.startswith("Bearer ") else None
+    if not token:
+        return None, _error("Authorization token missing", 401)
+
+    try:
+        payload = jwt.decode(token, backend.JWT_SECRET, algorithms=["HS256"])
+        user_id = payload["sub"]
+        profile = payload.get("profile")
+        if backend.AUTH_TRUST_TOKEN_CLAIMS and isinstance(profile, dict):
+            user = dict(profile, id=user_id)
+        else:
+            user = await _load_user(user_id)
+    except jwt.ExpiredSignatureError:
+        return None, _error("Token expired", 401)
+    except (jwt.InvalidTokenError, KeyError):
+        return None, _error("Invalid token", 401)
+    except Exception:
+        return None, _error("User not found", 404)
+
+    if not user:
+        return None, _error("User not found", 404)
+    return user, None
+
+
+async def register(request):
+    data = await _json_body(request)
+    email = (data.get('email') or '').lower().strip()
+    password = data.get('password')
+    role = data.get('userType', 'jobseeker')
+
+    if not email or not password:
+        return _error("Email and password are required", 400)
+
+    if len(password) < 8:
+        return _error("Password must be at least 8 characters", 400)
+
+    try:
+        hashed_password_str = await backend._password_hasher.ahash(password)
+    except HashingBusy:
+        return _hashing_busy()
+
+    user_doc = {
+        "id": str(uuid.uuid4()),
+        "email": email,
+        "password": hashed_password_str,
+        "role": role,
+        "first_name": data.get('firstName'),
+        "last_name": data.get('lastName'),
+        "mobile": data.get('mobile'),
+        "created_at": datetime.utcnow().isoformat()
+    }
+    try:
+        client = await get_async_supabase()
+        response = await client.table("users").insert(user_doc).execute()
+        user_data = response.data[0] if response.data else user_doc
+    except Exception as e:
+        error_msg = str(e)
+        if "duplicate" in error_msg.lower() or "unique" in error_msg.lower() or "23505" in error_msg:
+            return _error("Email already registered", 409)
+        return _error(f"Registration failed: {error_msg}", 500)
+
+    token = backend.create_access_token(user_data.get("id"), role, user_data)
+    return JSONResponse({"token": token, "user": backend.serialize_user(user_data)}, status_code=201)
+
+
+async def login(request):
+    data = await _json_body(request)
+    email = (data.get('email') or '').lower().strip()
+    password = data.get('password')
+
+    if not email or not password:
+        return _error("Email and password are required", 400)
+
+    try:
+        client = await get_async_supabase()
+        response = await client.table("users").select("*").eq("email", email).single().execute()
+        user = response.data if hasattr(response, 'data') and response.data else None
+    except Exception:
+        return _error("Invalid credentials", 401)
+
+    if not user:
+        return _error("Invalid credentials", 401)
+
+    try:
+        if not await backend._password_hasher.acheck(password, user.get("password", "")):
+            return _error("Invalid credentials", 401)
+    except HashingBusy:
+        return _hashing_busy()
+
+    backend._user_cache.set(str(user.get("id")), user)
+    token = backend.create_access_token(user.get("id"), user.get("role", "jobseeker"), user)
+    return JSONResponse({"token": token, "user": backend.serialize_user(user)}, status_code=200)
+
+
+async def me(request):
+    user, error = await authenticate(request)
+    if error is not None:
+        return error
+    return JSONResponse({"user": backend.serialize_user(user)}, status_code=200)
+
+
+async def external_jobs(request):
+    sources = backend._EXTERNAL_JOB_SOURCES
+    snapshots = await asyncio.gather(*(source.aget_versioned() for source, _ in sources.values()))
+    payload = {
+        key: data if isinstance(data, dict) else {list_key: data}
+        for (key, (_, list_key)), (data, _) in zip(sources.items(), snapshots)
+    }
+    version = tuple(source_version for _, source_version in snapshots)
+
+    snapshot = backend._json_snapshots.snapshot(('external-jobs', version), lambda: payload)
+    status, body, headers = negotiate(
+        snapshot, request.headers.get("If-None-Match"), request.headers.get("Accept-Encoding")
+    )
+    if body is None:
+        return Response(status_code=status, headers=headers)
+    return Response(body, status_code=status, media_type="application/json", headers=headers)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records the native routes in the same request histogram as the Flask
+    hooks (_start_request_metrics/_record_request_metrics), timed until the
+    last body chunk is sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = None
+
+        async def record(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                observe()
+
+        def observe():
+            path = scope["path"]
+            backend._metrics.requests.observe(
+                time.perf_counter() - started, route=path if path in _NATIVE_PATHS else 'unmatched',
+                method=scope["method"], status=str(status))
+
+        try:
+            await self.app(scope, receive, record)
+        except Exception:
+            if status is None:
+                status = 500
+                observe()
+            raise
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_app):
+    yield
+    global _async_supabase
+    client, _async_supabase = _async_supabase, None
+    if client is not None:
+        closer = getattr(client.postgrest, "aclose", None)
+        if closer is not None:
+            await closer()
+
+
+_native = Starlette(
+    routes=[
+        Route('/api/auth/register', register, methods=['POST']),
+        Route('/api/auth/login', login, methods=['POST']),
+        Route('/api/auth/me', me, methods=['GET']),
+        Route('/api/external-jobs', external_jobs, methods=['GET']),
+    ],
+    middleware=[
+        Middleware(RequestMetricsMiddleware),
+        Middleware(
+            CORSMiddleware,
+            # Like flask-cors, echo the caller's origin for "*" so credentials still work.
+            allow_origins=[] if backend.FRONTEND_ORIGIN == '*' else [backend.FRONTEND_ORIGIN],
+            allow_origin_regex='.*' if backend.FRONTEND_ORIGIN == '*' else None,
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+    ],
+    lifespan=lifespan,
+)
+_NATIVE_PATHS = {route.path for route in _native.routes}
+_flask = WSGIMiddleware(backend.create_app())
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan" or scope.get("path") in _NATIVE_PATHS:
+        await _native(scope, receive, send)
+    else:
+        await _flask(scope, receive, send)
@@ -0,0 +1,411 @@
+"""
+Offline benchmark suite for the backend's hot paths.
+
+Builds synthetic resume corpora of growing size and times, in-process and
+without touching Supabase or the real job boards:
+
+  extract           extract_text_from_resume over generated PDFs
+  match_score       calculate_match_score over the whole corpus, per JD
+  shortlist.*       POST /shortlist end to end (cold sync, new JD, cached JD)
+  auth.*            a token_required route against a local mock PostgREST
+  external_jobs.*   GET /api/external-jobs against stub upstreams
+
+    python benchmark.py --baseline bench_baseline.json
+    python benchmark.py --sizes 100,1000,10000 --json bench.json
+
+Results are printed as a table and, with --json, written as JSON. With
+--baseline every benchmark's p50 is compared with the stored run; ones that
+are more than --threshold and --min-delta-ms slower are flagged and the exit
+status is 1, so a saved run can serve as the baseline for the next. Cold
+paths run once per process and are shown but not flagged. Corpora are
+generated from a fixed seed, so runs on the same machine are comparable.
+
+A fixed stdlib-only "reference" workload is timed between the benchmark
+groups. When it ran slower than in the baseline, baseline timings are
+scaled up by as much, so a busy or throttled machine doesn't flag every
+benchmark at once. Even then, the same code measures up to ~30% apart from
+one process to the next on a shared machine, which is why the defaults
+only flag slowdowns of more than 50% and 1 ms.
+
+bench_baseline.json is the reference run checked into the repo (its "meta"
+records the machine). Timings only compare on similar hardware, so after
+an intended performance change, or before comparing on a different
+machine, refresh it from a clean checkout with the default sizes and
+commit it together with the change:
+
+    python benchmark.py --json bench_baseline.json
+"""
+import argparse
+import collections
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mock_postgrest import MockPostgrest
+from pdf_benchmark import write_fixtures
+
+_SKILLS = (
+    "python java sql aws docker kubernetes react flask django spark pandas "
+    "typescript golang terraform kafka redis postgres mongodb airflow tableau "
+    "excel linux azure gcp pytorch tensorflow scala hadoop graphql node"
+).split()
+_FILLER = (
+    "engineer developer manager analyst lead senior junior team project "
+    "design testing delivery cloud data pipeline api microservices agile "
+    "built owned led improved reduced migrated launched scaled mentored"
+).split()
+
+
+def _resume_text(rng):
+    # Skills plus filler plus a long tail of rarer terms, so the vocabulary
+    # keeps growing with the corpus as it does with real resumes.
+    words = rng.choices(_SKILLS, k=40) + rng.choices(_FILLER, k=180)
+    words += [f"term{int(rng.paretovariate(1.1)) % 50000}" for _ in range(80)]
+    rng.shuffle(words)
+    return " ".join(words)
+
+
+def _jd_text(rng):
+    return " ".join(rng.sample(_SKILLS, 8) + rng.sample(_FILLER, 12))
+
+
+def _summary(samples):
+    samples = sorted(samples)
+
+    def pct(p):
+        return round(samples[min(len(samples) - 1, int(len(samples) * p))] * 1000, 3)
+
+    return {
+        "ops": len(samples),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+    }
+
+
+def _measure(fn, repeat, warmup=0, min_seconds=0.25):
+    """
+    Call ``fn(i)`` ``repeat`` times (after ``warmup`` untimed calls), and
+    up to 10x as often while the samples add up to under ``min_seconds``,
+    so fast operations get enough samples for a stable p50.
+    """
+    for i in range(warmup):
+        fn(-1 - i)
+    samples = []
+    for i in range(repeat * 10):
+        if i >= repeat and sum(samples) >= min_seconds:
+            break
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    return _summary(samples)
+
+
+def _reference_workload():
+    # Tokenizing, set intersections and JSON over fixed text: the same kind
+    # of work as the hot paths, but no repo code, so it only tracks the
+    # machine's speed.
+    rng = random.Random(3)
+    texts = [_resume_text(rng) for _ in range(100)]
+    jd = set(_jd_text(rng).split())
+
+    def work(i):
+        rows = [{"n": len(jd & set(text.lower().split())), "words": text.split()[:40]} for text in texts]
+        json.loads(json.dumps(rows))
+    return work
+
+
+class _Reference:
+    """Samples of the reference workload, taken throughout a run."""
+
+    def __init__(self, rounds=5):
+        self.work = _reference_workload()
+        self.rounds = rounds
+        self.samples = []
+
+    def sample(self):
+        self.work(-1)
+        for i in range(self.rounds):
+            start = time.perf_counter()
+            self.work(i)
+            self.samples.append(time.perf_counter() - start)
+
+    def result(self):
+        return dict(_summary(self.samples), name="reference", size=None)
+
+
+class StubUpstreams:
+    """
+    Remotive and ArbeitNow stand-ins serving fixed job lists. fail() makes
+    them answer with an error status instead, for exercising retries and
+    circuit breakers.
+    """
+
+    def __init__(self, jobs):
+        rng = random.Random(11)
+        listings = [
+            {"id": i, "title": f"{rng.choice(_SKILLS)} {rng.choice(_FILLER)}", "company_name": f"Company {i % 97}",
+             "url": f"https://jobs.example/{i}", "description": _jd_text(rng)}
+            for i in range(jobs)
+        ]
+        bodies = {
+            "/remotive": json.dumps({"jobs": listings}).encode(),
+            "/arbeitnow": json.dumps({"data": [dict(job, slug=f"job-{job['id']}") for job in listings]}).encode(),
+        }
+        self.requests = 0
+        self._failures = collections.deque()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub.requests += 1
+                body = bodies.get(self.path.split("?", 1)[0])
+                try:
+                    status = stub._failures.popleft()
+                    body = json.dumps({"error": "stub failure"}).encode()
+                except IndexError:
+                    status = 200 if body else 404
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body or b"")))
+                self.end_headers()
+                self.wfile.write(body or b"")
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.url = "http://127.0.0.1:%d" % self._server.server_address[1]
+
+    def fail(self, status=503, times=1):
+        """Answer the next ``times`` requests with ``status``."""
+        self._failures.extend([status] * times)
+
+    def recover(self):
+        """Drop any failures still queued by fail()."""
+        self._failures.clear()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _load_app(workdir, supabase_url, upstream_url):
+    # app reads its configuration at import time, so point it at the
+    # benchmark's folders and local stand-ins before importing it.
+    os.environ.update({
+        "UPLOAD_FOLDER": os.path.join(workdir, "resumes"),
+        "TEXT_CACHE_DIR": os.path.join(workdir, "cache"),
+        "SUPABASE_URL": supabase_url,
+        "SUPABASE_KEY": "benchmark",
+        "REMOTIVE_API_URL": f"{upstream_url}/remotive",
+        "ARBEITNOW_API_URL": f"{upstream_url}/arbeitnow",
+        "ADZUNA_APP_ID": "",
+        "ADZUNA_APP_KEY": "",
+        "RESUME_TOKEN_STORE": "",
+        "PROFILE_REQUESTS": "false",
+    })
+    os.makedirs(os.environ["UPLOAD_FOLDER"], exist_ok=True)
+    import app
+    app.app.logger.disabled = True
+    return app
+
+
+def bench_extract(app, workdir, files, pages, repeat):
+    folder = os.path.join(workdir, "pdfs")
+    os.makedirs(folder)
+    write_fixtures(folder, files, pages)
+    paths = sorted(os.path.join(folder, name) for name in os.listdir(folder))
+    result = _measure(lambda i: [app.extract_text_from_resume(p) for p in paths], repeat, warmup=1)
+    return [dict(result, name="extract", size=files, per_doc_ms=round(result["p50_ms"] / files, 3))]
+
+
+def bench_corpus(app, client, texts, jds, size, repeat, limit):
+    results = []
+    result = _measure(lambda i: [app.calculate_match_score(jds[i % len(jds)], t) for t in texts], repeat, warmup=1)
+    results.append(dict(result, name="match_score", size=size))
+
+    body = {"limit": limit} if limit else {}
+
+    def post(jd):
+        r = client.post('/shortlist', json=dict(body, jd=jd))
+        assert r.status_code == 200, r.get_data(as_text=True)
+
+    # Cold: the first request after the corpus grew reads every new resume
+    # (adding them changed the folder mtime, i.e. the corpus version).
+    results.append(dict(_measure(lambda i: post(jds[0]), 1, min_seconds=0), name="shortlist.cold", size=size))
+    # New JD: stat()s the corpus to stay in sync, then scores every resume.
+    results.append(dict(_measure(lambda i: post(jds[1 + i % (len(jds) - 1)]), repeat), name="shortlist.new_jd", size=size))
+    # Repeated JD: answered from the shortlist result cache.
+    results.append(dict(_measure(lambda i: post(jds[0]), repeat * 10), name="shortlist.cached", size=size))
+    return results
+
+
+def bench_auth(app, client, mock, repeat):
+    user = {"id": "00000000-0000-0000-0000-000000000001", "email": "bench@example.com", "role": "recruiter",
+            "first_name": "Bench", "last_name": "User", "created_at": "2024-01-01T00:00:00Z"}
+    mock.insert("users", [user])
+    headers = {"Authorization": f"Bearer {app.create_access_token(user['id'], user['role'])}"}
+
+    def me(i, cold):
+        if cold:
+            app.invalidate_cached_user(user["id"])
+        r = client.get('/api/auth/me', headers=headers)
+        assert r.status_code == 200, r.get_data(as_text=True)
+
+    return [
+        dict(_measure(lambda i: me(i, True), repeat, warmup=1), name="auth.uncached", size=None),
+        dict(_measure(lambda i: me(i, False), repeat * 10, warmup=1), name="auth.cached", size=None),
+    ]
+
+
+def bench_external_jobs(app, client, jobs, repeat):
+    def get(headers=None, status=200):
+        r = client.get('/api/external-jobs', headers=headers or {})
+        assert r.status_code == status, r.status_code
+        return r
+
+    cold = _measure(lambda i: get(), 1, min_seconds=0)
+    etag = get().headers["ETag"]
+    return [
+        dict(cold, name="external_jobs.cold", size=jobs),
+        dict(_measure(lambda i: get(), repeat * 10), name="external_jobs.cached", size=jobs),
+        dict(_measure(lambda i: get({"Accept-Encoding": "gzip"}), repeat * 10), name="external_jobs.cached_gzip", size=jobs),
+        dict(_measure(lambda i: get({"If-None-Match": etag}, 304), repeat * 10), name="external_jobs.not_modified", size=jobs),
+    ]
+
+
+def run(sizes, repeat=5, pdf_files=100, pdf_pages=2, jobs=500, limit=50):
+    results = []
+    reference = _Reference()
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        mock = MockPostgrest().start()
+        upstreams = StubUpstreams(jobs)
+        try:
+            app = _load_app(workdir, mock.url, upstreams.url)
+            client = app.app.test_client()
+            reference.sample()
+            results += bench_extract(app, workdir, pdf_files, pdf_pages, repeat)
+            reference.sample()
+            results += bench_auth(app, client, mock, repeat)
+            reference.sample()
+            results += bench_external_jobs(app, client, jobs, repeat)
+            reference.sample()
+
+            rng = random.Random(7)
+            # Enough JDs that every new_jd run, up to _measure's 10x, is a new one.
+            jds = [_jd_text(rng) for _ in range(repeat * 10 + 1)]
+            texts = []
+            for size in sorted(sizes):
+                # Corpora grow in place, so each size only writes the new resumes.
+                while len(texts) < size:
+                    texts.append(_resume_text(rng))
+                    path = os.path.join(app.UPLOAD_FOLDER, f"resume_{len(texts):06d}.txt")
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write(texts[-1])
+                results += bench_corpus(app, client, texts, jds, size, repeat, limit)
+                reference.sample()
+        finally:
+            upstreams.stop()
+            mock.stop()
+    return [reference.result()] + results
+
+
+def machine_speed(results, baseline):
+    """
+    How much slower this run's machine was than the baseline's, from the
+    reference workload. Never below 1.0: a reference that happened to run
+    fast shouldn't tighten the gate. 1.0 if either run lacks it.
+    """
+    current = next((r for r in results if r["name"] == "reference"), None)
+    previous = next((r for r in baseline.get("results", []) if r["name"] == "reference"), None)
+    if current is None or previous is None or not previous["p50_ms"]:
+        return 1.0
+    return max(1.0, current["p50_ms"] / previous["p50_ms"])
+
+
+def compare(results, baseline, threshold, min_delta_ms, speed=1.0):
+    """
+    Annotate ``results`` with the baseline p50, scaled by ``speed`` (see
+    machine_speed), and the change against it; return the regressions.
+    """
+    previous = {(r["name"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        b = previous.get((r["name"], r["size"]))
+        if b is None or r["name"] == "reference":
+            continue
+        expected = b["p50_ms"] * speed
+        r["baseline_p50_ms"] = round(expected, 3)
+        r["change"] = round(r["p50_ms"] / expected - 1, 3) if expected else None
+        # One-shot (cold) timings are reported but too noisy to gate on.
+        if r["ops"] > 1 and r["p50_ms"] > expected * (1 + threshold) and r["p50_ms"] - expected >= min_delta_ms:
+            r["regression"] = True
+            regressions.append(r)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='100,1000,10000', help='Comma-separated corpus sizes (up to 100000)')
+    parser.add_argument('--repeat', type=int, default=5, help="Minimum timed runs per benchmark (x10 for cached paths)")
+    parser.add_argument('--pdf-files', type=int, default=100, help='Generated PDFs for the extraction benchmark')
+    parser.add_argument('--pdf-pages', type=int, default=2)
+    parser.add_argument('--jobs', type=int, default=500, help='Listings per stub job board')
+    parser.add_argument('--limit', type=int, default=50, help='Shortlist page size (0 returns every resume)')
+    parser.add_argument('--json', dest='json_path', help='Write results to this file')
+    parser.add_argument('--baseline', help='Earlier --json output to compare against')
+    parser.add_argument('--threshold', type=float, default=0.5, help='Allowed p50 slowdown, as a fraction')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                        help='Ignore slowdowns smaller than this, whatever the ratio')
+    parser.add_argument('--no-normalize', action='store_true',
+                        help="Compare raw timings, without scaling by the reference workload")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    results = run(sizes, args.repeat, args.pdf_files, args.pdf_pages, args.jobs, args.limit)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        speed = 1.0 if args.no_normalize else machine_speed(results, baseline)
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms, speed)
+        print(f"Machine speed vs baseline: x{speed:.2f} (baseline timings scaled by it)")
+
+    print(f"{'benchmark':<28} {'size':>7} {'ops':>5} {'p50_ms':>10} {'p95_ms':>10} {'baseline':>10} {'change':>8}")
+    for r in results:
+        change = f"{r['change']:+.0%}" if r.get("change") is not None else ""
+        flag = "  REGRESSION" if r.get("regression") else ""
+        print(f"{r['name']:<28} {r['size']!s:>7} {r['ops']:>5} {r['p50_ms']:>10} {r['p95_ms']:>10} "
+              f"{r.get('baseline_p50_ms', '')!s:>10} {change:>8}{flag}")
+
+    if args.json_path:
+        meta = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "sizes": sizes,
+            "repeat": args.repeat,
+            "created_at": time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        }
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+
+    if regressions:
+        print(f"{len(regressions)} regression(s) against {args.baseline}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
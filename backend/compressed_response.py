@@ -0,0 +1,113 @@
+import gzip
+import hashlib
+import json
+import threading
+
+from flask import Response, request
+from werkzeug.http import parse_accept_header, parse_etags, quote_etag
+
+from cache_utils import LRUCache
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed.
+MIN_COMPRESS_SIZE = 1024
+
+
+class EncodedSnapshot:
+    """
+    One JSON payload serialized once, with a strong ETag and lazily built
+    gzip / brotli variants that are reused for every later response. The
+    variants are sent with the ETag suffixed by their encoding.
+    """
+
+    def __init__(self, payload):
+        self.body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self.etag = hashlib.sha256(self.body).hexdigest()[:32]
+        self._encoded = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding):
+        with self._lock:
+            body = self._encoded.get(encoding)
+            if body is None:
+                if encoding == "br":
+                    body = brotli.compress(self.body)
+                else:
+                    body = gzip.compress(self.body, compresslevel=6)
+                self._encoded[encoding] = body
+            return body
+
+
+def _pick_encoding(size, accept_encoding):
+    if size < MIN_COMPRESS_SIZE:
+        return None
+    # Quality lookups honour "q=0" and "*", unlike a substring test.
+    accepted = parse_accept_header(accept_encoding)
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def negotiate(snapshot, if_none_match=None, accept_encoding=None, status=200):
+    """
+    Conditional-request and content-encoding handling for ``snapshot``,
+    from the raw If-None-Match and Accept-Encoding header values, so the
+    Flask and ASGI apps answer alike. Returns (status, body, headers); the
+    body is None for a 304.
+    """
+    encoding = _pick_encoding(len(snapshot.body), accept_encoding)
+    # Each encoding is a different byte sequence, so each gets its own strong tag.
+    etag = f"{snapshot.etag}-{encoding}" if encoding else snapshot.etag
+    headers = {"ETag": quote_etag(etag), "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    # If-None-Match uses the weak comparison (RFC 9110 13.1.2).
+    etags = parse_etags(if_none_match)
+    if etags.star_tag or etags.contains_weak(etag):
+        return 304, None, headers
+    if encoding:
+        headers["Content-Encoding"] = encoding
+        return status, snapshot.encoded(encoding), headers
+    return status, snapshot.body, headers
+
+
+class SnapshotResponder:
+    """
+    Serves JSON snapshots with ETag / If-None-Match (304) support and
+    pre-compressed bodies. ``key`` identifies the snapshot: the same key
+    reuses the serialized and compressed bytes until it falls out of the LRU.
+    """
+
+    def __init__(self, max_entries=64, ttl=None):
+        self._cache = LRUCache(max_entries=max_entries, ttl=ttl)
+
+    def lookup(self, key):
+        """The cached snapshot for ``key``, or None."""
+        return self._cache.get(key)
+
+    def snapshot(self, key, build):
+        snapshot = self._cache.get(key) if key is not None else None
+        if snapshot is None:
+            snapshot = EncodedSnapshot(build())
+            if key is not None:
+                self._cache.set(key, snapshot)
+        return snapshot
+
+    def stats(self):
+        return self._cache.stats()
+
+    def respond(self, key, build, status=200):
+        return snapshot_response(self.snapshot(key, build), status)
+
+
+def snapshot_response(snapshot, status=200):
+    status, body, headers = negotiate(
+        snapshot, request.headers.get("If-None-Match"), request.headers.get("Accept-Encoding"), status
+    )
+    if body is None:
+        return Response(status=status, headers=headers)
+    return Response(body, status=status, headers=headers, mimetype="application/json")
@@ -0,0 +1,26 @@
+# Gunicorn settings for the production backend (see wsgi.py).
+#
+# Worker model: CPU-heavy routes (/shortlist scoring, bcrypt in the auth
+# routes) scale with the number of worker *processes*, since each has its own
+# GIL. I/O-bound routes (/api/external-jobs, Supabase calls) mostly wait on
+# the network and are served by the *threads* inside each worker. Size
+# WEB_CONCURRENCY to the cores you have and GUNICORN_THREADS to the amount
+# of concurrent I/O you expect per worker.
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5001')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', str(multiprocessing.cpu_count())))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+# Recycle workers periodically so long-lived caches can't grow unbounded.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '5000'))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '500'))
+# Importing the app once in the master shares its read-only pages between
+# workers; the app's thread and process pools are created lazily, after fork.
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'false').lower() in ('1', 'true', 'yes')
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None  # empty disables
+errorlog = '-'
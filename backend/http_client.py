@@ -0,0 +1,174 @@
+import random
+import threading
+import time
+
+# Status codes worth another attempt; anything else 4xx fails fast.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling a provider whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive failures and rejects calls
+    for ``reset_timeout`` seconds, then lets one trial call through
+    (half-open). A success closes it again.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+
+class UpstreamClient:
+    """
+    Shared HTTP client for the job aggregator: one pooled keep-alive
+    ``requests.Session``, bounded retries with full-jitter exponential
+    backoff, a circuit breaker per provider and per-provider counters.
+    ``on_timing(stage, seconds)``, if given, receives every attempt's latency.
+    requests is imported and the session built on the first call, so
+    creating the client costs nothing at startup.
+    """
+
+    def __init__(self, retries=2, backoff=0.5, timeout=10, pool_size=10,
+                 failure_threshold=3, reset_timeout=60, on_timing=None):
+        self.retries = retries
+        self.on_timing = on_timing
+        self.backoff = backoff
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.pool_size = pool_size
+        self._session = None
+        self._breakers = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def _source(self, source):
+        with self._lock:
+            if source not in self._breakers:
+                self._breakers[source] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self._stats[source] = {
+                    "requests": 0, "errors": 0, "retries": 0, "short_circuited": 0,
+                    "latency_ms_total": 0.0, "latency_ms_max": 0.0,
+                }
+            return self._breakers[source], self._stats[source]
+
+    def _count(self, stats, **deltas):
+        with self._lock:
+            for key, value in deltas.items():
+                stats[key] += value
+
+    def get(self, source, url, params=None, timeout=None):
+        """GET ``url`` on behalf of ``source``; returns a successful Response or raises."""
+        import requests
+
+        breaker, stats = self._source(source)
+        if not breaker.allow():
+            self._count(stats, short_circuited=1)
+            raise CircuitOpen(f"{source} circuit is open")
+
+        timeout = self.timeout if timeout is None else timeout
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            error = None
+            try:
+                response = self.session.get(url, params=params, timeout=timeout)
+                if response.status_code in RETRY_STATUSES:
+                    error = requests.HTTPError(f"{response.status_code} from {source}", response=response)
+                else:
+                    response.raise_for_status()
+            except requests.HTTPError as e:
+                error = e
+                retryable = e.response is not None and e.response.status_code in RETRY_STATUSES
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+                retryable = True
+            except requests.RequestException as e:
+                error = e
+                retryable = False
+            else:
+                retryable = error is not None
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if self.on_timing is not None:
+                self.on_timing(f"upstream.{source}", elapsed_ms / 1000)
+            with self._lock:
+                stats["requests"] += 1
+                stats["latency_ms_total"] += elapsed_ms
+                stats["latency_ms_max"] = max(stats["latency_ms_max"], elapsed_ms)
+
+            if error is None:
+                breaker.record_success()
+                return response
+            self._count(stats, errors=1)
+            if not retryable or attempt >= self.retries:
+                breaker.record_failure()
+                raise error
+            attempt += 1
+            self._count(stats, retries=1)
+            time.sleep(random.uniform(0, self.backoff * (2 ** (attempt - 1))))
+
+    def stats(self):
+        with self._lock:
+            sources = {name: dict(stats) for name, stats in self._stats.items()}
+            breakers = dict(self._breakers)
+        for name, stats in sources.items():
+            stats["circuit"] = breakers[name].state
+            stats["latency_ms_avg"] = round(stats["latency_ms_total"] / stats["requests"], 2) if stats["requests"] else None
+            stats["latency_ms_total"] = round(stats["latency_ms_total"], 2)
+            stats["latency_ms_max"] = round(stats["latency_ms_max"], 2)
+        return sources
@@ -0,0 +1,268 @@
+import mmap
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from xml.etree import ElementTree
+
+from pdf_text import ExtractionError, extract_pdf_text
+
+_DOCX_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+def _read_pdf(filepath, **options):
+    text, info = extract_pdf_text(filepath, **options)
+    return text, info["truncated"]
+
+
+def _read_txt(filepath, **_):
+    # Decode straight out of the page cache; no intermediate bytes copy.
+    with open(filepath, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return "", None
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            try:
+                return str(data, 'utf-8-sig'), None
+            except UnicodeDecodeError:
+                return str(data, 'cp1252', 'replace'), None
+
+
+def _read_docx(filepath, **_):
+    # Stream word/document.xml: text runs are joined, paragraphs become lines.
+    parts = []
+    try:
+        with zipfile.ZipFile(filepath) as archive, archive.open('word/document.xml') as xml:
+            for _, element in ElementTree.iterparse(xml, events=('end',)):
+                if element.tag == _DOCX_NS + 't':
+                    if element.text:
+                        parts.append(element.text)
+                elif element.tag in (_DOCX_NS + 'tab', _DOCX_NS + 'br'):
+                    parts.append(" ")
+                elif element.tag == _DOCX_NS + 'p':
+                    parts.append("\n")
+                    element.clear()
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        raise ExtractionError(f"Unreadable DOCX: {type(e).__name__}: {e}") from e
+    return "".join(parts).strip(), None
+
+
+# extension -> reader(filepath, **options) returning (text, truncated).
+READERS = {'.pdf': _read_pdf, '.txt': _read_txt, '.docx': _read_docx}
+RESUME_EXTENSIONS = tuple(READERS)
+_INLINE_EXTENSIONS = ('.txt',)
+
+
+def extract_resume_text(filepath, **options):
+    """
+    Extract the text of a resume, dispatching on its extension. ``options``
+    are the PDF extraction options (backend and caps). Returns (text,
+    truncated); raises ExtractionError for unreadable or unsupported files.
+    """
+    reader = READERS.get(os.path.splitext(filepath)[1].lower())
+    if reader is None:
+        raise ExtractionError(f"Unsupported file type: {os.path.basename(filepath)}")
+    return reader(filepath, **options)
+
+
+def read_resume_text(filepath, **options):
+    """Extract the text of a resume. Raises ExtractionError on unreadable files."""
+    text, _ = extract_resume_text(filepath, **options)
+    return text
+
+
+def _extract_worker(filepath, options):
+    # Runs in a pool process; must stay importable without app side effects.
+    start = time.perf_counter()
+    try:
+        text, truncated = extract_resume_text(filepath, **options)
+        reason = None
+    except ExtractionError as e:
+        text, reason, truncated = "", str(e), None
+    except Exception as e:
+        text, reason, truncated = "", f"{type(e).__name__}: {e}", None
+    return text, reason, truncated, time.perf_counter() - start
+
+
+class IngestionPipeline:
+    """
+    Parses uploaded resumes in a bounded process pool so bulk uploads use
+    every core instead of queueing behind the GIL on the request thread.
+    Plain-text resumes are read inline; PDF and DOCX go to the pool.
+
+    ``on_parsed(filename, filepath, text)`` is called from a pool callback
+    thread once a file is extracted; failed extractions are only recorded
+    in the job status, so a crashed worker never leaves empty text behind
+    for a resume. Each upload batch gets a job id whose per-file status is
+    queued, parsed or failed; ``truncated`` notes files cut short by the
+    page or time caps in ``extract_options`` (passed to
+    extract_resume_text). ``on_timing(stage, seconds)``, if given, receives
+    each file's extraction time. With a ``job_store`` (a JobStore), job
+    status is published there too, so it can be polled from any worker.
+
+    Workers are started with ``start_method`` (forkserver where available,
+    else spawn) rather than forked from the threaded server process, and
+    import the parent's ``__main__`` on start like any spawned process. A
+    pool broken by a dead worker is replaced on the next submission.
+    """
+
+    def __init__(self, on_parsed, max_workers=None, max_jobs=200, extract_options=None, on_timing=None,
+                 start_method=None, job_store=None):
+        self.on_parsed = on_parsed
+        self.job_store = job_store
+        self.on_timing = on_timing
+        if start_method is None:
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        self.start_method = start_method
+        self.extract_options = dict(extract_options or {})
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_jobs = max_jobs
+        self._executor = None
+        self._jobs = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context(self.start_method)
+                if self.start_method == 'forkserver':
+                    # Preloaded once in the fork server rather than per worker.
+                    # Each worker still re-imports the parent's __main__ (as
+                    # __mp_main__), so under `python app.py` that is app.py:
+                    # harmless, as it starts nothing at import, but not free.
+                    context.set_forkserver_preload([__name__])
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            return self._executor
+
+    def _discard_executor(self, executor):
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, filepath):
+        executor = self._get_executor()
+        try:
+            return executor, executor.submit(_extract_worker, filepath, self.extract_options)
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            executor = self._get_executor()
+            return executor, executor.submit(_extract_worker, filepath, self.extract_options)
+
+    def submit(self, files):
+        """
+        Queue ``files`` ([(filename, filepath, cached_text_or_None), ...]) for
+        extraction and return the job id. Files whose text is already cached
+        are marked parsed immediately.
+        """
+        job_id = uuid.uuid4().hex
+        job = {"id": job_id, "files": OrderedDict()}
+        with self._lock:
+            self._jobs[job_id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+
+        for filename, filepath, cached_text in files:
+            record = {"status": "queued", "reason": None, "truncated": None}
+            job["files"][filename] = record
+            if cached_text is not None:
+                self._finish(job, filename, filepath, record, cached_text, None)
+                continue
+            if filepath.lower().endswith(_INLINE_EXTENSIONS):
+                # Plain text needs no parsing; reading it here beats a pool round trip.
+                text, reason, record["truncated"], seconds = _extract_worker(filepath, self.extract_options)
+                self._timed(filepath, seconds)
+                self._finish(job, filename, filepath, record, text, reason)
+                continue
+
+            done = threading.Event()
+            with self._lock:
+                self._pending[os.path.abspath(filepath)] = done
+            try:
+                executor, future = self._submit(filepath)
+            except Exception as e:
+                self._complete(job, filename, filepath, record, done, "", f"{type(e).__name__}: {e}")
+                continue
+            future.add_done_callback(
+                lambda fut, ex=executor, fn=filename, fp=filepath, rec=record, ev=done:
+                    self._on_done(fut, ex, job, fn, fp, rec, ev)
+            )
+        self._publish(job)
+        return job_id
+
+    def _on_done(self, future, executor, job, filename, filepath, record, done):
+        try:
+            text, reason, record["truncated"], seconds = future.result()
+            self._timed(filepath, seconds)
+        except BrokenProcessPool as e:
+            self._discard_executor(executor)
+            text, reason = "", f"{type(e).__name__}: {e}"
+        except Exception as e:
+            text, reason = "", f"{type(e).__name__}: {e}"
+        self._complete(job, filename, filepath, record, done, text, reason)
+
+    def _timed(self, filepath, seconds):
+        if self.on_timing is not None:
+            self.on_timing(f"extract{os.path.splitext(filepath)[1].lower()}", seconds)
+
+    def _complete(self, job, filename, filepath, record, done, text, reason):
+        try:
+            self._finish(job, filename, filepath, record, text, reason)
+        finally:
+            with self._lock:
+                if self._pending.get(os.path.abspath(filepath)) is done:
+                    del self._pending[os.path.abspath(filepath)]
+            done.set()
+
+    def _finish(self, job, filename, filepath, record, text, reason):
+        if reason is None:
+            try:
+                self.on_parsed(filename, filepath, text)
+            except Exception as e:
+                reason = f"{type(e).__name__}: {e}"
+        if reason is None and not text:
+            reason = "No extractable text"
+        record["status"] = "failed" if reason else "parsed"
+        record["reason"] = reason
+        self._publish(job)
+
+    def _publish(self, job):
+        if self.job_store is not None:
+            final = all(r["status"] != "queued" for r in list(job["files"].values()))
+            self.job_store.publish("upload", job["id"], lambda: self._snapshot(job), final=final)
+
+    def wait(self, filepath, timeout=None):
+        """
+        Block until a queued extraction of ``filepath`` (if any) has finished.
+        Returns False if it is still running after ``timeout`` seconds.
+        """
+        with self._lock:
+            done = self._pending.get(os.path.abspath(filepath))
+        return done is None or done.wait(timeout)
+
+    def status(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return self._snapshot(job)
+        if self.job_store is not None:
+            return self.job_store.get("upload", job_id)
+        return None
+
+    def _snapshot(self, job):
+        files = [{"file": name, **record} for name, record in list(job["files"].items())]
+        counts = {"queued": 0, "parsed": 0, "failed": 0}
+        for f in files:
+            counts[f["status"]] += 1
+        return {
+            "job_id": job["id"],
+            "status": "running" if counts["queued"] else "done",
+            "counts": counts,
+            "files": files,
+        }
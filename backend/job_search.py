@@ -0,0 +1,340 @@
+import bisect
+import hashlib
+import math
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+
+_TOKEN_RE = re.compile(r"\w+")
+_TAG_RE = re.compile(r"<[^>]*>")
+
+SUMMARY_LENGTH = 200
+
+# Stand-ins for a listing's missing title or company.
+UNTITLED = "Untitled"
+NO_COMPANY = "Company"
+
+JOB_FIELDS = (
+    "id", "title", "company_name", "location", "type", "salary", "tags",
+    "date", "url", "source", "summary", "description",
+)
+
+
+def _tokens(text):
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def _summary(description):
+    text = " ".join(_TAG_RE.sub(" ", description or "").split())
+    return text if len(text) <= SUMMARY_LENGTH else text[:SUMMARY_LENGTH].rstrip() + "..."
+
+
+def _infer_type(raw, tags, location):
+    # Same heuristics the ExternalAvailableJobs view used client-side.
+    for key in ("job_type", "type", "contract_type", "employment_type", "contract", "work_type"):
+        value = raw.get(key)
+        if not value:
+            continue
+        v = str(value).lower()
+        if "intern" in v:
+            return "Internship"
+        if "full" in v:
+            return "Full-time"
+        if "part" in v:
+            return "Part-time"
+        if "contract" in v:
+            return "Contract"
+        if "remote" in v:
+            return "Remote"
+        if "freel" in v:
+            return "Freelance"
+    tag_text = " ".join(str(t) for t in tags).lower()
+    if "intern" in tag_text:
+        return "Internship"
+    if "remote" in tag_text or "remote" in str(location or "").lower():
+        return "Remote"
+    return "N/A"
+
+
+def _fallback_id(url, title, company, location):
+    # Stable across refreshes, so by_id and recommend links keep working.
+    key = url or "\x1f".join(str(part or "") for part in (title, company, location))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def _job(source, raw_id, title, company, location, description, url, salary, tags, date, raw):
+    tags = [str(t) for t in (tags or []) if t]
+    location = location if isinstance(location, str) else ("Remote" if location else "")
+    if raw_id is None or raw_id == "":
+        raw_id = _fallback_id(url, title, company, location)
+    return {
+        "id": f"{source.lower()}:{raw_id}",
+        "title": str(title or UNTITLED),
+        "company_name": str(company or NO_COMPANY),
+        "location": location,
+        "type": _infer_type(raw, tags, location),
+        "salary": str(salary) if salary else None,
+        "tags": tags,
+        "date": date,
+        "url": url or "",
+        "source": source,
+        "summary": _summary(str(description or "")),
+        "description": str(description or ""),
+    }
+
+
+def normalize_remotive(j):
+    return _job(
+        "Remotive",
+        j.get("id") or j.get("slug") or j.get("url"),
+        j.get("title"),
+        j.get("company_name") or j.get("company"),
+        j.get("candidate_required_location") or j.get("location") or "Remote",
+        j.get("description") or j.get("description_preview"),
+        j.get("url") or j.get("job_apply_url"),
+        j.get("salary") or j.get("salary_from"),
+        j.get("tags") or ([j["category"]] if j.get("category") else []),
+        j.get("publication_date") or j.get("created_at") or j.get("date"),
+        j,
+    )
+
+
+def normalize_arbeitnow(j):
+    title = j.get("title") or j.get("position")
+    company = j.get("company") or j.get("company_name")
+    return _job(
+        "ArbeitNow",
+        j.get("slug") or j.get("id") or j.get("url") or f"{title}-{company or ''}",
+        title,
+        company,
+        j.get("location") or j.get("remote") or "Remote",
+        j.get("description") or j.get("content"),
+        j.get("url") or j.get("remote_url"),
+        j.get("salary"),
+        j.get("tags"),
+        j.get("created_at") or j.get("date"),
+        j,
+    )
+
+
+def normalize_adzuna(j):
+    company = j.get("company") if isinstance(j.get("company"), dict) else {}
+    location = j.get("location")
+    if isinstance(location, dict):
+        location = location.get("display_name")
+    category = j.get("category") if isinstance(j.get("category"), dict) else {}
+    low, high = j.get("salary_min"), j.get("salary_max")
+    salary = f"{low or ''}{'-' if low and high else ''}{high or ''}" if (low or high) else None
+    return _job(
+        "Adzuna",
+        j.get("id") or j.get("redirect_url"),
+        j.get("title"),
+        company.get("display_name") or company.get("name"),
+        location or "India",
+        j.get("description") or j.get("snippet"),
+        j.get("redirect_url") or j.get("redirect"),
+        salary,
+        [category["label"]] if category.get("label") else [],
+        j.get("created") or j.get("created_at") or j.get("created_date"),
+        j,
+    )
+
+
+def _timestamp(date):
+    if not date:
+        return 0.0
+    if isinstance(date, (int, float)):
+        return float(date)
+    try:
+        return datetime.fromisoformat(str(date).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def normalize_jobs(payload):
+    """
+    Flatten the raw aggregator payload into one list of compact jobs,
+    dropping cross-posted duplicates (same URL, or same title + company
+    where neither is missing), newest first.
+    """
+    sources = (
+        (payload.get("remotive", {}).get("jobs"), normalize_remotive),
+        (payload.get("arbeitnow", {}).get("data"), normalize_arbeitnow),
+        (payload.get("adzuna", {}).get("results"), normalize_adzuna),
+    )
+    jobs, seen = [], set()
+    for items, normalize in sources:
+        if not isinstance(items, list):
+            continue
+        for raw in items:
+            if not isinstance(raw, dict):
+                continue
+            job = normalize(raw)
+            keys = set()
+            if job["title"] != UNTITLED and job["company_name"] != NO_COMPANY:
+                keys.add(f"{job['title'].lower()}::{job['company_name'].lower()}")
+            if job["url"]:
+                keys.add(job["url"])
+            if keys & seen:
+                continue
+            seen.update(keys)
+            jobs.append(job)
+    jobs.sort(key=lambda job: _timestamp(job["date"]), reverse=True)
+    return jobs
+
+
+class _PrefixIndex:
+    """token -> sorted positions, with prefix lookups over a sorted vocabulary."""
+
+    def __init__(self):
+        self.postings = {}
+
+    def add(self, position, tokens):
+        for token in set(tokens):
+            self.postings.setdefault(token, []).append(position)
+
+    def freeze(self):
+        self.vocab = sorted(self.postings)
+
+    def lookup(self, prefix):
+        lo = bisect.bisect_left(self.vocab, prefix)
+        hi = bisect.bisect_left(self.vocab, prefix + "\uffff")
+        matches = set()
+        for token in self.vocab[lo:hi]:
+            matches.update(self.postings[token])
+        return matches
+
+
+class JobSearchIndex:
+    """
+    Keyword, location, tag, type and source index over one normalized
+    snapshot of the external jobs. Built once per refresh; queries intersect
+    posting sets instead of scanning every listing.
+    """
+
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.by_id = {job["id"]: i for i, job in enumerate(jobs)}
+        self._keywords = _PrefixIndex()
+        self._locations = _PrefixIndex()
+        self._tags, self._types, self._sources = {}, {}, {}
+        for i, job in enumerate(jobs):
+            text = " ".join((job["title"], job["company_name"], job["description"], " ".join(job["tags"])))
+            self._keywords.add(i, _tokens(text))
+            self._locations.add(i, _tokens(job["location"]))
+            for tag in job["tags"]:
+                self._tags.setdefault(tag.lower(), set()).add(i)
+            self._types.setdefault(job["type"].lower(), set()).add(i)
+            self._sources.setdefault(job["source"].lower(), set()).add(i)
+        self._keywords.freeze()
+        self._locations.freeze()
+        self._vectors = None
+        self._vectors_lock = threading.Lock()
+
+    def vectors(self):
+        """JobVectors for this snapshot, built by the first caller."""
+        if self._vectors is None:
+            with self._vectors_lock:
+                if self._vectors is None:
+                    self._vectors = JobVectors(self.jobs)
+        return self._vectors
+
+    def search(self, q=None, location=None, tag=None, job_type=None, source=None):
+        """Return matching positions (newest first). Every query word must prefix-match."""
+        candidates = None
+
+        def narrow(matches):
+            nonlocal candidates
+            candidates = set(matches) if candidates is None else candidates & matches
+
+        for term in _tokens(q):
+            narrow(self._keywords.lookup(term))
+        for term in _tokens(location):
+            narrow(self._locations.lookup(term))
+        if tag:
+            narrow(self._tags.get(tag.lower(), set()))
+        if job_type and job_type != "All Types":
+            narrow(self._types.get(job_type.lower(), set()))
+        if source:
+            narrow(self._sources.get(source.lower(), set()))
+        if candidates is None:
+            return list(range(len(self.jobs)))
+        return sorted(candidates)
+
+
+class JobVectors:
+    """
+    TF-IDF vectors of one snapshot's jobs (title counted twice, tags and
+    the description without markup) as L2-normalized rows of a sparse
+    matrix. Ranking a resume against every job is then one sparse
+    matrix-vector product and an argpartition for the top K, the same
+    cosine similarity VectorScorer uses for resumes.
+    """
+
+    def __init__(self, jobs):
+        import numpy as np
+        from scipy import sparse
+
+        self.vocab = {}
+        rows, cols, weights = [], [], []
+        for i, job in enumerate(jobs):
+            text = " ".join((job["title"], job["title"], " ".join(job["tags"]), _TAG_RE.sub(" ", job["description"])))
+            for token, n in Counter(_tokens(text)).items():
+                rows.append(i)
+                cols.append(self.vocab.setdefault(token, len(self.vocab)))
+                weights.append(1.0 + math.log(n))
+
+        cols = np.asarray(cols, dtype=np.int64)
+        df = np.bincount(cols, minlength=len(self.vocab)).astype(np.float64)
+        self.idf = np.log((1.0 + len(jobs)) / (1.0 + df)) + 1.0
+        matrix = sparse.csr_matrix(
+            (np.asarray(weights, dtype=np.float64) * self.idf[cols], (np.asarray(rows, dtype=np.int64), cols)),
+            shape=(len(jobs), len(self.vocab)),
+        )
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        self.matrix = (sparse.diags(1.0 / norms) @ matrix).tocsr()
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def recommend(self, text, limit=20):
+        """[(position, similarity 0-1), ...] best first; jobs sharing no term are left out."""
+        import numpy as np
+
+        counts = Counter(t for t in _tokens(text) if t in self.vocab)
+        if not counts or not limit:
+            return []
+        cols = np.fromiter((self.vocab[t] for t in counts), dtype=np.int64, count=len(counts))
+        query = np.zeros(len(self.vocab))
+        query[cols] = np.fromiter((1.0 + math.log(n) for n in counts.values()), dtype=np.float64) * self.idf[cols]
+        query /= np.linalg.norm(query)
+
+        scores = self.matrix @ query
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        # Best first; equal scores keep the snapshot's newest-first order.
+        order = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [(int(i), float(scores[i])) for i in order]
+
+
+def project(job, fields):
+    return job if not fields else {f: job[f] for f in fields if f in job}
+
+
+class JobSearchCache:
+    """Rebuilds the JobSearchIndex only when the underlying snapshot key changes."""
+
+    def __init__(self):
+        self._key = None
+        self._index = None
+        self._lock = threading.Lock()
+
+    def get(self, key, load_payload):
+        with self._lock:
+            if self._index is None or key != self._key:
+                self._index = JobSearchIndex(normalize_jobs(load_payload()))
+                self._key = key
+            return self._index
@@ -0,0 +1,82 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+
+class JobStore:
+    """
+    Job status snapshots shared by every worker process through one SQLite
+    file, so a job submitted to one gunicorn/uvicorn worker can be polled
+    through any other.
+
+    The worker running a job keeps its live state in memory and publishes
+    JSON snapshots here: at most every ``min_interval`` seconds while it
+    runs, and always when it finishes. Rows older than ``max_age`` seconds
+    are pruned. Storage errors are logged and never fail the job itself.
+    """
+
+    def __init__(self, path, min_interval=0.5, max_age=24 * 3600, logger=None):
+        self.path = path
+        self.min_interval = min_interval
+        self.max_age = max_age
+        self.logger = logger or logging.getLogger(__name__)
+        self._conn = None
+        self._conn_pid = None
+        self._published = {}
+        self._pruned_at = 0.0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # Connections don't survive fork; each process opens its own.
+        if self._conn is None or self._conn_pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "kind TEXT NOT NULL, job_id TEXT NOT NULL, snapshot TEXT NOT NULL, "
+                "updated_at REAL NOT NULL, PRIMARY KEY (kind, job_id))"
+            )
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    def publish(self, kind, job_id, snapshot, final=False):
+        """
+        Store ``snapshot()`` (a JSON-serializable dict) for the job, unless
+        the last one was published less than ``min_interval`` ago and this
+        is not the ``final`` state.
+        """
+        now = time.time()
+        with self._lock:
+            if not final and now - self._published.get(job_id, 0.0) < self.min_interval:
+                return
+            if final:
+                self._published.pop(job_id, None)
+            else:
+                self._published[job_id] = now
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO jobs (kind, job_id, snapshot, updated_at) VALUES (?, ?, ?, ?)",
+                    (kind, job_id, json.dumps(snapshot()), now),
+                )
+                if now - self._pruned_at > 60:
+                    self._pruned_at = now
+                    conn.execute("DELETE FROM jobs WHERE updated_at < ?", (now - self.max_age,))
+            except (sqlite3.Error, OSError) as e:
+                self.logger.warning("Job %s not published to %s: %s", job_id, self.path, e)
+
+    def get(self, kind, job_id):
+        """The last published snapshot of a job, or None."""
+        with self._lock:
+            try:
+                row = self._connect().execute(
+                    "SELECT snapshot FROM jobs WHERE kind = ? AND job_id = ?", (kind, job_id)
+                ).fetchone()
+            except (sqlite3.Error, OSError) as e:
+                self.logger.warning("Job store %s unavailable: %s", self.path, e)
+                return None
+        return json.loads(row[0]) if row else None
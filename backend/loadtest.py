@@ -0,0 +1,144 @@
+"""
+Load-test harness for the backend.
+
+Hits one endpoint from many client threads for a fixed duration and reports
+throughput and latency percentiles. With --workers it starts gunicorn once
+per worker count, so you can see how throughput scales:
+
+    python loadtest.py --workers 1,2,4 --path /shortlist --jd "python developer"
+    python loadtest.py --url http://localhost:5001 --path /health --concurrency 64
+
+Results are printed as a table and, with --json, written as JSON.
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+
+def _worker(url, method, body, deadline, latencies, errors, lock):
+    session = requests.Session()
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            if method == 'POST':
+                r = session.post(url, json=body, timeout=30)
+            else:
+                r = session.get(url, timeout=30)
+            ok = r.status_code < 500
+        except requests.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - start
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors[0] += 1
+
+
+def run_load(url, method='GET', body=None, concurrency=16, duration=10.0):
+    latencies, errors, lock = [], [0], threading.Lock()
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=_worker, args=(url, method, body, deadline, latencies, errors, lock))
+        for _ in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+
+    def pct(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2) if latencies else None
+
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": round(len(latencies) / wall, 1),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+    }
+
+
+def _wait_until_up(base_url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{base_url}/health", timeout=1).ok:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def start_gunicorn(workers, threads, port):
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), GUNICORN_THREADS=str(threads),
+               PORT=str(port), GUNICORN_ACCESS_LOG='')
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    if not _wait_until_up(f"http://127.0.0.1:{port}"):
+        proc.kill()
+        raise RuntimeError(f"gunicorn with {workers} workers did not start")
+    return proc
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='Base URL of a running server (skips starting gunicorn)')
+    parser.add_argument('--workers', default='1,2,4', help='Comma-separated gunicorn worker counts')
+    parser.add_argument('--threads', type=int, default=8, help='Threads per gunicorn worker')
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--path', default='/health')
+    parser.add_argument('--jd', help='Job description; sends a POST with {"jd": ...}')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--json', dest='json_path', help='Write results to this file')
+    args = parser.parse_args()
+
+    method, body = ('POST', {"jd": args.jd}) if args.jd else ('GET', None)
+    results = []
+
+    if args.url:
+        stats = run_load(args.url.rstrip('/') + args.path, method, body, args.concurrency, args.duration)
+        results.append(dict(stats, workers=None))
+    else:
+        for workers in [int(w) for w in args.workers.split(',') if w]:
+            proc = start_gunicorn(workers, args.threads, args.port)
+            try:
+                url = f"http://127.0.0.1:{args.port}{args.path}"
+                run_load(url, method, body, args.concurrency, min(2.0, args.duration))  # warm-up
+                stats = run_load(url, method, body, args.concurrency, args.duration)
+                results.append(dict(stats, workers=workers))
+            finally:
+                proc.send_signal(signal.SIGTERM)
+                proc.wait(timeout=30)
+
+    print(f"{'workers':>8} {'requests':>9} {'errors':>7} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for r in results:
+        print(f"{str(r['workers'] or '-'):>8} {r['requests']:>9} {r['errors']:>7} {r['rps']:>9} "
+              f"{r['p50_ms']!s:>9} {r['p95_ms']!s:>9} {r['p99_ms']!s:>9}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({"path": args.path, "method": method, "results": results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; tuned for request and stage latencies from ~1 ms to ~10 s.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_str(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    if value == float('inf'):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative-bucket histogram, rendered in the Prometheus text format."""
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, (list(s[0]), s[1], s[2])) for key, s in self._series.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_label_str(self.labels, key, [('le', _number(float(bound)))])} {cumulative}")
+            lines.append(f"{self.name}_bucket{_label_str(self.labels, key, [('le', '+Inf')])} {count}")
+            lines.append(f"{self.name}_sum{_label_str(self.labels, key)} {_number(round(total, 6))}")
+            lines.append(f"{self.name}_count{_label_str(self.labels, key)} {count}")
+        return lines
+
+
+class Metrics:
+    """
+    In-process metrics registry with a Prometheus-style text rendering.
+
+    Request and stage latencies are recorded as histograms as they happen;
+    figures other components already keep (cache hit counts, hashing and
+    upstream stats) are read by collectors only when /metrics is scraped, so
+    the hot path pays for nothing but a perf_counter() pair and a bucket bump.
+    Values are per process: with several gunicorn workers each one reports
+    its own.
+    """
+
+    def __init__(self):
+        self.requests = Histogram(
+            'http_request_duration_seconds', 'Time to produce a response, by route.', ('route', 'method', 'status'))
+        self.stages = Histogram('stage_duration_seconds', 'Time spent in a named hot-path stage.', ('stage',))
+        self._collectors = []
+
+    def collector(self, fn):
+        """
+        Register ``fn() -> [(name, type, help, [(labels_dict, value), ...]), ...]``,
+        called at scrape time. Usable as a decorator.
+        """
+        self._collectors.append(fn)
+        return fn
+
+    def observe_stage(self, stage, seconds):
+        self.stages.observe(seconds, stage=stage)
+
+    @contextmanager
+    def stage(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.observe(time.perf_counter() - start, stage=stage)
+
+    def render(self):
+        lines = self.requests.render() + self.stages.render()
+        for collect in self._collectors:
+            for name, kind, help, samples in collect():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    if value is None:
+                        continue
+                    lines.append(f"{name}{_label_str(list(labels), list(labels.values()))} {_number(value)}")
+        return "\n".join(lines) + "\n"
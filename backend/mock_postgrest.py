@@ -0,0 +1,155 @@
+"""
+Local stand-in for the Supabase REST (PostgREST) API, for tests and load
+tests that must not touch the real project.
+
+Supports the subset the backend uses on the ``users`` table: filtered
+selects (``col=eq.value``), single-object responses
+(``Accept: application/vnd.pgrst.object+json``), inserts with
+``Prefer: return=representation`` and the unique-email constraint.
+
+    python mock_postgrest.py --port 54321
+    SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_KEY=test python app.py
+
+An optional --latency simulates the network round trip to Supabase.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+SINGLE_OBJECT = "application/vnd.pgrst.object+json"
+UNIQUE_COLUMNS = {"users": ("email",)}
+
+
+class MockPostgrest:
+    """In-memory tables served over HTTP in a background thread."""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0):
+        self.tables = {}
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def select(self, table, filters):
+        with self._lock:
+            rows = self.tables.get(table, [])
+            return [dict(r) for r in rows if all(str(r.get(col)) == value for col, value in filters)]
+
+    def insert(self, table, rows):
+        with self._lock:
+            existing = self.tables.setdefault(table, [])
+            for row in rows:
+                for col in UNIQUE_COLUMNS.get(table, ()):
+                    if row.get(col) is not None and any(r.get(col) == row[col] for r in existing):
+                        return None, col
+            existing.extend(dict(r) for r in rows)
+            return [dict(r) for r in rows], None
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, payload):
+                body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _table(self):
+                parts = urlsplit(self.path)
+                prefix = "/rest/v1/"
+                if not parts.path.startswith(prefix):
+                    return None, []
+                query = [(k, v) for k, v in parse_qsl(parts.query) if k != "select"]
+                filters = [(k, v[3:]) for k, v in query if v.startswith("eq.")]
+                return parts.path[len(prefix):], filters
+
+            def _begin(self):
+                with mock._lock:
+                    mock.requests += 1
+                if mock.latency:
+                    time.sleep(mock.latency)
+
+            def do_GET(self):
+                self._begin()
+                table, filters = self._table()
+                if table is None:
+                    return self._send(404, {"message": "Not found"})
+                rows = mock.select(table, filters)
+                if SINGLE_OBJECT in self.headers.get("Accept", ""):
+                    if len(rows) != 1:
+                        return self._send(406, {
+                            "code": "PGRST116",
+                            "details": f"The result contains {len(rows)} rows",
+                            "hint": None,
+                            "message": "JSON object requested, multiple (or no) rows returned",
+                        })
+                    return self._send(200, rows[0])
+                return self._send(200, rows)
+
+            def do_POST(self):
+                self._begin()
+                table, _ = self._table()
+                if table is None:
+                    return self._send(404, {"message": "Not found"})
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"[]")
+                rows = payload if isinstance(payload, list) else [payload]
+                inserted, conflict = mock.insert(table, rows)
+                if conflict:
+                    return self._send(409, {
+                        "code": "23505",
+                        "details": f"Key ({conflict}) already exists.",
+                        "hint": None,
+                        "message": f'duplicate key value violates unique constraint "{table}_{conflict}_key"',
+                    })
+                if "return=representation" in self.headers.get("Prefer", ""):
+                    return self._send(201, inserted)
+                return self._send(201, None)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local mock of the Supabase REST API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to sleep per request")
+    args = parser.parse_args()
+    mock = MockPostgrest(args.host, args.port, args.latency).start()
+    print(f"Mock PostgREST listening on {mock.url} (SUPABASE_URL={mock.url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
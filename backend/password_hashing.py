@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import bcrypt
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing pool is saturated and the request should back off."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a small dedicated thread pool (bcrypt releases the GIL
+    while hashing) so login bursts are capped at ``max_workers`` cores.
+    At most ``max_queue`` further calls may wait; beyond that, and for
+    calls that wait longer than ``timeout`` seconds, HashingBusy is raised
+    so the route can answer 503 immediately instead of piling up threads.
+    """
+
+    def __init__(self, rounds=12, max_workers=2, max_queue=32, timeout=10.0, sample_size=1024):
+        self.rounds = rounds
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=sample_size)
+        self._stats = {"hash": 0, "check": 0, "rejected": 0, "timeouts": 0, "in_flight": 0}
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+
+    def _timed(self, kind, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self._stats[kind] += 1
+                self._samples.append(elapsed_ms)
+
+    def _submit(self, kind, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise HashingBusy("Password hashing is saturated")
+        with self._lock:
+            self._stats["in_flight"] += 1
+        try:
+            future = self._executor.submit(self._timed, kind, fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _timed_out(self):
+        with self._lock:
+            self._stats["timeouts"] += 1
+        return HashingBusy("Password hashing timed out")
+
+    def _run(self, kind, fn, *args):
+        future = self._submit(kind, fn, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise self._timed_out()
+
+    async def _arun(self, kind, fn, *args):
+        # Same pool and back-pressure, awaited without blocking the event loop.
+        future = self._submit(kind, fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            raise self._timed_out()
+
+    def _release(self, _future):
+        with self._lock:
+            self._stats["in_flight"] -= 1
+        self._slots.release()
+
+    def hash(self, password):
+        """Return the bcrypt hash of ``password`` as a str."""
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        hashed = self._run("hash", bcrypt.hashpw, password.encode('utf-8'), salt)
+        return hashed.decode('utf-8')
+
+    def check(self, password, password_hash):
+        if isinstance(password_hash, str):
+            password_hash = password_hash.encode('utf-8')
+        return self._run("check", bcrypt.checkpw, password.encode('utf-8'), password_hash)
+
+    async def ahash(self, password):
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        hashed = await self._arun("hash", bcrypt.hashpw, password.encode('utf-8'), salt)
+        return hashed.decode('utf-8')
+
+    async def acheck(self, password, password_hash):
+        if isinstance(password_hash, str):
+            password_hash = password_hash.encode('utf-8')
+        return await self._arun("check", bcrypt.checkpw, password.encode('utf-8'), password_hash)
+
+    def stats(self):
+        with self._lock:
+            samples = sorted(self._samples)
+            stats = dict(self._stats)
+        if samples:
+            stats["latency_ms"] = {
+                "p50": round(samples[len(samples) // 2], 2),
+                "p95": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+                "max": round(samples[-1], 2),
+            }
+        stats.update({"rounds": self.rounds, "workers": self.max_workers, "max_queue": self.max_queue})
+        return stats
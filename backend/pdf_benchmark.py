@@ -0,0 +1,117 @@
+"""
+Compare the installed PDF text backends on a folder of PDFs.
+
+    python pdf_benchmark.py resumes
+    python pdf_benchmark.py --synthetic 200 --pages 3 --json pdf_bench.json
+
+Every backend extracts every file (--repeat times, best run kept) and the
+table shows files/s, total time, failures and how many words each backend
+recovered. With --synthetic a fixture corpus of generated text PDFs is
+written to a temp folder and used instead.
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import tempfile
+import time
+
+from pdf_text import ExtractionError, available_backends, extract_pdf_text
+
+_WORDS = (
+    "python java sql aws docker kubernetes react flask django spark pandas "
+    "engineer developer manager analyst lead senior junior team project "
+    "design testing delivery cloud data pipeline api microservices agile"
+).split()
+
+
+def _pdf_bytes(pages):
+    """A minimal valid PDF with one Helvetica text block per page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None]
+    kids = []
+    font_ref = 3
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for lines in pages:
+        content = "BT /F1 10 Tf 40 780 Td 12 TL " + " ".join(f"({line}) '" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {content_ref} 0 R "
+            f"/Resources << /Font << /F1 {font_ref} 0 R >> >> >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out, offsets = "%PDF-1.4\n", []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+def write_fixtures(directory, count, pages, seed=7):
+    rng = random.Random(seed)
+    for i in range(count):
+        doc = [[" ".join(rng.choices(_WORDS, k=12)) for _ in range(50)] for _ in range(pages)]
+        with open(os.path.join(directory, f"resume_{i:04d}.pdf"), "wb") as f:
+            f.write(_pdf_bytes(doc))
+
+
+def bench(backend, files, repeat, max_pages, max_seconds):
+    best = None
+    for _ in range(repeat):
+        words = failures = 0
+        start = time.perf_counter()
+        for filepath in files:
+            try:
+                text, _ = extract_pdf_text(filepath, backend, max_pages, max_seconds)
+                words += len(text.split())
+            except ExtractionError:
+                failures += 1
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best["seconds"]:
+            best = {"backend": backend, "seconds": round(elapsed, 3), "failures": failures, "words": words}
+    best["files_per_s"] = round(len(files) / best["seconds"], 1) if best["seconds"] else None
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('folder', nargs='?', default='resumes', help='Folder of PDFs to extract')
+    parser.add_argument('--synthetic', type=int, help='Generate this many fixture PDFs instead')
+    parser.add_argument('--pages', type=int, default=2, help='Pages per generated PDF')
+    parser.add_argument('--backends', help='Comma-separated backends (default: all installed)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-pages', type=int)
+    parser.add_argument('--max-seconds', type=float)
+    parser.add_argument('--json', dest='json_path', help='Write results to this file')
+    args = parser.parse_args()
+
+    backends = args.backends.split(',') if args.backends else available_backends()
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = args.folder
+        if args.synthetic:
+            folder = tmp
+            write_fixtures(folder, args.synthetic, args.pages)
+        files = sorted(glob.glob(os.path.join(folder, '*.pdf')))
+        if not files:
+            parser.error(f"no PDFs found in {folder}")
+        results = [bench(b, files, args.repeat, args.max_pages, args.max_seconds) for b in backends]
+
+    print(f"{len(files)} files")
+    print(f"{'backend':>10} {'files/s':>9} {'seconds':>9} {'failures':>9} {'words':>9}")
+    for r in sorted(results, key=lambda r: r["seconds"]):
+        print(f"{r['backend']:>10} {r['files_per_s']!s:>9} {r['seconds']:>9} {r['failures']:>9} {r['words']:>9}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({"files": len(files), "results": results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
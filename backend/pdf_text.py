@@ -0,0 +1,112 @@
+import importlib.util
+import time
+from collections import OrderedDict
+
+
+class ExtractionError(Exception):
+    """Raised with a short reason when a PDF cannot be read."""
+
+
+def _pages_pdfium(filepath):
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(filepath)
+    try:
+        for i in range(len(pdf)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            try:
+                yield textpage.get_text_range()
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+
+
+def _pages_pypdf(filepath):
+    from pypdf import PdfReader
+
+    with open(filepath, 'rb') as file:
+        for page in PdfReader(file).pages:
+            yield page.extract_text()
+
+
+def _pages_pypdf2(filepath):
+    import PyPDF2
+
+    with open(filepath, 'rb') as file:
+        for page in PyPDF2.PdfReader(file).pages:
+            yield page.extract_text()
+
+
+def _pages_pdfminer(filepath):
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+
+    for layout in extract_pages(filepath):
+        yield "".join(element.get_text() for element in layout if isinstance(element, LTTextContainer))
+
+
+# name -> (module that must be importable, page iterator), in "auto" preference order.
+BACKENDS = OrderedDict([
+    ('pdfium', ('pypdfium2', _pages_pdfium)),
+    ('pypdf', ('pypdf', _pages_pypdf)),
+    ('pypdf2', ('PyPDF2', _pages_pypdf2)),
+    ('pdfminer', ('pdfminer', _pages_pdfminer)),
+])
+
+
+def available_backends():
+    return [name for name, (module, _) in BACKENDS.items() if importlib.util.find_spec(module) is not None]
+
+
+def resolve_backend(backend='auto'):
+    """Map 'auto' (or None) to the fastest installed backend; validate the rest."""
+    if backend in (None, '', 'auto'):
+        installed = available_backends()
+        if not installed:
+            raise ExtractionError("No PDF backend installed")
+        return installed[0]
+    backend = backend.lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"PDF backend must be one of: auto, {', '.join(BACKENDS)}")
+    return backend
+
+
+def extract_pdf_text(filepath, backend='auto', max_pages=None, max_seconds=None):
+    """
+    Extract text page by page with ``backend``. Pages are streamed from the
+    parser and joined once at the end. Stops after ``max_pages`` pages or once
+    ``max_seconds`` have passed (checked between pages; a page that finishes
+    after the deadline is dropped).
+
+    Returns (text, info) where info has the backend, the number of pages read
+    and ``truncated`` ("page limit", "time limit", a parse error part-way
+    through, or None). Raises ExtractionError if not even the first page
+    can be read.
+    """
+    name = resolve_backend(backend)
+    pages = BACKENDS[name][1](filepath)
+    parts, read, truncated = [], 0, None
+    start = time.perf_counter()
+    try:
+        for page_text in pages:
+            if max_pages is not None and read >= max_pages:
+                truncated = "page limit"
+                break
+            if max_seconds is not None and time.perf_counter() - start > max_seconds:
+                truncated = "time limit"
+                break
+            read += 1
+            if page_text:
+                parts.append(page_text)
+    except Exception as e:
+        if not read:
+            raise ExtractionError(f"Unreadable PDF ({name}): {type(e).__name__}: {e}") from e
+        truncated = f"stopped at page {read + 1}: {type(e).__name__}"
+    finally:
+        pages.close()
+
+    info = {"backend": name, "pages": read, "truncated": truncated, "seconds": round(time.perf_counter() - start, 4)}
+    return " ".join(parts).strip(), info
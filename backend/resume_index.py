@@ -0,0 +1,160 @@
+import heapq
+import threading
+from array import array
+from collections import Counter
+
+
+def tokenize(text):
+    """Split text the same way calculate_match_score does."""
+    return text.lower().split()
+
+
+class ResumeIndex:
+    """
+    Incremental inverted index over the resume corpus.
+
+    ``postings`` maps token -> {doc_id: term frequency}. A query only touches
+    the postings of the job description's own terms, so its cost follows the
+    size of those postings rather than the size of the corpus. Scores are the
+    same vocabulary-overlap percentage calculate_match_score produces.
+    """
+
+    def __init__(self):
+        self._postings = {}
+        self._doc_terms = {}
+        self._doc_tfs = {}
+        self._doc_digests = {}
+        self._doc_lengths = {}
+        self._doc_versions = {}
+        self._lock = threading.RLock()
+        self.version = 0
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._doc_terms
+
+    def digest(self, doc_id):
+        return self._doc_digests.get(doc_id)
+
+    def doc_ids(self):
+        with self._lock:
+            return list(self._doc_terms)
+
+    def add(self, doc_id, text, digest=None):
+        tokens = tokenize(text)
+        counts = Counter(tokens)
+        with self._lock:
+            self._remove(doc_id)
+            for token, tf in counts.items():
+                self._postings.setdefault(token, {})[doc_id] = tf
+            self._doc_terms[doc_id] = tuple(counts)
+            self._doc_tfs[doc_id] = array('I', counts.values())
+            self._doc_digests[doc_id] = digest
+            self._doc_lengths[doc_id] = len(tokens)
+            self.version += 1
+            self._doc_versions[doc_id] = self.version
+
+    def remove(self, doc_id):
+        with self._lock:
+            if self._remove(doc_id):
+                self.version += 1
+
+    def _remove(self, doc_id):
+        terms = self._doc_terms.pop(doc_id, None)
+        self._doc_tfs.pop(doc_id, None)
+        self._doc_digests.pop(doc_id, None)
+        self._doc_lengths.pop(doc_id, None)
+        self._doc_versions.pop(doc_id, None)
+        if terms is None:
+            return False
+        for token in terms:
+            docs = self._postings.get(token)
+            if docs is None:
+                continue
+            docs.pop(doc_id, None)
+            if not docs:
+                del self._postings[token]
+        return True
+
+    def export_rows(self, known=()):
+        """
+        Snapshot the non-empty documents for vectorized scoring. Returns
+        (version, keys, rows): ``keys`` lists a (doc_id, added_at_version)
+        pair per document, and ``rows`` maps the keys not in ``known`` to
+        (terms, term_frequencies, length), the frequencies as an unsigned
+        int array aligned with ``terms``. A key changes whenever its
+        document is re-added, so rows from an earlier export stay valid.
+        """
+        with self._lock:
+            keys = [(d, self._doc_versions[d]) for d, terms in self._doc_terms.items() if terms]
+            rows = {
+                key: (self._doc_terms[key[0]], self._doc_tfs[key[0]], self._doc_lengths[key[0]])
+                for key in keys if key not in known
+            }
+            return self.version, keys, rows
+
+    def match_counts(self, jd_terms):
+        """Return {doc_id: number of distinct jd_terms found in the doc}."""
+        counts = Counter()
+        with self._lock:
+            for token in jd_terms:
+                docs = self._postings.get(token)
+                if docs:
+                    counts.update(docs.keys())
+        return counts
+
+    def _scored(self, jd_text, min_score=None):
+        jd_terms = set(tokenize(jd_text))
+        counts = self.match_counts(jd_terms) if jd_terms else Counter()
+        total = len(jd_terms)
+        scored = [(doc_id, (n / total) * 100) for doc_id, n in counts.items()]
+        if min_score is not None:
+            scored = [item for item in scored if item[1] >= min_score]
+        return scored, counts
+
+    def _unmatched(self, counts):
+        with self._lock:
+            return sorted(d for d, terms in self._doc_terms.items() if terms and d not in counts)
+
+    def search(self, jd_text, limit=None, offset=0, min_score=None):
+        """
+        Score resumes against ``jd_text``. Returns [(doc_id, score), ...]
+        sorted by score (highest first, ties by doc_id). With ``limit`` only
+        the best ``offset + limit`` are selected, through a bounded heap.
+        Resumes sharing no term with the JD score 0.0 and only fill the tail.
+        """
+        scored, counts = self._scored(jd_text, min_score)
+        end = None if limit is None else offset + limit
+        if end is not None:
+            ranked = heapq.nsmallest(end, scored, key=_rank_key)
+        else:
+            ranked = sorted(scored, key=_rank_key)
+
+        if (min_score is None or min_score <= 0) and (end is None or len(ranked) < end):
+            zero = self._unmatched(counts)
+            if end is not None:
+                zero = zero[:end - len(ranked)]
+            ranked.extend((doc_id, 0.0) for doc_id in zero)
+        return ranked[offset:end]
+
+    def iter_ranked(self, jd_text, min_score=None):
+        """
+        Yield (doc_id, score) in the same order as ``search`` lazily: the
+        candidates are heapified once and popped one at a time, so the first
+        result is available without sorting the whole corpus.
+        """
+        scored, counts = self._scored(jd_text, min_score)
+        heap = [(-score, doc_id) for doc_id, score in scored]
+        heapq.heapify(heap)
+        while heap:
+            neg_score, doc_id = heapq.heappop(heap)
+            yield doc_id, -neg_score
+        if min_score is None or min_score <= 0:
+            for doc_id in self._unmatched(counts):
+                yield doc_id, 0.0
+
+
+def _rank_key(item):
+    return -item[1], item[0]
@@ -0,0 +1,242 @@
+import hashlib
+import itertools
+import threading
+from collections import Counter
+
+from resume_index import tokenize
+
+SCORERS = ('overlap', 'tfidf', 'bm25')
+
+
+def jd_fingerprint(jd_text, scorer='overlap'):
+    """
+    Hash of the parts of a JD that ``scorer`` actually looks at, so JDs that
+    differ only in case, whitespace or word order share cached results.
+    Overlap only depends on the distinct words; TF-IDF and BM25 also on
+    their counts.
+    """
+    terms = Counter(tokenize(jd_text))
+    if scorer == 'overlap':
+        canonical = " ".join(sorted(terms))
+    else:
+        canonical = " ".join(f"{token}:{n}" for token, n in sorted(terms.items()))
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+class _CorpusMatrices:
+    """
+    Sparse matrices for one version of the resume index.
+
+    Per-resume rows (column ids and term counts) are carried over from the
+    ``previous`` version, so only resumes added since are read from the
+    index and converted. Column ids are append-only, so terms of removed
+    resumes stay as empty columns until the vocabulary is mostly dead and
+    everything is rebuilt.
+
+    This is not an O(change) update: the CSR matrices are reassembled from
+    the rows and the corpus-wide weights (document frequencies, idf, BM25
+    length norms, TF-IDF row norms) recomputed on every version, because
+    any added or removed resume changes them for every document. That part
+    is array operations over all non-zeros, so a new version still costs
+    time proportional to the corpus.
+    """
+
+    def __init__(self, index, k1, b, previous=None):
+        # numpy and scipy are only needed by the vector scorers; importing
+        # them on first use keeps them out of the server's startup.
+        import numpy as np
+        from scipy import sparse
+
+        if previous is not None and len(previous.vocab) > 2 * previous.live_terms + 1024:
+            previous = None
+        known = previous.rows if previous is not None else {}
+        self.vocab = dict(previous.vocab) if previous is not None else {}
+
+        version, keys, fresh = index.export_rows(known)
+        self.version = version
+        self.rows = {key: known[key] for key in keys if key in known}
+        if fresh:
+            # New resumes are converted in one pass, then split into rows.
+            vocab = self.vocab
+            terms = list(itertools.chain.from_iterable(terms for terms, _, _ in fresh.values()))
+            for term in dict.fromkeys(terms):
+                vocab.setdefault(term, len(vocab))
+            cols = np.fromiter(map(vocab.__getitem__, terms), dtype=np.int64, count=len(terms))
+            tfs = np.frombuffer(b"".join(doc_tfs.tobytes() for _, doc_tfs, _ in fresh.values()),
+                                dtype=np.uintc).astype(np.float64)
+            indptr = np.zeros(len(fresh) + 1, dtype=np.int64)
+            np.cumsum([len(terms) for terms, _, _ in fresh.values()], out=indptr[1:])
+            # Sorted column ids per row, so the assembled matrix needs no sort.
+            batch = sparse.csr_matrix((tfs, cols, indptr), shape=(len(fresh), len(vocab)))
+            batch.sort_indices()
+            cols, tfs = batch.indices.astype(np.int64), batch.data
+            bounds = indptr[1:-1]
+            for key, doc_cols, doc_tfs, (_, _, length) in zip(
+                    fresh, np.split(cols, bounds), np.split(tfs, bounds), fresh.values()):
+                self.rows[key] = (doc_cols, doc_tfs, length)
+        self.doc_ids = [doc_id for doc_id, _ in keys]
+        self.doc_keys = np.array(self.doc_ids, dtype=str)
+
+        n_docs, n_terms = len(keys), len(self.vocab)
+        rows = [self.rows[key] for key in keys]
+        indptr = np.zeros(n_docs + 1, dtype=np.int64)
+        np.cumsum([len(r[0]) for r in rows], out=indptr[1:])
+        indices = np.concatenate([r[0] for r in rows]) if rows else np.zeros(0, dtype=np.int64)
+        tf = sparse.csr_matrix(
+            (np.concatenate([r[1] for r in rows]) if rows else np.zeros(0), indices, indptr),
+            shape=(n_docs, n_terms),
+        )
+        tf.has_sorted_indices = True
+        lengths = [r[2] for r in rows]
+        df = np.bincount(indices, minlength=n_terms).astype(np.float64)
+        self.live_terms = int(np.count_nonzero(df))
+
+        # Binary presence, for the vocabulary-overlap percentage.
+        self.presence = tf.copy()
+        self.presence.data[:] = 1.0
+
+        # TF-IDF with smoothed idf and L2-normalised rows (cosine similarity).
+        self.tfidf_idf = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+        self.tfidf = _l2_normalize_rows(tf.multiply(self.tfidf_idf).tocsr())
+
+        # Okapi BM25 term weights, precomputed per (doc, term).
+        self.bm25_idf = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+        lengths = np.asarray(lengths, dtype=np.float64)
+        avgdl = lengths.mean() if n_docs else 0.0
+        norm = k1 * (1.0 - b + b * lengths / avgdl) if avgdl else np.full(n_docs, k1)
+        bm25 = tf.copy()
+        row_of = np.repeat(np.arange(n_docs), np.diff(bm25.indptr))
+        bm25.data = self.bm25_idf[bm25.indices] * (bm25.data * (k1 + 1.0)) / (bm25.data + norm[row_of])
+        self.bm25 = bm25
+        self.k1 = k1
+
+
+def _l2_normalize_rows(matrix):
+    import numpy as np
+    from scipy import sparse
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+
+class VectorScorer:
+    """
+    Scores job descriptions against the whole resume corpus with sparse
+    matrix products instead of per-resume Python loops.
+
+    The matrices are brought up to date lazily whenever the ResumeIndex
+    version changes, reusing the rows of resumes that did not change.
+    Every scorer reports a 0-100 percentage:
+
+    - ``overlap``: share of distinct JD words found in the resume, identical
+      to calculate_match_score
+    - ``tfidf``: cosine similarity of TF-IDF vectors
+    - ``bm25``: Okapi BM25 relative to the best score the JD could reach
+    """
+
+    def __init__(self, index, k1=1.2, b=0.75):
+        self.index = index
+        self.k1 = k1
+        self.b = b
+        self._matrices = None
+        self._lock = threading.Lock()
+
+    def matrices(self):
+        current = self._matrices
+        if current is not None and current.version == self.index.version:
+            return current
+        with self._lock:
+            current = self._matrices
+            if current is None or current.version != self.index.version:
+                current = _CorpusMatrices(self.index, self.k1, self.b, previous=current)
+                self._matrices = current
+            return current
+
+    def _query_matrix(self, m, jd_texts):
+        """Term-count matrix (n_jds x vocab) plus each JD's distinct-word count."""
+        import numpy as np
+        from scipy import sparse
+
+        rows, cols, counts, distinct = [], [], [], []
+        for i, jd_text in enumerate(jd_texts):
+            terms = Counter(tokenize(jd_text))
+            distinct.append(len(terms))
+            for token, n in terms.items():
+                col = m.vocab.get(token)
+                if col is not None:
+                    rows.append(i)
+                    cols.append(col)
+                    counts.append(n)
+        query = sparse.csr_matrix(
+            (np.asarray(counts, dtype=np.float64), (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+            shape=(len(jd_texts), len(m.vocab)),
+        )
+        return query, np.asarray(distinct, dtype=np.float64)
+
+    def prepare(self, jd_texts, scorer='overlap'):
+        """
+        Build the query side of a scoring pass once, so the corpus can then
+        be scored in row chunks with score_rows(). Returns (matrices, query).
+        """
+        import numpy as np
+
+        if scorer not in SCORERS:
+            raise ValueError(f"scorer must be one of: {', '.join(SCORERS)}")
+        m = self.matrices()
+        query, distinct = self._query_matrix(m, jd_texts)
+
+        if scorer == 'overlap':
+            query.data[:] = 1.0
+            divisor = np.where(distinct > 0, distinct, 1.0)[:, None]
+        elif scorer == 'tfidf':
+            query = _l2_normalize_rows(query.multiply(m.tfidf_idf).tocsr())
+            divisor = np.ones((len(jd_texts), 1))
+        else:
+            ceiling = np.asarray(query.multiply(m.bm25_idf).sum(axis=1)).ravel() * (m.k1 + 1.0)
+            divisor = np.where(ceiling > 0, ceiling, 1.0)[:, None]
+        return m, (scorer, query, divisor)
+
+    def score_rows(self, m, query, start=0, stop=None):
+        """Percentages of the prepared ``query`` against resumes ``start:stop``."""
+        scorer, weights, divisor = query
+        corpus = {'overlap': m.presence, 'tfidf': m.tfidf, 'bm25': m.bm25}[scorer]
+        if start or stop is not None:
+            corpus = corpus[start:stop]
+        return (weights @ corpus.T).toarray() / divisor * 100
+
+    def score_matrix(self, jd_texts, scorer='overlap'):
+        """
+        Score every JD in ``jd_texts`` against every resume in one pass.
+        Returns (matrices, scores) where scores is an (n_jds x n_docs) array
+        of percentages aligned with ``matrices.doc_ids``.
+        """
+        m, query = self.prepare(jd_texts, scorer)
+        return m, self.score_rows(m, query)
+
+    def rank(self, jd_text, scorer, limit=None, offset=0, min_score=None):
+        """Ranked [(doc_id, score), ...] for a single JD, like ResumeIndex.search."""
+        m, scores = self.score_matrix([jd_text], scorer)
+        return rank_scores(m, scores[0], limit=limit, offset=offset, min_score=min_score)
+
+
+def rank_scores(m, scores, limit=None, offset=0, min_score=None, start=0):
+    """
+    Order one row of scores (highest first, ties by doc id). With a limit,
+    only the top ``offset + limit`` candidates are partitioned out and sorted.
+    ``start`` is the first resume row when ``scores`` covers a chunk only.
+    """
+    import numpy as np
+
+    candidates = np.arange(len(scores))
+    if min_score is not None:
+        candidates = candidates[scores >= min_score]
+    end = None if limit is None else offset + limit
+    if end is not None and 0 < end < len(candidates):
+        # Keep everything tied with the k-th score so tie-breaking stays exact.
+        kth = np.partition(scores[candidates], len(candidates) - end)[len(candidates) - end]
+        candidates = candidates[scores[candidates] >= kth]
+    elif end == 0:
+        candidates = candidates[:0]
+    order = candidates[np.lexsort((m.doc_keys[candidates + start], -scores[candidates]))]
+    return [(m.doc_ids[i + start], float(scores[i])) for i in order[offset:end]]
@@ -0,0 +1,187 @@
+import heapq
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from cache_utils import LRUCache
+from scoring import jd_fingerprint, rank_scores
+
+
+def _rank_key(item):
+    doc_id, score = item
+    return -score, doc_id
+
+
+class ShortlistJobQueue:
+    """
+    Runs shortlisting as a background job so large corpora don't have to be
+    scored inside one HTTP request.
+
+    A job prepares the JD query once, then scores the resume matrix in row
+    chunks of ``chunk_size`` on a shared thread pool. After every chunk the
+    job's progress and its partial top-K are updated, so pollers see the
+    best matches found so far. Finished rankings are cached per (corpus
+    version, scorer, JD fingerprint, limit, min_score); an equivalent
+    submission is answered from the cache or attached to the job already
+    computing it.
+
+    ``prepare`` is called before scoring, e.g. to wait for in-flight
+    resume ingestion; if it returns False the corpus was incomplete and the
+    ranking is not cached. ``version()`` gives the corpus version the cache
+    is keyed by (default: the scorer's index version); pass one shared by
+    every worker when resumes can arrive through other processes. With a
+    ``job_store`` (a JobStore), status snapshots are published there too,
+    so jobs can be polled from any worker process.
+    """
+
+    def __init__(self, scorer, prepare=None, max_workers=2, chunk_size=500, max_jobs=200, cache_entries=64,
+                 job_store=None, version=None):
+        self.scorer = scorer
+        self.prepare = prepare
+        self.version = version or (lambda: self.scorer.index.version)
+        self.job_store = job_store
+        self.chunk_size = max(1, chunk_size)
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='shortlist')
+        self._results = LRUCache(max_entries=cache_entries)
+        self._jobs = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _cache_key(self, version, scorer, jd_text, limit, min_score):
+        return (version, scorer, jd_fingerprint(jd_text, scorer), limit, min_score)
+
+    def submit(self, jd_text, scorer='overlap', limit=None, min_score=None):
+        """Queue a shortlist job and return its id."""
+        key = self._cache_key(self.version(), scorer, jd_text, limit, min_score)
+        cached = self._results.get(key)
+        with self._lock:
+            if cached is None and self._inflight.get(key) in self._jobs:
+                return self._inflight[key]
+            job_id = uuid.uuid4().hex
+            job = {
+                "id": job_id,
+                "status": "queued",
+                "scorer": scorer,
+                "limit": limit,
+                "min_score": min_score,
+                "cached": cached is not None,
+                "total": None,
+                "scored": 0,
+                "results": [],
+                "error": None,
+                "created_at": time.time(),
+                "finished_at": None,
+            }
+            self._jobs[job_id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+            if cached is not None:
+                total = len(self.scorer.index.doc_ids())
+                job.update(status="done", total=total, scored=total, results=cached, finished_at=job["created_at"])
+            else:
+                self._inflight[key] = job_id
+        self._publish(job, final=cached is not None)
+        if cached is None:
+            self._executor.submit(self._start, job, key, jd_text)
+        return job_id
+
+    def _start(self, job, key, jd_text):
+        try:
+            complete = True
+            if self.prepare is not None:
+                complete = self.prepare() is not False
+            m, query = self.scorer.prepare([jd_text], job["scorer"])
+        except Exception as e:
+            return self._fail(job, key, e)
+
+        total = len(m.doc_ids)
+        chunks = [(start, min(start + self.chunk_size, total)) for start in range(0, total, self.chunk_size)]
+        with self._lock:
+            job.update(status="running", total=total, chunks_left=len(chunks))
+        self._publish(job)
+        # The version was read before prepare(), so what was scored is at
+        # least that current.
+        final_key = key if complete else None
+        if not chunks:
+            return self._finish(job, key, final_key)
+        for start, stop in chunks:
+            self._executor.submit(self._score_chunk, job, key, final_key, m, query, start, stop)
+
+    def _score_chunk(self, job, key, final_key, m, query, start, stop):
+        if job["status"] == "failed":
+            return
+        try:
+            scores = self.scorer.score_rows(m, query, start, stop)[0]
+            top = rank_scores(m, scores, limit=job["limit"], min_score=job["min_score"], start=start)
+        except Exception as e:
+            return self._fail(job, key, e)
+
+        with self._lock:
+            # Both lists are already ranked, so a merge keeps the order.
+            merged = heapq.merge(job["results"], top, key=_rank_key)
+            if job["limit"] is not None:
+                merged = itertools.islice(merged, job["limit"])
+            job["results"] = list(merged)
+            job["scored"] += stop - start
+            job["chunks_left"] -= 1
+            last = job["chunks_left"] == 0
+        if last:
+            self._finish(job, key, final_key)
+        else:
+            self._publish(job)
+
+    def _finish(self, job, key, final_key):
+        if final_key is not None:
+            self._results.set(final_key, job["results"])
+        with self._lock:
+            job.update(status="done", finished_at=time.time())
+            self._inflight.pop(key, None)
+        self._publish(job, final=True)
+
+    def _fail(self, job, key, error):
+        with self._lock:
+            job.update(status="failed", error=f"{type(error).__name__}: {error}", finished_at=time.time())
+            self._inflight.pop(key, None)
+        self._publish(job, final=True)
+
+    def _publish(self, job, final=False):
+        if self.job_store is not None:
+            self.job_store.publish("shortlist", job["id"], lambda: self._snapshot(job), final=final)
+
+    def status(self, job_id):
+        """
+        Snapshot of a job: status (queued, running, done or failed), progress
+        and the ranked [(doc_id, score), ...] found so far. None if unknown.
+        Jobs run by another worker are read from the job store.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return self._snapshot(job)
+        if self.job_store is not None:
+            return self.job_store.get("shortlist", job_id)
+        return None
+
+    def _snapshot(self, job):
+        with self._lock:
+            total = job["total"]
+            finished = job["finished_at"] or time.time()
+            return {
+                "job_id": job["id"],
+                "status": job["status"],
+                "scorer": job["scorer"],
+                "cached": job["cached"],
+                "progress": {
+                    "scored": job["scored"],
+                    "total": total,
+                    "percent": round(100.0 * job["scored"] / total, 1) if total
+                    else (100.0 if job["status"] == "done" else 0.0),
+                },
+                "elapsed_ms": round((finished - job["created_at"]) * 1000, 1),
+                "error": job["error"],
+                "results": list(job["results"]),
+            }
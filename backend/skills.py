@@ -0,0 +1,153 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+
+# Lowercased words; keeps the inner punctuation of "node.js", "c++" or "c#"
+# but drops what is only attached ("python," -> "python").
+_WORD = re.compile(r"[a-z0-9](?:[a-z0-9+#.]*[a-z0-9+#])?")
+
+
+def skill_tokens(text):
+    return _WORD.findall(text.lower())
+
+
+class SkillAutomaton:
+    """
+    Aho-Corasick automaton over word sequences.
+
+    Phrases are tuples of skill_tokens(); the goto edges are keyed by whole
+    words, so matches always start and end on word boundaries and one pass
+    over a text's words finds every occurrence of every phrase, overlapping
+    ones included ("machine learning" and "learning").
+    """
+
+    def __init__(self, phrases):
+        # phrases: {tuple_of_words: skill_name}
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for words, skill in phrases.items():
+            state = 0
+            for word in words:
+                nxt = self._goto[state].get(word)
+                if nxt is None:
+                    nxt = self._goto[state][word] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            if skill not in self._out[state]:
+                self._out[state] += (skill,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(word, 0) if state else 0
+                self._out[nxt] += tuple(s for s in self._out[self._fail[nxt]] if s not in self._out[nxt])
+
+    def find(self, words):
+        """{skill: occurrences} for ``words`` (a list from skill_tokens)."""
+        goto, fail, out = self._goto, self._fail, self._out
+        hits = {}
+        state = 0
+        for word in words:
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for skill in out[state]:
+                hits[skill] = hits.get(skill, 0) + 1
+        return hits
+
+
+class CompiledSkills:
+    """One loaded version of the skill dictionary. Immutable once built."""
+
+    def __init__(self, entries, version):
+        self.version = version
+        self.weights = {}
+        phrases = {}
+        for entry in entries:
+            if isinstance(entry, str):
+                entry = {"name": entry}
+            name = entry["name"].strip().lower()
+            self.weights[name] = float(entry.get("weight", 1.0))
+            for phrase in [name] + list(entry.get("aliases", ())):
+                words = tuple(skill_tokens(phrase))
+                if words:
+                    phrases[words] = name
+        self.automaton = SkillAutomaton(phrases)
+
+    def __len__(self):
+        return len(self.weights)
+
+    def find(self, text):
+        return self.automaton.find(skill_tokens(text or ""))
+
+    def score(self, jd_skills, resume_skills):
+        """
+        Weighted share (0-100) of the JD's skills found in the resume, and
+        those matched skills, heaviest first.
+        """
+        total = sum(self.weights[s] for s in jd_skills)
+        matched = sorted((s for s in jd_skills if s in resume_skills), key=lambda s: (-self.weights[s], s))
+        if not total:
+            return 0.0, matched
+        return sum(self.weights[s] for s in matched) / total * 100, matched
+
+
+class SkillDictionary:
+    """
+    Skill phrases, aliases and weights from a JSON file::
+
+        {"skills": ["python", {"name": "machine learning", "aliases": ["ml"], "weight": 2}]}
+
+    compiled into a CompiledSkills. current() re-reads the file when it has
+    changed on disk (checked at most every ``check_interval`` seconds), so
+    edits apply without a restart. A file that fails to load keeps the last
+    good version in use.
+    """
+
+    def __init__(self, path, check_interval=2.0, logger=None):
+        self.path = path
+        self.check_interval = check_interval
+        self.logger = logger or logging.getLogger(__name__)
+        self._compiled = CompiledSkills([], 0)
+        self._file_key = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self):
+        """Load the file if it changed since the last load; returns the current version."""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                st = os.stat(self.path)
+                key = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                key = None
+            if key == self._file_key:
+                return self._compiled.version
+            # Remembered even if loading fails, so a bad file is reported once.
+            self._file_key = key
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f).get("skills", [])
+                self._compiled = CompiledSkills(entries, self._compiled.version + 1)
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                self.logger.warning("Skill dictionary %s not loaded: %s", self.path, e)
+            return self._compiled.version
+
+    def current(self):
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.reload()
+        return self._compiled
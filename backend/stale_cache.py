@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def _error_summary(e):
+    """
+    Exception type plus HTTP status or host, for status(). Never the message
+    or URL: provider URLs carry API keys in their query strings.
+    """
+    response = getattr(e, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is not None:
+        return f"{type(e).__name__}: HTTP {status}"
+    url = getattr(getattr(e, "request", None), "url", None)
+    host = urlsplit(url).hostname if isinstance(url, str) else None
+    return f"{type(e).__name__}: {host}" if host else type(e).__name__
+
+
+class StaleWhileRevalidate:
+    """
+    Cached result of one upstream fetch with stale-while-revalidate semantics.
+
+    - Fresh data (younger than ``ttl``) is returned as-is.
+    - Stale data is returned immediately while a single background refresh
+      runs on ``executor``; concurrent callers share that one fetch.
+    - With no data yet, callers wait for the in-flight fetch (up to
+      ``timeout``) and get ``default`` if it fails.
+    - A failed refresh keeps the last good snapshot and is retried after
+      ``retry_after`` seconds rather than on every request.
+    """
+
+    def __init__(self, name, fetch, ttl, executor, default=None, retry_after=30, timeout=None, logger=None):
+        self.name = name
+        self.fetch = fetch
+        self.ttl = ttl
+        self.executor = executor
+        self.default = default
+        self.retry_after = retry_after
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._data = None
+        self._fetched_at = 0.0
+        self._next_attempt_at = 0.0
+        self._future = None
+        self._last_error = None
+        self.version = 0
+        self.hits = self.stale_hits = self.misses = 0
+
+    def _refresh_locked(self):
+        # A refresh cancelled before it ran (e.g. by an executor shutdown)
+        # never clears _future itself.
+        if self._future is None or self._future.cancelled():
+            self._future = self.executor.submit(self._run)
+        return self._future
+
+    def refresh(self):
+        """Start a background refresh unless one is already running."""
+        with self._lock:
+            return self._refresh_locked()
+
+    def _run(self):
+        try:
+            data = self.fetch()
+        except Exception as e:
+            self.logger.warning("%s refresh failed: %s", self.name, e)
+            with self._lock:
+                self._last_error = _error_summary(e)
+                self._next_attempt_at = time.time() + self.retry_after
+                self._future = None
+            return
+        with self._lock:
+            self._future = None
+            self._data = data
+            self._fetched_at = time.time()
+            self._next_attempt_at = self._fetched_at + self.ttl
+            self._last_error = None
+            self.version += 1
+
+    def prefetch(self):
+        """Kick off a refresh if the snapshot is missing or stale, without waiting."""
+        with self._lock:
+            if time.time() >= self._next_attempt_at:
+                return self._refresh_locked()
+        return None
+
+    def _lookup(self):
+        future = self.prefetch()
+        with self._lock:
+            data, version = self._data, self.version
+            if data is None:
+                self.misses += 1
+            elif time.time() - self._fetched_at < self.ttl:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+        return future, data, version
+
+    def _current(self):
+        with self._lock:
+            return (self._data if self._data is not None else self.default), self.version
+
+    def get(self):
+        return self.get_versioned()[0]
+
+    def get_versioned(self):
+        """
+        (data, version) read together, so a key built from the version
+        always describes the data returned with it.
+        """
+        future, data, version = self._lookup()
+        if data is not None:
+            return data, version
+        if future is not None:
+            try:
+                future.result(timeout=self.timeout)
+            except Exception:
+                pass
+        return self._current()
+
+    async def aget(self):
+        return (await self.aget_versioned())[0]
+
+    async def aget_versioned(self):
+        """Like get_versioned(), but awaits a cold fetch without blocking the event loop."""
+        future, data, version = self._lookup()
+        if data is not None:
+            return data, version
+        if future is not None:
+            try:
+                # Shielded: a timeout cancels this wait, not the shared refresh
+                # (which may still be queued on the executor).
+                await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), self.timeout)
+            except Exception:
+                pass
+        return self._current()
+
+    def status(self):
+        with self._lock:
+            age = time.time() - self._fetched_at if self._data is not None else None
+            return {
+                "source": self.name,
+                "has_data": self._data is not None,
+                "age_seconds": round(age, 1) if age is not None else None,
+                "ttl": self.ttl,
+                "stale": age is None or age >= self.ttl,
+                "refreshing": self._future is not None,
+                "last_error": self._last_error,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,76 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark import StubUpstreams, _load_app  # noqa: E402
+from mock_postgrest import MockPostgrest  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def mock_postgrest():
+    mock = MockPostgrest().start()
+    yield mock
+    mock.stop()
+
+
+@pytest.fixture(scope="session")
+def upstreams():
+    stub = StubUpstreams(50)
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture(scope="session")
+def backend(tmp_path_factory, mock_postgrest, upstreams):
+    """The app module, configured against the local stand-ins (imported once per run)."""
+    return _load_app(str(tmp_path_factory.mktemp("app")), mock_postgrest.url, upstreams.url)
+
+
+@pytest.fixture(scope="session")
+def reference_ranking(backend):
+    """The original /shortlist ranking: every resume with text, scored by calculate_match_score."""
+    def rank(docs, jd, limit=None, offset=0, min_score=None):
+        scored = [(doc_id, backend.calculate_match_score(jd, text)) for doc_id, text in docs.items() if text]
+        if min_score is not None:
+            scored = [item for item in scored if item[1] >= min_score]
+        ranked = sorted(scored, key=lambda item: (-item[1], item[0]))
+        return ranked[offset:None if limit is None else offset + limit]
+    return rank
+
+
+# Few distinct words (in mixed case), so many resumes tie on score.
+_PARITY_WORDS = "python Python java sql SQL docker aws flask react go rust c++ ml nlp naïve".split()
+_PARITY_QUERIES = ["python sql docker", "Python JAVA go go", "kotlin", "aws ml nlp rust react flask naïve", "python"]
+
+
+@pytest.fixture(scope="session")
+def resume_corpus():
+    """make(seed, size=60) -> {doc_id: text}, plus one resume without text."""
+    def make(seed, size=60):
+        rng = random.Random(seed)
+        docs = {f"cv{i:03d}.pdf": " ".join(rng.choices(_PARITY_WORDS, k=rng.randint(1, 8))) for i in range(size)}
+        docs["empty.pdf"] = ""
+        return docs
+    return make
+
+
+@pytest.fixture(scope="session")
+def assert_ranking_parity(reference_ranking):
+    """
+    check(search, docs): ``search(jd, limit=None, offset=0, min_score=None)``
+    must rank ``docs`` exactly like reference_ranking, paged or not.
+    """
+    def check(search, docs):
+        for jd in _PARITY_QUERIES:
+            assert search(jd) == reference_ranking(docs, jd)
+            for limit, offset in ((1, 0), (5, 0), (5, 3), (7, 20), (10, 55), (0, 0), (3, 100)):
+                assert search(jd, limit=limit, offset=offset) == reference_ranking(docs, jd, limit, offset)
+            for min_score in (0, 1e-9, 33.3, 50, 100):
+                assert search(jd, min_score=min_score) == reference_ranking(docs, jd, min_score=min_score)
+                assert search(jd, limit=4, offset=2, min_score=min_score) == \
+                    reference_ranking(docs, jd, 4, 2, min_score)
+    return check
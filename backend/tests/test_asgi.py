@@ -0,0 +1,78 @@
+import jwt
+import pytest
+from starlette.testclient import TestClient
+
+
+@pytest.fixture(scope="module")
+def client(backend):
+    import asgi
+    with TestClient(asgi.app) as client:
+        yield client
+
+
+def test_register_login_and_me(client, mock_postgrest):
+    body = {"email": "Asgi@Example.com", "password": "correct horse", "firstName": "Asgi"}
+    r = client.post("/api/auth/register", json=body)
+    assert r.status_code == 201, r.text
+    assert mock_postgrest.select("users", [("email", "asgi@example.com")])
+
+    assert client.post("/api/auth/register", json=body).status_code == 409
+    assert client.post("/api/auth/login", json=dict(body, password="wrong password")).status_code == 401
+
+    r = client.post("/api/auth/login", json=body)
+    assert r.status_code == 200, r.text
+    token = r.json()["token"]
+    # Profile claims are only signed in with AUTH_TRUST_TOKEN_CLAIMS on.
+    assert "profile" not in jwt.decode(token, options={"verify_signature": False})
+
+    r = client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert r.status_code == 200, r.text
+    assert r.json()["user"]["email"] == "asgi@example.com"
+    assert client.get("/api/auth/me").status_code == 401
+
+
+def test_profile_claims_follow_the_trust_setting(backend, monkeypatch):
+    user = {"email": "claims@example.com", "first_name": "Claims", "mobile": "555"}
+    for trusted in (False, True):
+        monkeypatch.setattr(backend, "AUTH_TRUST_TOKEN_CLAIMS", trusted)
+        token = backend.create_access_token("u1", "jobseeker", user)
+        claims = jwt.decode(token, options={"verify_signature": False})
+        assert ("profile" in claims) is trusted
+
+
+def test_external_jobs_conditional_and_encoded(client):
+    r = client.get("/api/external-jobs", headers={"Accept-Encoding": "identity"})
+    assert r.status_code == 200
+    assert "Content-Encoding" not in r.headers
+    etag = r.headers["ETag"]
+    assert r.json()["remotive"]["jobs"]
+
+    r = client.get("/api/external-jobs", headers={"If-None-Match": etag, "Accept-Encoding": "identity"})
+    assert r.status_code == 304
+    # Substrings of the tag are not a match.
+    r = client.get("/api/external-jobs", headers={"If-None-Match": etag[:-3] + '"', "Accept-Encoding": "identity"})
+    assert r.status_code == 200
+
+    r = client.get("/api/external-jobs", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "Content-Encoding" not in r.headers
+    assert r.headers["ETag"] == etag
+
+    r = client.get("/api/external-jobs", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert r.headers["ETag"] != etag
+    assert r.json()["remotive"]["jobs"]
+
+
+def test_native_routes_are_counted_in_metrics(client, backend):
+    def count(route, status):
+        prefix = f'http_request_duration_seconds_count{{route="{route}",method="GET",status="{status}"}} '
+        for line in backend._metrics.render().splitlines():
+            if line.startswith(prefix):
+                return int(line[len(prefix):])
+        return 0
+
+    before = count("/api/external-jobs", 200), count("/api/auth/me", 401)
+    client.get("/api/external-jobs", headers={"Accept-Encoding": "identity"})
+    client.get("/api/auth/me")
+    assert (count("/api/external-jobs", 200), count("/api/auth/me", 401)) == (before[0] + 1, before[1] + 1)
+    assert 'route="/api/auth/me"' in client.get("/metrics").text
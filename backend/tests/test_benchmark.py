@@ -0,0 +1,28 @@
+from benchmark import compare, machine_speed
+
+
+def _run(reference_ms, **p50s):
+    results = [{"name": "reference", "size": None, "ops": 35, "p50_ms": reference_ms}]
+    results += [{"name": name, "size": 100, "ops": 50, "p50_ms": ms} for name, ms in p50s.items()]
+    return {"results": results}
+
+
+def test_slower_machine_scales_the_baseline():
+    baseline = _run(5.0, fast=0.3, scoring=10.0)
+    # Everything, the reference included, took twice as long: not a regression.
+    current = _run(10.0, fast=0.6, scoring=20.0)["results"]
+    speed = machine_speed(current, baseline)
+    assert speed == 2.0
+    assert compare(current, baseline, 0.5, 1.0, speed) == []
+    assert [r["name"] for r in compare(current, baseline, 0.5, 1.0)] == ["scoring"]
+
+
+def test_real_slowdowns_are_still_flagged():
+    baseline = _run(5.0, fast=0.3, scoring=10.0)
+    current = _run(4.0, fast=0.9, scoring=16.0)["results"]
+    # A faster reference doesn't tighten the gate.
+    assert machine_speed(current, baseline) == 1.0
+    regressions = compare(current, baseline, 0.5, 1.0, machine_speed(current, baseline))
+    # fast tripled but by less than min_delta_ms; scoring is 60% slower.
+    assert [(r["name"], r["change"]) for r in regressions] == [("scoring", 0.6)]
+    assert machine_speed(current, {"results": []}) == 1.0
@@ -0,0 +1,50 @@
+import gzip
+
+from compressed_response import MIN_COMPRESS_SIZE, EncodedSnapshot, negotiate
+
+LARGE = EncodedSnapshot({"items": ["x" * 64] * (MIN_COMPRESS_SIZE // 32)})
+SMALL = EncodedSnapshot({"items": []})
+
+
+def test_plain_response_carries_quoted_etag():
+    status, body, headers = negotiate(SMALL)
+    assert status == 200
+    assert body == SMALL.body
+    assert headers["ETag"] == f'"{SMALL.etag}"'
+    assert headers["Vary"] == "Accept-Encoding"
+    assert "Content-Encoding" not in headers
+
+
+def test_small_bodies_are_not_compressed():
+    _, body, headers = negotiate(SMALL, accept_encoding="gzip")
+    assert body == SMALL.body
+    assert "Content-Encoding" not in headers
+
+
+def test_gzip_variant_has_its_own_etag():
+    _, body, headers = negotiate(LARGE, accept_encoding="gzip, deflate")
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["ETag"] == f'"{LARGE.etag}-gzip"'
+    assert gzip.decompress(body) == LARGE.body
+
+
+def test_zero_quality_encoding_is_not_accepted():
+    _, body, headers = negotiate(LARGE, accept_encoding="gzip;q=0, identity")
+    assert body == LARGE.body
+    assert "Content-Encoding" not in headers
+
+
+def test_if_none_match_matches_whole_tags_only():
+    # A tag that merely contains the current one is a different tag.
+    status, _, _ = negotiate(SMALL, if_none_match=f'"{SMALL.etag}0"')
+    assert status == 200
+    status, body, headers = negotiate(SMALL, if_none_match=f'"other", W/"{SMALL.etag}"')
+    assert (status, body) == (304, None)
+    assert headers["ETag"] == f'"{SMALL.etag}"'
+
+
+def test_if_none_match_star_and_encoding_specific_tags():
+    assert negotiate(LARGE, if_none_match="*")[0] == 304
+    # The identity tag does not validate a cached gzip body, and vice versa.
+    assert negotiate(LARGE, if_none_match=f'"{LARGE.etag}"', accept_encoding="gzip")[0] == 200
+    assert negotiate(LARGE, if_none_match=f'"{LARGE.etag}-gzip"', accept_encoding="gzip")[0] == 304
@@ -0,0 +1,109 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from benchmark import StubUpstreams
+from http_client import CircuitBreaker, CircuitOpen, UpstreamClient
+from stale_cache import StaleWhileRevalidate
+
+
+@pytest.fixture
+def stub():
+    # Each test gets its own stub, so queued failures never leak into the app's.
+    stub = StubUpstreams(5)
+    yield stub
+    stub.stop()
+
+
+def test_retries_5xx_until_success(stub):
+    client = UpstreamClient(retries=2, backoff=0)
+    stub.fail(503, times=2)
+    response = client.get("remotive", f"{stub.url}/remotive")
+    assert response.status_code == 200
+    assert len(response.json()["jobs"]) == 5
+    assert stub.requests == 3
+    stats = client.stats()["remotive"]
+    assert (stats["requests"], stats["errors"], stats["retries"]) == (3, 2, 2)
+    assert stats["circuit"] == "closed"
+
+
+def test_gives_up_after_the_retry_budget(stub):
+    client = UpstreamClient(retries=1, backoff=0)
+    stub.fail(502, times=5)
+    with pytest.raises(requests.HTTPError):
+        client.get("remotive", f"{stub.url}/remotive")
+    assert stub.requests == 2
+
+
+def test_client_errors_are_not_retried(stub):
+    client = UpstreamClient(retries=3, backoff=0)
+    with pytest.raises(requests.HTTPError):
+        client.get("remotive", f"{stub.url}/missing")
+    assert stub.requests == 1
+
+
+def test_circuit_opens_and_recovers_through_half_open(stub):
+    client = UpstreamClient(retries=0, backoff=0, failure_threshold=2, reset_timeout=0.2)
+    url = f"{stub.url}/remotive"
+    stub.fail(500, times=100)
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            client.get("remotive", url)
+
+    # Open: calls are rejected without reaching the provider.
+    with pytest.raises(CircuitOpen):
+        client.get("remotive", url)
+    assert stub.requests == 2
+    assert client.stats()["remotive"]["short_circuited"] == 1
+
+    # Half-open: one trial call goes through; failing it reopens the circuit.
+    time.sleep(0.25)
+    assert client.stats()["remotive"]["circuit"] == "half-open"
+    with pytest.raises(requests.HTTPError):
+        client.get("remotive", url)
+    assert client.stats()["remotive"]["circuit"] == "open"
+
+    # A successful trial closes it again.
+    stub.recover()
+    time.sleep(0.25)
+    assert client.get("remotive", url).status_code == 200
+    assert client.stats()["remotive"]["circuit"] == "closed"
+
+
+def test_half_open_allows_a_single_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.state == "closed"
+
+
+def test_stale_data_is_served_while_refresh_fails(stub):
+    client = UpstreamClient(retries=0, backoff=0)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        cache = StaleWhileRevalidate(
+            "remotive", lambda: client.get("remotive", f"{stub.url}/remotive").json()["jobs"],
+            ttl=0.05, executor=executor, retry_after=60, timeout=5,
+        )
+        jobs = cache.get()
+        assert len(jobs) == 5
+
+        stub.fail(503, times=100)
+        time.sleep(0.1)
+        # Stale: answered at once from the last snapshot while the refresh runs.
+        assert cache.get() == jobs
+        cache.refresh().result(timeout=5)
+        status = cache.status()
+        assert status["last_error"] == "HTTPError: HTTP 503"
+        assert status["stale"] and status["has_data"]
+        assert cache.get() == jobs
+        assert cache.status()["stale_hits"] == 2
+
+        stub.recover()
+        version = cache.version
+        cache.refresh().result(timeout=5)
+        assert cache.version == version + 1
+        assert cache.status()["last_error"] is None
@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+import zipfile
+
+import pytest
+
+import ingest
+from ingest import IngestionPipeline
+from pdf_text import ExtractionError
+
+_DOCUMENT = (
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    '<w:body><w:p><w:r><w:t>{}</w:t></w:r></w:p></w:body></w:document>'
+)
+
+
+def _docx(path, text):
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", _DOCUMENT.format(text))
+    return str(path)
+
+
+# Stand-ins for ingest._extract_worker, run in fork-started workers.
+def _crashing_worker(filepath, options):
+    os._exit(1)
+
+
+def _slow_worker(filepath, options):
+    time.sleep(float(options["delay"]))
+    return "python", None, None, 0.0
+
+
+class _Parsed:
+    def __init__(self):
+        self.files = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, filename, filepath, text):
+        with self.lock:
+            self.files[filename] = text
+
+
+def _run(pipeline, files, timeout=30):
+    job_id = pipeline.submit(files)
+    for _, filepath, _ in files:
+        assert pipeline.wait(filepath, timeout)
+    return {f["file"]: f for f in pipeline.status(job_id)["files"]}
+
+
+def test_documents_are_parsed_in_a_bounded_pool(tmp_path):
+    parsed = _Parsed()
+    pipeline = IngestionPipeline(parsed, max_workers=2)
+    files = [(f"cv{i}.docx", _docx(tmp_path / f"cv{i}.docx", f"python {i}"), None) for i in range(5)]
+    broken = tmp_path / "broken.docx"
+    broken.write_bytes(b"not a zip")
+    files.append(("broken.docx", str(broken), None))
+
+    status = _run(pipeline, files)
+    assert pipeline._executor._max_workers == 2
+    assert {name: f["status"] for name, f in status.items()} == {
+        **{f"cv{i}.docx": "parsed" for i in range(5)}, "broken.docx": "failed"}
+    assert "Unreadable DOCX" in status["broken.docx"]["reason"]
+    # Failed extractions never reach on_parsed, so no empty text is cached.
+    assert parsed.files == {f"cv{i}.docx": f"python {i}" for i in range(5)}
+    pipeline._executor.shutdown()
+
+
+@pytest.mark.skipif("fork" not in ingest.multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_crashed_worker_fails_the_file_and_the_pool_is_replaced(tmp_path, monkeypatch):
+    parsed = _Parsed()
+    pipeline = IngestionPipeline(parsed, max_workers=1, start_method="fork")
+    monkeypatch.setattr(ingest, "_extract_worker", _crashing_worker)
+    status = _run(pipeline, [("a.docx", _docx(tmp_path / "a.docx", "python"), None)])
+    assert status["a.docx"]["status"] == "failed"
+    assert "BrokenProcessPool" in status["a.docx"]["reason"]
+    assert parsed.files == {}
+
+    monkeypatch.undo()
+    status = _run(pipeline, [("b.docx", _docx(tmp_path / "b.docx", "java"), None)])
+    assert status["b.docx"]["status"] == "parsed"
+    assert parsed.files == {"b.docx": "java"}
+    pipeline._executor.shutdown()
+
+
+@pytest.mark.skipif("fork" not in ingest.multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_wait_gives_up_after_the_timeout(tmp_path, monkeypatch):
+    pipeline = IngestionPipeline(_Parsed(), max_workers=1, start_method="fork", extract_options={"delay": 1.0})
+    monkeypatch.setattr(ingest, "_extract_worker", _slow_worker)
+    filepath = _docx(tmp_path / "slow.docx", "python")
+    job_id = pipeline.submit([("slow.docx", filepath, None)])
+
+    started = time.monotonic()
+    assert pipeline.wait(filepath, timeout=0.05) is False
+    assert time.monotonic() - started < 0.5
+    assert pipeline.status(job_id)["status"] == "running"
+    assert pipeline.wait(filepath, timeout=30)
+    assert pipeline.status(job_id)["status"] == "done"
+    pipeline._executor.shutdown()
+
+
+@pytest.mark.parametrize("data, text", [
+    ("\ufeffnaïve python\n".encode("utf-8"), "naïve python\n"),
+    ("naïve python".encode("utf-8"), "naïve python"),
+    # Not UTF-8: read as Windows-1252, as exported by older Word versions.
+    (b"caf\xe9 r\xe9sum\xe9 \x93python\x94", "café résumé “python”"),
+    # Bytes cp1252 leaves undefined are replaced rather than failing the file.
+    (b"python \x81 \xe9", "python \ufffd é"),
+    (b"", ""),
+])
+def test_txt_reader_decodes_utf8_with_a_cp1252_fallback(tmp_path, data, text):
+    path = tmp_path / "cv.txt"
+    path.write_bytes(data)
+    assert ingest.extract_resume_text(str(path)) == (text, None)
+
+
+def test_docx_reader_joins_runs_and_keeps_paragraphs(tmp_path):
+    body = (
+        '<w:p><w:r><w:t>Jane</w:t></w:r><w:r><w:t xml:space="preserve"> Doe</w:t></w:r></w:p>'
+        '<w:p><w:r><w:t>python</w:t><w:tab/><w:t>sql</w:t><w:br/><w:t>docker</w:t></w:r></w:p>'
+        '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>aws</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+        '<w:p/>'
+    )
+    path = tmp_path / "cv.docx"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", _DOCUMENT.replace(
+            "<w:p><w:r><w:t>{}</w:t></w:r></w:p>", body))
+    assert ingest.extract_resume_text(str(path)) == ("Jane Doe\npython sql docker\naws", None)
+
+
+@pytest.mark.parametrize("contents", [
+    b"not a zip",
+    {"word/styles.xml": "<styles/>"},
+    {"word/document.xml": "<w:document><w:body>"},
+])
+def test_unreadable_docx_raises(tmp_path, contents):
+    path = tmp_path / "cv.docx"
+    if isinstance(contents, bytes):
+        path.write_bytes(contents)
+    else:
+        with zipfile.ZipFile(path, "w") as archive:
+            for name, data in contents.items():
+                archive.writestr(name, data)
+    with pytest.raises(ExtractionError, match="Unreadable DOCX"):
+        ingest.extract_resume_text(str(path))
@@ -0,0 +1,44 @@
+from job_search import JobSearchIndex, normalize_jobs
+
+
+def _payload(*remotive):
+    return {"remotive": {"jobs": list(remotive)}}
+
+
+def test_listings_without_an_id_get_distinct_stable_ids():
+    jobs = normalize_jobs(_payload(
+        {"title": "Backend Engineer", "company_name": "Acme", "url": "https://acme.example/1"},
+        {"title": "Data Engineer", "company_name": "Acme", "url": "https://acme.example/2"},
+        {"title": "Designer", "company_name": "Globex"},
+    ))
+    ids = [job["id"] for job in jobs]
+    assert len(set(ids)) == 3
+    assert not any(i.endswith(":None") for i in ids)
+    assert ids == [job["id"] for job in normalize_jobs(_payload(
+        {"title": "Backend Engineer", "company_name": "Acme", "url": "https://acme.example/1"},
+        {"title": "Data Engineer", "company_name": "Acme", "url": "https://acme.example/2"},
+        {"title": "Designer", "company_name": "Globex"},
+    ))]
+    index = JobSearchIndex(jobs)
+    assert [index.jobs[index.by_id[i]]["id"] for i in ids] == ids
+
+
+def test_placeholder_title_or_company_is_not_a_duplicate_key():
+    jobs = normalize_jobs(_payload(
+        {"id": 1, "title": "Engineer", "url": "https://a.example/1"},
+        {"id": 2, "title": "Engineer", "url": "https://b.example/2"},
+        {"id": 3, "company_name": "Acme", "url": "https://a.example/3"},
+        {"id": 4, "company_name": "Acme", "url": "https://b.example/4"},
+    ))
+    assert len(jobs) == 4
+
+
+def test_cross_posted_listings_are_dropped():
+    jobs = normalize_jobs({
+        "remotive": {"jobs": [{"id": 1, "title": "Engineer", "company_name": "Acme", "url": "https://a.example/1"}]},
+        "arbeitnow": {"data": [
+            {"slug": "x", "title": "engineer", "company_name": "ACME", "url": "https://b.example/x"},
+            {"slug": "y", "title": "Other", "company_name": "Globex", "url": "https://a.example/1"},
+        ]},
+    })
+    assert [job["id"] for job in jobs] == ["remotive:1"]
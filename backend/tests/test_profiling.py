@@ -0,0 +1,25 @@
+import os
+
+from profiling import SamplingProfiler
+
+
+def test_profiler_samples_the_target_thread(tmp_path):
+    profiler = SamplingProfiler(interval=0.001).start()
+    while sum(profiler.samples.values()) < 5:
+        sum(range(1000))
+    profiler.stop().save(str(tmp_path), "busy.folded")
+    assert "test_profiling.py:test_profiler_samples_the_target_thread" in (tmp_path / "busy.folded").read_text()
+
+
+def test_streamed_response_is_profiled_until_sent(backend, tmp_path, monkeypatch):
+    monkeypatch.setattr(backend, "PROFILE_REQUESTS", True)
+    monkeypatch.setattr(backend, "PROFILE_DIR", str(tmp_path))
+    client = backend.app.test_client()
+    response = client.post("/shortlist", json={"jd": "python developer", "stream": True},
+                           headers={"X-Profile": "1"}, buffered=False)
+    name = response.headers["X-Profile-File"]
+    # Written once the body has been sent, not when the view returns.
+    assert not os.path.exists(tmp_path / name)
+    response.get_data()
+    response.close()
+    assert os.path.exists(tmp_path / name)
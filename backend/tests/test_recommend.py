@@ -0,0 +1,42 @@
+import io
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def client(backend):
+    return backend.app.test_client()
+
+
+def test_fields_as_list_or_string(client):
+    for fields in (["id", "title"], "id, title"):
+        r = client.post("/api/external-jobs/recommend", json={"text": "python flask sql", "fields": fields})
+        assert r.status_code == 200, r.get_data(as_text=True)
+        assert all(set(job) == {"id", "title", "score"} for job in r.get_json()["jobs"])
+
+
+def test_malformed_fields_are_rejected(client):
+    for fields in ({"id": 1}, ["id", 3]):
+        r = client.post("/api/external-jobs/recommend", json={"text": "python", "fields": fields})
+        assert r.status_code == 400
+    r = client.post("/api/external-jobs/recommend", json={"text": "python", "fields": ["salary_of_ceo"]})
+    assert r.status_code == 400
+
+
+def test_uploaded_resume_is_read_from_the_spool(client, backend, monkeypatch):
+    def copied(*args, **kwargs):
+        raise AssertionError("upload copied to a second temp file")
+
+    # read_resume_text is only used on the temp-copy fallback.
+    monkeypatch.setattr(backend, "read_resume_text", copied)
+    incoming = backend._uploads.incoming
+    r = client.post(
+        "/api/external-jobs/recommend",
+        data={"resume": (io.BytesIO(b"python flask sql docker"), "cv.txt"), "limit": "3"},
+        content_type="multipart/form-data",
+    )
+    assert r.status_code == 200, r.get_data(as_text=True)
+    assert len(r.get_json()["jobs"]) == 3
+    # The spooled part is the only copy and is gone once the request closes.
+    assert os.listdir(incoming) == []
@@ -0,0 +1,38 @@
+import itertools
+
+import pytest
+
+from resume_index import ResumeIndex
+
+
+def _index(docs):
+    index = ResumeIndex()
+    for doc_id, text in docs.items():
+        index.add(doc_id, text)
+    return index
+
+
+def _iter_search(index):
+    # iter_ranked with search()'s paging, to hold it to the same ranking.
+    def search(jd, limit=None, offset=0, min_score=None):
+        ranked = index.iter_ranked(jd, min_score=min_score)
+        return list(itertools.islice(ranked, offset, None if limit is None else offset + limit))
+    return search
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_rankings_match_calculate_match_score(resume_corpus, assert_ranking_parity, seed):
+    docs = resume_corpus(seed)
+    index = _index(docs)
+    assert_ranking_parity(index.search, docs)
+    assert_ranking_parity(_iter_search(index), docs)
+
+
+def test_rankings_follow_updates_and_removals(resume_corpus, assert_ranking_parity):
+    docs = resume_corpus(7)
+    index = _index(docs)
+    docs["cv001.pdf"] = "python sql docker"
+    index.add("cv001.pdf", docs["cv001.pdf"])
+    del docs["cv002.pdf"]
+    index.remove("cv002.pdf")
+    assert_ranking_parity(index.search, docs)
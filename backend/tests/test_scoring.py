@@ -0,0 +1,41 @@
+import pytest
+
+from resume_index import ResumeIndex
+from scoring import VectorScorer
+
+
+def _scorer(docs):
+    index = ResumeIndex()
+    for doc_id, text in docs.items():
+        index.add(doc_id, text)
+    return VectorScorer(index)
+
+
+@pytest.mark.parametrize("seed", range(2))
+def test_overlap_matches_calculate_match_score(resume_corpus, assert_ranking_parity, seed):
+    docs = resume_corpus(seed)
+    scorer = _scorer(docs)
+    assert_ranking_parity(lambda jd, **kwargs: scorer.rank(jd, 'overlap', **kwargs), docs)
+
+
+@pytest.mark.parametrize("name", ["tfidf", "bm25"])
+def test_vector_scorers_rank_relevant_resumes_first(name):
+    docs = {
+        "exact.txt": "python django postgres",
+        "partial.txt": "python java spring spring",
+        "padded.txt": "python django postgres " + " ".join(f"filler{i}" for i in range(60)),
+        "unrelated.txt": "photoshop illustrator figma",
+        "common.txt": "team player team player communication",
+    }
+    scorer = _scorer(docs)
+    ranked = scorer.rank("python django postgres", name)
+    scores = dict(ranked)
+
+    assert [doc_id for doc_id, _ in ranked[:3]] == ["exact.txt", "padded.txt", "partial.txt"]
+    assert all(0.0 <= score <= 100.0 for score in scores.values())
+    assert scores["exact.txt"] > scores["padded.txt"] > scores["partial.txt"] > 0
+    assert scores["unrelated.txt"] == scores["common.txt"] == 0.0
+    # Paging and thresholds follow the same ranking.
+    assert scorer.rank("python django postgres", name, limit=2, offset=1) == ranked[1:3]
+    assert scorer.rank("python django postgres", name, min_score=scores["padded.txt"]) == ranked[:2]
+    assert scorer.rank("kotlin", name) == [(doc_id, 0.0) for doc_id, _ in sorted(ranked)]
@@ -0,0 +1,50 @@
+import io
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def client(backend):
+    return backend.app.test_client()
+
+
+def test_non_string_jd_is_rejected(client):
+    for path in ("/shortlist", "/shortlist/jobs"):
+        for jd in (["python"], {"text": "python"}, 42):
+            r = client.post(path, json={"jd": jd})
+            assert r.status_code == 400, (path, jd, r.get_data(as_text=True))
+
+
+def test_non_finite_min_score_is_rejected(client):
+    for value in ("nan", "inf", "-inf", "NaN"):
+        r = client.post("/shortlist", json={"jd": "python", "min_score": value})
+        assert r.status_code == 400, value
+        r = client.post(f"/shortlist?min_score={value}", json={"jd": "python"})
+        assert r.status_code == 400, value
+
+
+def test_non_string_scorer_is_rejected(client):
+    for path, body in (("/shortlist", {"jd": "python"}), ("/shortlist/jobs", {"jd": "python"}),
+                       ("/shortlist/batch", {"jds": ["python"]})):
+        for scorer in (5, ["x"], {"name": "bm25"}, "cosine"):
+            r = client.post(path, json=dict(body, scorer=scorer))
+            assert r.status_code == 400, (path, scorer, r.get_data(as_text=True))
+    assert client.post("/shortlist", json={"jd": "python", "scorer": "BM25"}).status_code == 200
+
+
+def test_upload_invalidates_cached_shortlist(client, backend):
+    def shortlist():
+        r = client.post("/shortlist", json={"jd": "quokka wrangler"})
+        assert r.status_code == 200, r.get_data(as_text=True)
+        return [entry["file"] for entry in r.get_json()]
+
+    before = shortlist()
+    assert shortlist() == before
+    mtime = os.stat(backend.UPLOAD_FOLDER).st_mtime_ns
+    r = client.post("/upload", data={"files": (io.BytesIO(b"quokka wrangler"), "quokka.txt")},
+                    content_type="multipart/form-data")
+    assert r.status_code == 200, r.get_data(as_text=True)
+    # As if the upload landed within the filesystem's timestamp granularity.
+    os.utime(backend.UPLOAD_FOLDER, ns=(mtime, mtime))
+    assert shortlist() == ["quokka.txt"] + before
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from job_store import JobStore
+from resume_index import ResumeIndex
+from scoring import VectorScorer
+from shortlist_jobs import ShortlistJobQueue
+
+
+def _scorer(docs):
+    index = ResumeIndex()
+    for doc_id, text in docs.items():
+        index.add(doc_id, text)
+    return VectorScorer(index)
+
+
+def _wait(queue, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while True:
+        status = queue.status(job_id)
+        if status["status"] in ("done", "failed") or time.monotonic() > deadline:
+            return status
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize("name", ["overlap", "tfidf", "bm25"])
+def test_chunked_ranking_matches_single_pass(resume_corpus, name):
+    docs = resume_corpus(0)
+    scorer = _scorer(docs)
+    total = sum(1 for text in docs.values() if text)
+    # Chunks that don't divide the corpus, so the last one is short.
+    queue = ShortlistJobQueue(scorer, chunk_size=7)
+    for jd in ("python sql docker", "Python JAVA go go", "kotlin"):
+        for limit, min_score in ((None, None), (5, None), (None, 30.0), (1, 10.0)):
+            status = _wait(queue, queue.submit(jd, name, limit=limit, min_score=min_score))
+            assert status["status"] == "done", status
+            assert status["progress"]["scored"] == status["progress"]["total"] == total
+            assert status["results"] == scorer.rank(jd, name, limit=limit, min_score=min_score), (jd, limit, min_score)
+
+
+def test_identical_submissions_share_one_job_and_cache_it(resume_corpus):
+    scorer = _scorer(resume_corpus(1))
+    release = threading.Event()
+    prepared = []
+
+    def prepare():
+        prepared.append(True)
+        release.wait(10)
+
+    queue = ShortlistJobQueue(scorer, prepare=prepare, chunk_size=10)
+    first = queue.submit("python sql", "bm25", limit=5)
+    # Same JD up to word order and case: the running job is reused.
+    assert queue.submit("SQL python", "bm25", limit=5) == first
+    assert queue.submit("python sql", "bm25", limit=6) != first
+    release.set()
+    done = _wait(queue, first)
+    assert done["status"] == "done" and not done["cached"]
+
+    again = queue.submit("python sql", "bm25", limit=5)
+    assert again != first
+    cached = queue.status(again)
+    assert cached["status"] == "done" and cached["cached"]
+    assert cached["results"] == done["results"]
+    assert len(prepared) == 2
+
+    # A new resume changes the index version, so the ranking is computed again.
+    scorer.index.add("new.txt", "python sql python sql")
+    fresh = _wait(queue, queue.submit("python sql", "bm25", limit=5))
+    assert not fresh["cached"] and fresh["results"][0][0] == "new.txt"
+
+
+def test_incomplete_corpus_is_not_cached(resume_corpus):
+    queue = ShortlistJobQueue(_scorer(resume_corpus(2)), prepare=lambda: False)
+    first = _wait(queue, queue.submit("python", "overlap"))
+    second = _wait(queue, queue.submit("python", "overlap"))
+    assert first["status"] == second["status"] == "done"
+    assert not second["cached"] and second["results"] == first["results"]
+
+
+def test_status_falls_back_to_the_job_store(tmp_path, resume_corpus):
+    scorer = _scorer(resume_corpus(3))
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    # Two workers sharing one job store; only the first runs the job.
+    owner = ShortlistJobQueue(scorer, job_store=store, chunk_size=8)
+    other = ShortlistJobQueue(scorer, job_store=JobStore(store.path))
+    job_id = owner.submit("python docker aws", "tfidf", limit=4)
+    local = _wait(owner, job_id)
+
+    remote = other.status(job_id)
+    assert remote["status"] == "done"
+    assert remote["progress"] == local["progress"]
+    # Snapshots go through JSON, so ranked pairs come back as lists.
+    assert [tuple(item) for item in remote["results"]] == local["results"]
+    assert other.status("no-such-job") is None
+    assert ShortlistJobQueue(scorer).status(job_id) is None
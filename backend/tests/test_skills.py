@@ -0,0 +1,69 @@
+import json
+
+from skills import CompiledSkills, SkillAutomaton, SkillDictionary, skill_tokens
+
+_ENTRIES = [
+    "python",
+    {"name": "machine learning", "aliases": ["ml"], "weight": 2},
+    "learning",
+    {"name": "c++", "aliases": ["cpp"]},
+    {"name": "nodejs", "aliases": ["node.js", "node js"]},
+    {"name": "html", "weight": 0.5},
+    {"name": "deep learning models"},
+]
+
+
+def test_tokens_split_on_punctuation_but_keep_inner_symbols():
+    assert skill_tokens("Python, C++ and Node.js (C#); SQL.") == ["python", "c++", "and", "node.js", "c#", "sql"]
+
+
+def test_automaton_finds_overlapping_phrases_on_word_boundaries():
+    automaton = SkillAutomaton({("machine", "learning"): "ml", ("learning",): "learning", ("a", "b", "c"): "abc",
+                                ("b",): "b"})
+    assert automaton.find("machine learning and learning".split()) == {"ml": 1, "learning": 2}
+    assert automaton.find("a b c".split()) == {"abc": 1, "b": 1}
+    # A failed partial match still finds what follows it.
+    assert automaton.find("a b a b c".split()) == {"b": 2, "abc": 1}
+    assert automaton.find(["machinelearning", "learnings"]) == {}
+
+
+def test_phrases_and_aliases_map_to_their_skill():
+    skills = CompiledSkills(_ENTRIES, 1)
+    text = "Built ML pipelines in Python and CPP; node js, Node.js services. Machine-learning at scale."
+    assert skills.find(text) == {"machine learning": 2, "python": 1, "c++": 1, "nodejs": 2, "learning": 1}
+    # Every word of a multi-word phrase has to be there, in order.
+    assert "deep learning models" not in skills.find("deep learning for models")
+    assert skills.find("deep learning models")["deep learning models"] == 1
+    assert skills.find("") == {} and skills.find(None) == {}
+
+
+def test_score_is_the_weighted_share_of_jd_skills():
+    skills = CompiledSkills(_ENTRIES, 1)
+    jd = skills.find("python, machine learning and html")
+    score, matched = skills.score(jd, skills.find("python and ml"))
+    # The JD also has learning (1) and html (0.5); "ml" is only machine learning.
+    assert matched == ["machine learning", "python"]
+    assert score == 3 / 4.5 * 100
+    assert skills.score(jd, {}) == (0.0, [])
+    assert skills.score({}, skills.find("python")) == (0.0, [])
+
+
+def test_dictionary_reloads_edits_and_keeps_the_last_good_version(tmp_path):
+    path = tmp_path / "skills.json"
+    path.write_text(json.dumps({"skills": ["python"]}))
+    dictionary = SkillDictionary(str(path), check_interval=0)
+    first = dictionary.current()
+    assert first.version == 1 and first.find("python golang") == {"python": 1}
+
+    path.write_text(json.dumps({"skills": ["python", {"name": "golang", "aliases": ["go lang"]}]}))
+    second = dictionary.current()
+    assert second.version == 2 and second.find("python go lang") == {"python": 1, "golang": 1}
+    # Built once per version: unchanged file, same object.
+    assert dictionary.current() is second
+
+    for broken in ('{"skills": [', '{"skills": [{"aliases": ["x"]}]}', '[1, 2]'):
+        path.write_text(broken)
+        assert dictionary.current() is second
+
+    path.unlink()
+    assert dictionary.current() is second
@@ -0,0 +1,39 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from stale_cache import StaleWhileRevalidate
+
+
+def test_cold_async_read_timing_out_keeps_the_refresh():
+    executor = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    # Occupy the only worker, so the refresh is still queued when the read times out.
+    executor.submit(release.wait)
+    cache = StaleWhileRevalidate("jobs", lambda: {"jobs": [1]}, ttl=60, executor=executor, default={}, timeout=0.05)
+    try:
+        assert asyncio.run(cache.aget_versioned()) == ({}, 0)
+        assert cache.status()["refreshing"]
+
+        release.set()
+        cache._future.result(timeout=5)
+        assert asyncio.run(cache.aget_versioned()) == ({"jobs": [1]}, 1)
+        assert not cache.status()["refreshing"]
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_cancelled_refresh_is_resubmitted():
+    executor = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    executor.submit(release.wait)
+    cache = StaleWhileRevalidate("jobs", lambda: {"jobs": [1]}, ttl=60, executor=executor, default={})
+    try:
+        assert cache.refresh().cancel()
+        release.set()
+        cache.refresh().result(timeout=5)
+        assert cache.get_versioned() == ({"jobs": [1]}, 1)
+    finally:
+        release.set()
+        executor.shutdown()
@@ -0,0 +1,92 @@
+import json
+import os
+
+import pytest
+
+from pdf_text import ExtractionError
+import text_cache
+from text_cache import ResumeTextCache
+
+
+def test_failed_extraction_is_not_cached(tmp_path):
+    calls = []
+
+    def extractor(filepath):
+        calls.append(filepath)
+        if len(calls) == 1:
+            raise ExtractionError("temporarily unreadable")
+        return "python flask"
+
+    resume = tmp_path / "cv.txt"
+    resume.write_text("python flask")
+    cache = ResumeTextCache(str(tmp_path / "cache"), extractor)
+    with pytest.raises(ExtractionError):
+        cache.put(str(resume))
+    assert cache.lookup(str(resume))[1] is None
+    assert cache.get(str(resume)) == "python flask"
+    assert len(calls) == 2
+
+
+def test_failed_in_process_extraction_is_retried(backend, monkeypatch):
+    filepath = os.path.join(backend.UPLOAD_FOLDER, "flaky.txt")
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write("python flaky kubernetes")
+    real = backend.read_resume_text
+
+    def failing(path, **options):
+        if os.path.basename(path) == "flaky.txt":
+            raise ExtractionError("worker crashed")
+        return real(path, **options)
+
+    try:
+        monkeypatch.setattr(backend, "read_resume_text", failing)
+        assert backend._sync_resume_index() is False
+        assert backend._text_cache.lookup(filepath)[1] is None
+        assert "flaky.txt" not in backend._resume_index
+
+        monkeypatch.setattr(backend, "read_resume_text", real)
+        assert backend._sync_resume_index() is True
+        assert backend._text_cache.lookup(filepath)[1] == "python flaky kubernetes"
+        assert "flaky.txt" in backend._resume_index
+    finally:
+        os.unlink(filepath)
+        backend._sync_resume_index()
+
+
+def test_flushes_from_two_instances_are_merged(tmp_path, monkeypatch):
+    def extractor(filepath):
+        with open(filepath, encoding="utf-8") as f:
+            return f.read()
+
+    paths = []
+    for name in ("a.txt", "b.txt", "c.txt"):
+        path = tmp_path / name
+        path.write_text(f"python {name}")
+        paths.append(str(path))
+    cache_dir = str(tmp_path / "cache")
+    # Two workers that loaded the (empty) manifest before either flushed.
+    first = ResumeTextCache(cache_dir, extractor)
+    second = ResumeTextCache(cache_dir, extractor)
+    first.put(paths[0])
+    second.put(paths[1])
+    first.flush()
+    second.flush()
+    # A later flush from the first worker must not drop what the second wrote.
+    first.put(paths[2])
+    first.flush()
+
+    with open(os.path.join(cache_dir, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert sorted(manifest) == sorted(os.path.abspath(path) for path in paths)
+    # Each worker also picked up the other's digests when it flushed.
+    def rehashed(filepath, chunk_size=None):
+        raise AssertionError(f"{filepath} hashed again")
+
+    monkeypatch.setattr(text_cache, "file_digest", rehashed)
+    assert second.lookup(paths[0])[1] == "python a.txt"
+    assert first.lookup(paths[1])[1] == "python b.txt"
+
+    second.forget(paths[0])
+    second.flush()
+    with open(os.path.join(cache_dir, "manifest.json"), encoding="utf-8") as f:
+        assert sorted(json.load(f)) == sorted(os.path.abspath(path) for path in paths[1:])
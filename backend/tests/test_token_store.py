@@ -0,0 +1,25 @@
+import pytest
+
+from token_store import TokenStore
+
+
+def _build(path, docs, base=None):
+    entries = [(doc_id, f"sha-{text}", lambda text=text: text) for doc_id, text in docs.items()]
+    return TokenStore.build(str(path), entries, base=base)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_rankings_match_calculate_match_score(tmp_path, resume_corpus, assert_ranking_parity, seed):
+    docs = resume_corpus(seed)
+    assert_ranking_parity(_build(tmp_path / "tokens.bin", docs).search, docs)
+
+
+def test_incremental_build_keeps_parity(tmp_path, resume_corpus, assert_ranking_parity):
+    docs = resume_corpus(11)
+    base = _build(tmp_path / "tokens.bin", docs)
+    docs["cv001.pdf"] = "python sql docker"
+    docs["new.pdf"] = "Rust go kotlin"
+    del docs["cv002.pdf"]
+    store = _build(tmp_path / "tokens.bin", docs, base=base)
+    assert not base.is_current() and store.is_current()
+    assert_ranking_parity(store.search, docs)
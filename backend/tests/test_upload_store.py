@@ -0,0 +1,65 @@
+import errno
+import hashlib
+import io
+import os
+
+import pytest
+
+import upload_store
+from upload_store import UploadStore
+
+
+def _digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _store(folder, changes_path=None):
+    def list_files():
+        return [os.path.join(folder, name) for name in os.listdir(folder) if name.endswith('.txt')]
+    return UploadStore(str(folder), _digest, list_files, changes_path=changes_path)
+
+
+@pytest.mark.parametrize("code", [errno.EPERM, errno.ENOTSUP, errno.EXDEV])
+def test_falls_back_to_copy_without_hard_links(tmp_path, monkeypatch, code):
+    def no_links(src, dst):
+        raise OSError(code, os.strerror(code))
+
+    monkeypatch.setattr(upload_store.os, "link", no_links)
+    store = _store(tmp_path)
+    assert store.save(io.BytesIO(b"python flask"), "cv.txt")[::2] == ("cv.txt", False)
+    # Same name, different contents: stored beside it, not over it.
+    other, _, duplicate = store.save(io.BytesIO(b"java spring"), "cv.txt")
+    assert other != "cv.txt" and not duplicate
+    assert store.save(io.BytesIO(b"python flask"), "again.txt")[::2] == ("cv.txt", True)
+
+    assert (tmp_path / "cv.txt").read_bytes() == b"python flask"
+    assert (tmp_path / other).read_bytes() == b"java spring"
+    assert sorted(os.listdir(tmp_path)) == sorted([".incoming", "cv.txt", other])
+    assert os.listdir(store.incoming) == []
+
+
+def test_other_link_errors_propagate(tmp_path, monkeypatch):
+    def broken(src, dst):
+        raise OSError(errno.EIO, os.strerror(errno.EIO))
+
+    monkeypatch.setattr(upload_store.os, "link", broken)
+    with pytest.raises(OSError):
+        _store(tmp_path).save(io.BytesIO(b"python"), "cv.txt")
+
+
+def test_version_changes_with_every_save(tmp_path):
+    folder = tmp_path / "resumes"
+    folder.mkdir()
+    changes = str(tmp_path / "uploads.changes")
+    store, other = _store(folder, changes), _store(folder, changes)
+    mtime = os.stat(folder).st_mtime_ns
+    versions = [store.version()]
+    for data, name in ((b"python", "a.txt"), (b"java", "b.txt")):
+        store.save(io.BytesIO(data), name)
+        # Both saves within one timestamp tick: only the count tells them apart.
+        os.utime(folder, ns=(mtime, mtime))
+        versions.append(other.version())
+    assert len(set(versions)) == 3
+    assert other.save(io.BytesIO(b"python"), "again.txt")[2]
+    assert store.version() == versions[-1]
@@ -0,0 +1,184 @@
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from cache_utils import LRUCache
+
+try:
+    import fcntl
+except ImportError:  # Windows: manifest flushes are merged but not serialized
+    fcntl = None
+
+
+def file_digest(filepath, chunk_size=1024 * 1024):
+    h = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _atomic_write(path, text):
+    # A unique temp file per writer, so concurrent workers never share one.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.' + os.path.basename(path) + '-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class ResumeTextCache:
+    """
+    Content-addressed store for extracted resume text.
+
+    Text is stored on disk under ``cache_dir`` keyed by the SHA-256 of the
+    source file, with an LRU in front of it. A manifest remembers each path's
+    (mtime, size, digest) so unchanged files are never re-hashed and a PDF is
+    only parsed again when its contents actually change.
+
+    Several worker processes may share ``cache_dir``: files are written
+    through unique temp files, and each flush merges this process's manifest
+    changes into the file on disk instead of overwriting other workers'.
+    """
+
+    def __init__(self, cache_dir, extractor, max_entries=1024):
+        self.cache_dir = cache_dir
+        self.extractor = extractor
+        self._memory = LRUCache(max_entries=max_entries)
+        self._lock = threading.Lock()
+        self._manifest_path = os.path.join(cache_dir, 'manifest.json')
+        self._manifest = {}
+        self._changes = {}  # path -> entry, or None once forgotten; not yet flushed
+        self._flush_lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self._manifest_path, 'r', encoding='utf-8') as f:
+                self._manifest = json.load(f)
+        except (OSError, ValueError):
+            self._manifest = {}
+
+    @contextlib.contextmanager
+    def _manifest_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self._manifest_path + '.lock', 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def flush(self):
+        """Merge manifest changes made since the last flush into the file."""
+        with self._lock:
+            if not self._changes:
+                return
+            changes, self._changes = self._changes, {}
+        with self._flush_lock, self._manifest_lock():
+            try:
+                with open(self._manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                manifest = {}
+            for key, entry in changes.items():
+                if entry is None:
+                    manifest.pop(key, None)
+                else:
+                    manifest[key] = entry
+            _atomic_write(self._manifest_path, json.dumps(manifest))
+        with self._lock:
+            # Pick up what other workers hashed, keeping newer local changes.
+            for key, entry in manifest.items():
+                if key not in self._changes:
+                    self._manifest[key] = entry
+
+    def _text_path(self, digest):
+        return os.path.join(self.cache_dir, digest[:2], digest + '.txt')
+
+    def digest(self, filepath):
+        """Return the content digest of ``filepath``, hashing only if it changed."""
+        st = os.stat(filepath)
+        key = os.path.abspath(filepath)
+        with self._lock:
+            entry = self._manifest.get(key)
+        if entry and entry['mtime'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            return entry['digest']
+
+        digest = file_digest(filepath)
+        with self._lock:
+            entry = self._manifest[key] = {'mtime': st.st_mtime_ns, 'size': st.st_size, 'digest': digest}
+            self._changes[key] = entry
+        return digest
+
+    def record(self, filepath, digest):
+        """Remember ``digest`` for a file that was hashed while it was written."""
+        st = os.stat(filepath)
+        key = os.path.abspath(filepath)
+        with self._lock:
+            entry = self._manifest[key] = {'mtime': st.st_mtime_ns, 'size': st.st_size, 'digest': digest}
+            self._changes[key] = entry
+
+    def forget(self, filepath):
+        key = os.path.abspath(filepath)
+        with self._lock:
+            if self._manifest.pop(key, None) is not None:
+                self._changes[key] = None
+
+    def _read(self, digest):
+        text = self._memory.get(digest)
+        if text is not None:
+            return text
+        try:
+            with open(self._text_path(digest), 'r', encoding='utf-8') as f:
+                text = f.read()
+        except OSError:
+            return None
+        self._memory.set(digest, text)
+        return text
+
+    def _write(self, digest, text):
+        path = self._text_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _atomic_write(path, text)
+        self._memory.set(digest, text)
+
+    def lookup(self, filepath):
+        """Return (digest, text) without extracting; text is None on a miss."""
+        digest = self.digest(filepath)
+        return digest, self._read(digest)
+
+    def put(self, filepath, text=None):
+        """
+        Store text for ``filepath``, extracting it unless ``text`` is given.
+        Returns (digest, text). If the extractor raises, nothing is stored
+        and the error propagates, so a later call extracts again.
+        """
+        digest = self.digest(filepath)
+        if text is None:
+            cached = self._read(digest)
+            if cached is not None:
+                return digest, cached
+            text = self.extractor(filepath)
+        self._write(digest, text)
+        return digest, text
+
+    def get(self, filepath):
+        """Return cached text for ``filepath``, extracting it on a miss."""
+        return self.put(filepath)[1]
+
+    def stats(self):
+        """Hit counts of the in-memory front; misses fall through to disk or extraction."""
+        return self._memory.stats()
@@ -0,0 +1,218 @@
+import bisect
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+from resume_index import tokenize
+from scoring import rank_scores
+
+MAGIC = b"TMTOKS01"
+_ALIGN = 8
+
+
+class _Vocab:
+    """Sorted UTF-8 vocabulary read straight out of the mapped file."""
+
+    def __init__(self, blob, offsets):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        return self._blob[self._offsets[i]:self._offsets[i + 1]].tobytes()
+
+    def term_id(self, token):
+        key = token.encode('utf-8')
+        i = bisect.bisect_left(self, key)
+        return i if i < len(self) and self[i] == key else None
+
+
+class TokenStore:
+    """
+    Read-only, memory-mapped corpus of resumes as integer token ids.
+
+    The file holds a sorted vocabulary (term id = position) and, per resume,
+    the sorted ids of its distinct tokens in one flat uint32 array. Nothing
+    is loaded per token: scans run over numpy views of the mapping, so
+    several worker processes opening the same file share one page-cached
+    copy. Scores are the vocabulary-overlap percentage calculate_match_score
+    produces.
+
+    Files are written by build() into a temp file and renamed into place;
+    a store that was opened earlier keeps reading its own (old) copy until
+    it is reopened.
+    """
+
+    def __init__(self, path):
+        # Imported on first use, like scipy in scoring, to keep startup fast.
+        import numpy as np
+
+        self.path = path
+        with open(path, 'rb') as f:
+            self._file_key = _file_key(os.fstat(f.fileno()))
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mmap)
+        if bytes(buf[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a token store")
+        (header_len,) = struct.unpack_from('<Q', buf, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(bytes(buf[start:start + header_len]))
+        data_start = start + header_len + _padding(start + header_len)
+
+        arrays = {
+            name: np.frombuffer(buf, dtype=dtype, count=count, offset=data_start + offset)
+            for name, (dtype, offset, count) in header["sections"].items()
+        }
+        self.doc_ids = header["doc_ids"]
+        self.digests = dict(zip(self.doc_ids, header["digests"]))
+        self.ranked = header["ranked"]
+        self.doc_keys = np.array(self.doc_ids, dtype=str)
+        self.doc_offsets = arrays["doc_offsets"]
+        self.term_ids = arrays["term_ids"]
+        self.vocab = _Vocab(arrays["vocab_blob"], arrays["vocab_offsets"])
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def is_current(self):
+        """False once the file on disk has been replaced by a newer build."""
+        try:
+            return _file_key(os.stat(self.path)) == self._file_key
+        except OSError:
+            return False
+
+    def doc_terms(self, row):
+        return self.term_ids[self.doc_offsets[row]:self.doc_offsets[row + 1]]
+
+    def match_counts(self, ids, chunk_docs=65536):
+        """Number of ``ids`` (term ids) present in each ranked resume."""
+        import numpy as np
+
+        wanted = np.zeros(len(self.vocab), dtype=np.uint8)
+        wanted[np.asarray(ids, dtype=np.int64)] = 1
+        counts = np.zeros(self.ranked, dtype=np.int64)
+        if not len(ids):
+            return counts
+        for first in range(0, self.ranked, chunk_docs):
+            last = min(first + chunk_docs, self.ranked)
+            bounds = self.doc_offsets[first:last + 1].astype(np.int64)
+            hits = np.take(wanted, self.term_ids[bounds[0]:bounds[-1]])
+            # Ranked resumes have at least one term, so no segment is empty.
+            counts[first:last] = np.add.reduceat(hits, bounds[:-1] - bounds[0], dtype=np.int64)
+        return counts
+
+    def search(self, jd_text, limit=None, offset=0, min_score=None):
+        """Ranked [(doc_id, score), ...], same contract as ResumeIndex.search."""
+        import numpy as np
+
+        jd_words = set(tokenize(jd_text))
+        if not jd_words:
+            scores = np.zeros(self.ranked)
+        else:
+            ids = [i for i in map(self.vocab.term_id, jd_words) if i is not None]
+            scores = self.match_counts(ids) / len(jd_words) * 100
+        return rank_scores(self, scores, limit=limit, offset=offset, min_score=min_score)
+
+    @classmethod
+    def build(cls, path, docs, base=None):
+        """
+        Write a store for ``docs`` ([(doc_id, digest, load_text), ...]) to
+        ``path`` and return it opened. Resumes whose digest is already in
+        ``base`` (an open TokenStore) are copied over as id arrays; only the
+        others are loaded and tokenized.
+        """
+        import numpy as np
+
+        docs = sorted(docs, key=lambda d: d[0])
+        reused_rows = {}
+        if base is not None:
+            base_rows = {digest: row for row, digest in enumerate(base.digests[d] for d in base.doc_ids)}
+            reused_rows = {doc_id: base_rows[digest] for doc_id, digest, _ in docs if digest in base_rows}
+
+        new_terms = {}
+        vocab = set()
+        for doc_id, digest, load_text in docs:
+            if doc_id not in reused_rows:
+                new_terms[doc_id] = sorted(set(tokenize(load_text() or "")))
+                vocab.update(new_terms[doc_id])
+        used_base = np.zeros(0, dtype=np.uint32)
+        if reused_rows:
+            used_base = np.unique(np.concatenate([base.doc_terms(row) for row in reused_rows.values()]))
+            vocab.update(base.vocab[int(i)].decode('utf-8') for i in used_base)
+
+        vocab = sorted(vocab, key=lambda t: t.encode('utf-8'))
+        term_index = {token: i for i, token in enumerate(vocab)}
+        remap = np.zeros(len(base.vocab) if base is not None else 0, dtype=np.uint32)
+        remap[used_base] = [term_index[base.vocab[int(i)].decode('utf-8')] for i in used_base]
+
+        rows = []
+        for doc_id, _, _ in docs:
+            if doc_id in reused_rows:
+                # Both vocabularies are sorted, so remapped ids stay sorted.
+                rows.append(remap[base.doc_terms(reused_rows[doc_id])])
+            else:
+                rows.append(np.fromiter((term_index[t] for t in new_terms[doc_id]), dtype=np.uint32))
+        # Resumes without text are kept (so their digests are known) but
+        # placed last and never ranked, like ResumeIndex does.
+        order = sorted(range(len(docs)), key=lambda i: (not len(rows[i]), docs[i][0]))
+        docs, rows = [docs[i] for i in order], [rows[i] for i in order]
+        ranked = sum(1 for r in rows if len(r))
+
+        encoded = [token.encode('utf-8') for token in vocab]
+        sections = [
+            ("vocab_offsets", np.concatenate(([0], np.cumsum([len(t) for t in encoded], dtype=np.uint64))).astype(np.uint64)),
+            ("doc_offsets", np.concatenate(([0], np.cumsum([len(r) for r in rows], dtype=np.uint64))).astype(np.uint64)),
+            ("term_ids", rows),
+            ("vocab_blob", [np.frombuffer(b"".join(encoded), dtype=np.uint8)]),
+        ]
+        _write(path, [d[0] for d in docs], [d[1] for d in docs], ranked, sections)
+        return cls(path)
+
+
+def _file_key(st):
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def _padding(position):
+    return (-position) % _ALIGN
+
+
+def _write(path, doc_ids, digests, ranked, sections):
+    import numpy as np
+
+    # Section offsets are relative to the first aligned byte after the header.
+    layout, position = {}, 0
+    for name, data in sections:
+        chunks = data if isinstance(data, list) else [data]
+        dtype = chunks[0].dtype.str if chunks else np.dtype(np.uint32).str
+        count = sum(len(c) for c in chunks)
+        layout[name] = [dtype, position, count]
+        position += count * np.dtype(dtype).itemsize
+        position += _padding(position)
+    header = {"doc_ids": doc_ids, "digests": digests, "ranked": ranked, "sections": layout}
+    header_bytes = json.dumps(header, separators=(",", ":")).encode('utf-8')
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tokens-")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<Q', len(header_bytes)))
+            f.write(header_bytes)
+            f.write(b"\0" * _padding(f.tell()))
+            for name, data in sections:
+                for chunk in (data if isinstance(data, list) else [data]):
+                    f.write(np.ascontiguousarray(chunk).tobytes())
+                f.write(b"\0" * _padding(f.tell()))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
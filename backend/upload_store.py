@@ -0,0 +1,215 @@
+import errno
+import hashlib
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent bumps may count once, but still change it
+    fcntl = None
+
+# os.link errors from filesystems (or mounts) that can't hard-link.
+_NO_HARD_LINKS = {errno.EPERM, errno.ENOTSUP, errno.EOPNOTSUPP, errno.EXDEV, errno.EMLINK}
+
+
+class _Spool:
+    """One uploaded file part, written to a temp file and hashed as it arrives."""
+
+    def __init__(self, directory):
+        fd, self.path = tempfile.mkstemp(dir=directory, prefix='upload-')
+        self._file = os.fdopen(fd, 'w+b')
+        self._hash = hashlib.sha256()
+
+    def write(self, data):
+        self._hash.update(data)
+        return self._file.write(data)
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def close(self):
+        # Parts that were never stored (rejected, duplicate) are removed here,
+        # when the request closes its files.
+        self._file.close()
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+
+class UploadStore:
+    """
+    Content-addressed resume uploads for one folder.
+
+    Upload parts are spooled into ``<folder>/.incoming`` while the request
+    is parsed and SHA-256 hashed on the way (the same digest the text cache
+    uses), so nothing is buffered whole or read twice. save() then keeps each
+    distinct content once: a file whose bytes are already stored is dropped
+    and reported as a duplicate of the stored copy, and a new file whose name
+    is taken by different contents gets a digest suffix instead of
+    overwriting it.
+
+    ``digest_of(path)`` and ``list_files()`` are the app's (cached) digest
+    lookup and folder scan. The digest -> filename map is rebuilt from them
+    whenever the folder's mtime shows something else changed it.
+
+    With ``changes_path``, every stored file also bumps a counter kept in
+    that file, shared by all workers; version() pairs it with the folder's
+    mtime.
+    """
+
+    def __init__(self, folder, digest_of, list_files, chunk_size=1024 * 1024, changes_path=None):
+        self.folder = folder
+        self.digest_of = digest_of
+        self.list_files = list_files
+        self.chunk_size = chunk_size
+        self.incoming = os.path.join(folder, '.incoming')
+        os.makedirs(self.incoming, exist_ok=True)
+        self.changes_path = changes_path
+        self._by_digest = None
+        self._folder_mtime = None
+        self._lock = threading.Lock()
+
+    def changes(self):
+        """How many files any worker's save() has stored (0 without ``changes_path``)."""
+        if self.changes_path is None:
+            return 0
+        try:
+            with open(self.changes_path, 'r', encoding='ascii') as f:
+                return int(f.read() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def version(self):
+        """
+        (folder mtime, changes()): with ``changes_path``, differs after every
+        save(), even one made
+        within the filesystem's timestamp granularity of the last, and after
+        files are added, renamed or deleted outside the app. Files rewritten
+        in place outside the app change neither.
+        """
+        return os.stat(self.folder).st_mtime_ns, self.changes()
+
+    def _bump(self):
+        if self.changes_path is None:
+            return
+        with open(self.changes_path + '.lock', 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            count = self.changes() + 1
+            # Replaced, not rewritten, so readers never see a partial number.
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.changes_path),
+                                       prefix='.' + os.path.basename(self.changes_path) + '-')
+            try:
+                with os.fdopen(fd, 'w', encoding='ascii') as f:
+                    f.write(str(count))
+                os.replace(tmp, self.changes_path)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+
+    def spool(self):
+        """A writable file for one upload part (Request._get_file_stream)."""
+        return _Spool(self.incoming)
+
+    def _index(self):
+        mtime = os.stat(self.folder).st_mtime_ns
+        if self._by_digest is None or mtime != self._folder_mtime:
+            by_digest = {}
+            for path in sorted(self.list_files()):
+                try:
+                    by_digest.setdefault(self.digest_of(path), os.path.basename(path))
+                except OSError:
+                    continue
+            self._by_digest, self._folder_mtime = by_digest, mtime
+        return self._by_digest
+
+    def save(self, stream, filename):
+        """
+        Store the upload in ``stream`` under ``filename`` unless its contents
+        are already stored. Returns (stored_filename, digest, duplicate).
+        """
+        spool = stream if isinstance(stream, _Spool) else None
+        if spool is None:
+            # Not parsed through spool(): copy it over in chunks, hashing as we go.
+            spool = self.spool()
+            for chunk in iter(lambda: stream.read(self.chunk_size), b''):
+                spool.write(chunk)
+        digest = spool.hexdigest()
+        spool.flush()
+
+        try:
+            with self._lock:
+                by_digest = self._index()
+                existing = by_digest.get(digest)
+                if existing is not None:
+                    try:
+                        if self.digest_of(os.path.join(self.folder, existing)) == digest:
+                            return existing, digest, True
+                    except OSError:
+                        pass
+                # Closed first so the rename also works where open files can't move.
+                spool._file.close()
+                stored = self._link(spool.path, filename, digest)
+                spool.path = None
+                by_digest[digest] = stored
+                self._folder_mtime = os.stat(self.folder).st_mtime_ns
+                self._bump()
+            return stored, digest, False
+        finally:
+            if stream is not spool:
+                spool.close()
+
+    def _link(self, src, filename, digest):
+        # os.link never replaces an existing file, so two workers storing the
+        # same name at once can't overwrite each other.
+        stem, ext = os.path.splitext(filename)
+        for i in itertools.count():
+            name = filename if i == 0 else f"{stem}-{digest[:8]}{f'-{i}' if i > 1 else ''}{ext}"
+            try:
+                os.link(src, os.path.join(self.folder, name))
+            except FileExistsError:
+                continue
+            except OSError as e:
+                if e.errno not in _NO_HARD_LINKS:
+                    raise
+                if not self._copy(src, os.path.join(self.folder, name)):
+                    continue
+            os.unlink(src)
+            return name
+
+    def _copy(self, src, dest):
+        """
+        Store ``src`` at ``dest`` where hard links aren't supported. The name
+        is claimed with an exclusive create first, so it is still never
+        overwritten, then the contents are copied next to it and renamed over
+        the placeholder. Returns False if ``dest`` was already taken.
+        """
+        try:
+            os.close(os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+        except FileExistsError:
+            return False
+        fd, tmp = tempfile.mkstemp(dir=self.folder, prefix='.upload-')
+        try:
+            with open(src, 'rb') as source, os.fdopen(fd, 'wb') as target:
+                shutil.copyfileobj(source, target, self.chunk_size)
+            os.replace(tmp, dest)
+        except BaseException:
+            for path in (tmp, dest):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            raise
+        return True
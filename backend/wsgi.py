@@ -0,0 +1,11 @@
+"""
+Production WSGI entry point.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+`python app.py` still starts the Flask development server for local work.
+"""
+from app import create_app
+
+app = create_app()
+application = app
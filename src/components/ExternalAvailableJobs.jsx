@@ -4,22 +4,49 @@ import "./../styles/external-available-jobs.css";
 
 /**
  * ExternalAvailableJobs
- * - Fetches aggregated jobs from backend proxy /api/external-jobs
- * - Accepts `filters` prop { query, location, type } to filter results client-side
+ * - Queries the backend search endpoint /api/external-jobs/search, which
+ *   normalizes, deduplicates and indexes Remotive / ArbeitNow / Adzuna
+ * - Accepts `filters` prop { query, location, type }; filtering happens server-side
+ * - Only the fields the cards need are requested; the full description is
+ *   fetched when a job's details are opened
  * - Renders external API jobs only (doesn't render manual jobs)
  * - All previous features preserved: source badge, modal, quick apply, load more
  */
 
+const CARD_FIELDS = "id,title,company_name,location,type,salary,tags,date,url,source,summary";
+
+function buildSearchUrl(filters, offset, pageSize) {
+  const params = new URLSearchParams({
+    offset: String(offset),
+    page_size: String(pageSize),
+    fields: CARD_FIELDS
+  });
+  const q = (filters.query || "").trim();
+  const loc = (filters.location || "").trim();
+  const type = (filters.type || "All Types").trim();
+  if (q) params.set("q", q);
+  if (loc) params.set("location", loc);
+  if (type && type !== "All Types") params.set("type", type);
+  return `/api/external-jobs/search?${params.toString()}`;
+}
+
 export default function ExternalAvailableJobs({
   maxItems = 12,
   loadIncrement = 6,
   filters = { query: "", location: "", type: "All Types" }
 }) {
-  const [apiJobs, setApiJobs] = useState([]); // combined external sources
+  const [apiJobs, setApiJobs] = useState([]); // current page(s) of matching jobs
+  const [totalApi, setTotalApi] = useState(0);
   const [loadingApi, setLoadingApi] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [errApi, setErrApi] = useState(null);
   const [selected, setSelected] = useState(null);
-  const [visibleApi, setVisibleApi] = useState(maxItems);
+
+  async function fetchPage(offset, pageSize) {
+    const res = await fetch(buildSearchUrl(filters, offset, pageSize));
+    if (!res.ok) throw new Error(`Proxy status ${res.status}`);
+    return res.json();
+  }
 
   useEffect(() => {
     let mounted = true;
@@ -28,102 +55,10 @@ export default function ExternalAvailableJobs({
       setLoadingApi(true);
       setErrApi(null);
       try {
-        const res = await fetch("/api/external-jobs");
-        if (!res.ok) throw new Error(`Proxy status ${res.status}`);
-        const data = await res.json();
-
-        const combined = [];
-
-        // Normalize Remotive
-        if (data?.remotive?.jobs && Array.isArray(data.remotive.jobs)) {
-          data.remotive.jobs.forEach((j) =>
-            combined.push({
-              id: j.id || j.job_id || j.slug || j.url,
-              title: j.title || "Untitled",
-              company_name: j.company_name || j.company || "Company",
-              location: j.candidate_required_location || j.location || "Remote",
-              description: j.description || j.description_preview || "",
-              url: j.url || j.job_apply_url || "",
-              salary: j.salary || j.salary_from || null,
-              tags: j.tags || (j.category ? [j.category] : []),
-              date: j.publication_date || j.created_at || j.date || null,
-              redirect_url: j.redirect_url || null,
-              remote_url: j.remote_url || null,
-              job_apply_url: j.job_apply_url || null,
-              source: "Remotive",
-              raw: j
-            })
-          );
-        }
-
-        // Normalize ArbeitNow
-        if (data?.arbeitnow?.data && Array.isArray(data.arbeitnow.data)) {
-          data.arbeitnow.data.forEach((j) =>
-            combined.push({
-              id: j.slug || j.id || j.url || `${j.title || j.position}-${j.company || ""}`,
-              title: j.title || j.position || "Untitled",
-              company_name: j.company || j.company_name || "Company",
-              location: j.location || j.remote || "Remote",
-              description: j.description || j.content || "",
-              url: j.url || j.remote_url || "",
-              salary: j.salary || null,
-              tags: j.tags || [],
-              date: j.created_at || j.date || null,
-              redirect_url: j.redirect_url || null,
-              remote_url: j.remote_url || null,
-              job_apply_url: j.job_apply_url || null,
-              source: "ArbeitNow",
-              raw: j
-            })
-          );
-        }
-
-        // Normalize Adzuna
-        if (data?.adzuna?.results && Array.isArray(data.adzuna.results)) {
-          data.adzuna.results.forEach((j) =>
-            combined.push({
-              id: j.id || j.redirect_url || `${j.title}-${j.company?.display_name}`,
-              title: j.title || "Untitled",
-              company_name: (j.company && j.company.display_name) || j.company?.name || "Company",
-              location: (j.location && j.location.display_name) || j.location || "India",
-              description: j.description || j.snippet || "",
-              url: j.redirect_url || j.redirect || j.location?.url || "",
-              salary:
-                (j.salary_min || j.salary_max)
-                  ? `${j.salary_min || ""}${j.salary_min && j.salary_max ? "-" : ""}${j.salary_max || ""}`
-                  : null,
-              tags: j.category?.label ? [j.category.label] : [],
-              date: j.created || j.created_at || j.created_date || null,
-              redirect_url: j.redirect_url || j.redirect || null,
-              remote_url: j.remote_url || null,
-              job_apply_url: j.job_apply_url || null,
-              source: "Adzuna",
-              raw: j
-            })
-          );
-        }
-
-        // Deduplicate & sort newest first
-        const seen = new Set();
-        const deduped = [];
-        for (const item of combined) {
-          const key =
-            item.url && item.url !== ""
-              ? item.url
-              : `${(item.title || "").toLowerCase()}::${(item.company_name || "").toLowerCase()}`;
-          if (!seen.has(key)) {
-            seen.add(key);
-            deduped.push(item);
-          }
-        }
-        deduped.sort((a, b) => {
-          const ta = a.date ? Date.parse(a.date) : 0;
-          const tb = b.date ? Date.parse(b.date) : 0;
-          return (tb || 0) - (ta || 0);
-        });
-
+        const data = await fetchPage(0, maxItems);
         if (mounted) {
-          setApiJobs(deduped);
+          setApiJobs(data.jobs || []);
+          setTotalApi(data.total || 0);
           setLoadingApi(false);
         }
       } catch (err) {
@@ -139,58 +74,33 @@ export default function ExternalAvailableJobs({
     return () => {
       mounted = false;
     };
-  }, []);
+  }, [filters.query, filters.location, filters.type, maxItems]);
 
-  // ---------- Filtering ----------
-  // filters: { query, location, type } - type string e.g. "All Types", "Full-time", "Internship", etc.
-  const matchFilter = (job) => {
-    const q = (filters.query || "").trim().toLowerCase();
-    const loc = (filters.location || "").trim().toLowerCase();
-    const type = (filters.type || "All Types").trim();
-
-    // Query: match title / company / description / tags
-    if (q) {
-      const hay =
-        `${job.title || ""} ${job.company_name || ""} ${job.description || ""} ${(job.tags || []).join(" ")}`.toLowerCase();
-      if (!hay.includes(q)) return false;
-    }
-
-    // Location
-    if (loc) {
-      const jobLoc = (job.location || "").toLowerCase();
-      if (!jobLoc.includes(loc)) return false;
-    }
-
-    // Type (uses heuristics)
-    if (type && type !== "All Types") {
-      const jt = inferType(job);
-      if (jt !== type) return false;
+  async function loadMore() {
+    setLoadingMore(true);
+    try {
+      const data = await fetchPage(apiJobs.length, loadIncrement);
+      setApiJobs(prev => [...prev, ...(data.jobs || [])]);
+      setTotalApi(data.total || 0);
+    } catch (err) {
+      console.error("External jobs fetch error:", err);
+    } finally {
+      setLoadingMore(false);
     }
+  }
 
-    return true;
-  };
-
-  function inferType(job) {
-    if (!job) return "N/A";
-    const keys = [job.job_type, job.type, job.contract_type, job.employment_type, job.contract, job.work_type];
-    for (const k of keys) {
-      if (!k) continue;
-      const v = String(k).toLowerCase();
-      if (v.includes("intern")) return "Internship";
-      if (v.includes("full")) return "Full-time";
-      if (v.includes("part")) return "Part-time";
-      if (v.includes("contract")) return "Contract";
-      if (v.includes("remote")) return "Remote";
-      if (v.includes("freel")) return "Freelance";
-    }
-    const tags = job.tags || job.raw?.tags || [];
-    if (Array.isArray(tags)) {
-      const tstr = tags.join(" ").toLowerCase();
-      if (tstr.includes("intern")) return "Internship";
-      if (tstr.includes("remote")) return "Remote";
+  async function openDetails(job) {
+    setSelected(job);
+    if (job.description !== undefined) return;
+    try {
+      const res = await fetch(`/api/external-jobs/search?ids=${encodeURIComponent(job.id)}&fields=description`);
+      if (!res.ok) return;
+      const data = await res.json();
+      const description = data.jobs && data.jobs[0] ? data.jobs[0].description : "";
+      setSelected(current => (current && current.id === job.id ? { ...current, description } : current));
+    } catch (err) {
+      console.error("External job details fetch error:", err);
     }
-    if (String(job.location || "").toLowerCase().includes("remote")) return "Remote";
-    return "N/A";
   }
 
   function getApplyUrl(job) {
@@ -206,11 +116,6 @@ export default function ExternalAvailableJobs({
     return "#";
   }
 
-  function stripHtml(html) {
-    if (!html) return "";
-    return html.replace(/<[^>]*>/g, "");
-  }
-
   function formatPosted(dateString) {
     try {
       const d = new Date(dateString);
@@ -228,9 +133,6 @@ export default function ExternalAvailableJobs({
     }
   }
 
-  // Apply filters to apiJobs when rendering
-  const renderedApiJobs = apiJobs.filter(matchFilter);
-
   // render card
   function renderJobCard(job) {
     const id = job.id || job.job_id || job.slug || job.url || Math.random();
@@ -238,7 +140,7 @@ export default function ExternalAvailableJobs({
     const company = job.company_name || "Company";
     const location = job.location || "Remote";
     const salary = job.salary || null;
-    const tags = (job.tags && Array.isArray(job.tags)) ? job.tags : (job.raw?.tags || []);
+    const tags = Array.isArray(job.tags) ? job.tags : [];
     const posted = job.date || job.created_at || job.createdAt || null;
     const source = job.source || "External";
 
@@ -265,7 +167,7 @@ export default function ExternalAvailableJobs({
 
           {salary ? <div className="eaj-salary">{salary}</div> : null}
 
-          <div className="eaj-desc">{stripHtml(job.description || "").slice(0, 180)}{(job.description || "").length > 180 ? "..." : ""}</div>
+          <div className="eaj-desc">{job.summary || ""}</div>
 
           <div className="eaj-tags">
             {(tags || []).slice(0, 4).map((t, i) => (
@@ -282,7 +184,7 @@ export default function ExternalAvailableJobs({
           </div>
 
           <div className="eaj-actions">
-            <button className="eaj-btn eaj-btn-primary" onClick={() => setSelected(job)}>View Details</button>
+            <button className="eaj-btn eaj-btn-primary" onClick={() => openDetails(job)}>View Details</button>
 
             <a
               className="eaj-btn eaj-btn-apply"
@@ -300,17 +202,19 @@ export default function ExternalAvailableJobs({
 
   if (loadingApi) return <div className="eaj-loading">Loading external jobs…</div>;
   if (errApi) return <div className="eaj-error">{errApi}</div>;
-  if (!renderedApiJobs.length) return <div className="eaj-empty">No external jobs available right now.</div>;
+  if (!apiJobs.length) return <div className="eaj-empty">No external jobs available right now.</div>;
 
   return (
     <div className="eaj-container">
       <div className="eaj-grid">
-        {renderedApiJobs.slice(0, visibleApi).map(job => renderJobCard(job))}
+        {apiJobs.map(job => renderJobCard(job))}
       </div>
 
-      {visibleApi < renderedApiJobs.length && (
+      {apiJobs.length < totalApi && (
         <div style={{ textAlign: "center", marginTop: 16 }}>
-          <button className="eaj-btn" onClick={() => setVisibleApi(v => v + loadIncrement)}>Load more external jobs</button>
+          <button className="eaj-btn" onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? "Loading…" : "Load more external jobs"}
+          </button>
         </div>
       )}
 
@@ -338,7 +242,9 @@ export default function ExternalAvailableJobs({
               </div>
 
               <div className="eaj-modal-desc">
-                {selected.description ? (
+                {selected.description === undefined ? (
+                  <div>Loading description…</div>
+                ) : selected.description ? (
                   /<\/?[a-z][\s\S]*>/i.test(selected.description) ? (
                     <div dangerouslySetInnerHTML={{ __html: selected.description }} />
                   ) : (
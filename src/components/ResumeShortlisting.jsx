@@ -53,12 +53,29 @@ function ResumeShortlisting() {
       const response = await fetch(`${API_BASE_URL}/shortlist`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ jd: jobDescription })
+        body: JSON.stringify({ jd: jobDescription, stream: true })
       });
 
-      if (response.ok) {
-        const data = await response.json();
-        setResults(data);
+      if (response.ok && response.body) {
+        // Results arrive as NDJSON, best match first; render each batch as it lands.
+        setResults([]);
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+          const { done, value } = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, { stream: true });
+          const lines = buffer.split('\n');
+          buffer = lines.pop();
+          const batch = lines.filter(line => line.trim()).map(line => JSON.parse(line));
+          if (batch.length > 0) {
+            setResults(prev => [...prev, ...batch]);
+          }
+        }
+        if (buffer.trim()) {
+          setResults(prev => [...prev, JSON.parse(buffer)]);
+        }
       } else {
         alert('Shortlisting failed');
       }
@@ -87,7 +104,7 @@ function ResumeShortlisting() {
         <input
           type="file"
           multiple
-          accept=".pdf"
+          accept=".pdf,.txt,.docx"
           onChange={handleFileChange}
           className="file-input"
         />